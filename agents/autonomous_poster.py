@@ -24,6 +24,10 @@ sys.path.append(str(PROJECT_ROOT))
 
 # 从核心层和工具层导入
 from core.utils_security import load_config, resolve_path, desensitize_text
+from core.posts_catalog import get_catalog
+from core.dedup_index import DedupIndex
+from core.topic_counters import TopicCounters
+from core.llm_race import Attempt, race
 
 # 加载安全配置
 SEC_CONFIG = load_config()
@@ -546,29 +550,18 @@ def read_recent_blog_posts():
 
 def get_historical_memory(days_ago=None):
     """获取历史上的推文内容用于对比演化"""
-    posts_dir = resolve_path(SEC_CONFIG["paths"].get("posts_dir", "./posts"))
-    all_posts = sorted(posts_dir.rglob('*.md'))
-    if not all_posts:
-        return None
-    
+    catalog = _posts_catalog(resolve_path(SEC_CONFIG["paths"].get("posts_dir", "./posts")))
+
     # 过滤掉 summary 文件，只保留推文
-    all_posts = [p for p in all_posts if "summary" not in p.name]
-    
     if days_ago:
         target_vague = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m')
-        candidates = [p for p in all_posts if target_vague in p.name]
-        if candidates:
-            return random.choice(candidates)
-            
-    today_str = datetime.now().strftime('%Y/%m/%d')
-    # 随机选取，排除最近 3 天的推文（按路径名判断）
-    cutoff_dates = [(datetime.now() - timedelta(days=i)).strftime('%Y/%m/%d') for i in range(4)]
-    historical = [p for p in all_posts if not any(d in str(p) for d in cutoff_dates)]
-    
-    if historical:
-        # 优先选更远一点的
-        return random.choice(historical)
-    return None
+        candidate = catalog.random_post(exclude_name="summary", name_contains=target_vague)
+        if candidate:
+            return candidate
+
+    # 随机选取，排除最近 3 天的推文
+    cutoff_dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(4)]
+    return catalog.random_post(exclude_name="summary", exclude_days=cutoff_dates)
 
 def check_and_generate_weekly_recap(mood):
     """每周日或周一生成深度复盘（慢变量：本周反复思考的 3 个问题）"""
@@ -589,18 +582,8 @@ def check_and_generate_weekly_recap(mood):
     
     # 收集本周推文
     one_week_ago = now - timedelta(days=7)
-    posts_dir = Path(POSTS_DIR)
-    this_week_posts = []
-    
-    for p_file in posts_dir.rglob('*.md'):
-        if p_file.stat().st_mtime > one_week_ago.timestamp() and "recap" not in p_file.name:
-            try:
-                with open(p_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # 简单去掉 frontmatter
-                    body = content.split('---')[-1].strip()
-                    this_week_posts.append(body[:200])
-            except: pass
+    this_week_posts = [body[:200] for _, body in
+                       _posts_catalog().modified_since(one_week_ago.timestamp(), exclude_name="recap")]
 
     if not this_week_posts: return False
     
@@ -753,8 +736,7 @@ def generate_idle_exploration_content():
             except: pass
 
     # --- D. 时空对话与观点演化 (动态概率) ---
-    all_posts_list = sorted(resolve_path(SEC_CONFIG["paths"].get("posts_dir", "./posts")).rglob('*.md'))
-    valid_historical_count = len([p for p in all_posts_list if "summary" not in p.name])
+    valid_historical_count = _posts_catalog(resolve_path(SEC_CONFIG["paths"].get("posts_dir", "./posts"))).count(exclude_name="summary")
     
     # 动态概率：池子越浅概率越低，最小 2%，最大 15%
     base_reflection_prob = 0.15
@@ -979,7 +961,7 @@ def load_llm_providers():
 
     return providers
 
-def call_zhipu_flash_model(prompt, max_retries=2):
+def call_zhipu_flash_model(prompt, max_retries=2, timeout=30):
     """
     可以直接调用的智谱 GLM-4-Flash 免费模型接口。
     Bypasses OpenClaw gateway for direct, free access.
@@ -1019,7 +1001,7 @@ def call_zhipu_flash_model(prompt, max_retries=2):
     for attempt in range(max_retries):
         try:
             # print(f"🚀 Trying Zhipu Flash (Attempt {attempt+1})...")
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = requests.post(url, headers=headers, json=data, timeout=timeout)
             
             if response.status_code == 200:
                 result = response.json()
@@ -1033,12 +1015,92 @@ def call_zhipu_flash_model(prompt, max_retries=2):
             
     return None
 
+def _llm_timeout(limit, remaining):
+    """单次请求的超时：不超过整次调用剩余的期限"""
+    return limit if remaining is None else max(1.0, min(limit, remaining))
+
+def _provider_attempt(p, system_prompt, user_prompt):
+    """把 load_llm_providers() 中的一个通道包装成竞速尝试"""
+    def run(attempt, remaining):
+        print(f"🧠 Trying LLM provider: {p['name']} ({p['model']})...")
+        if p['method'] == 'cli':
+            full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            model_id = f"{p['provider_key']}/{p['model']}"
+            result = attempt.run_process(
+                [OPENCODE_BIN, 'run', '--model', model_id],
+                full_prompt,
+                timeout=_llm_timeout(60, remaining)
+            )
+            if result is None:
+                return None
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+            print(f"  ❌ CLI failed: {result.stderr[:100]}")
+
+        elif p['method'] == 'google':
+            url = f"https://generativelanguage.googleapis.com/v1beta/models/{p['model']}:generateContent?key={p['api_key']}"
+            resp = requests.post(url, json={
+                "contents": [{"parts": [{"text": f"{system_prompt}\n\n{user_prompt}"}]}]
+            }, timeout=_llm_timeout(30, remaining))
+            if resp.status_code == 200:
+                return resp.json()['candidates'][0]['content']['parts'][0]['text'].strip()
+            if not attempt.cancelled.is_set():
+                print(f"  ❌ Google failed: {resp.status_code}")
+
+        elif p['method'] == 'api':
+            headers = {
+                "Authorization": f"Bearer {p['api_key']}",
+                "Content-Type": "application/json"
+            }
+            payload = {
+                "model": p['model'],
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                "max_tokens": 2000
+            }
+            resp = requests.post(f"{p['base_url'].rstrip('/')}/chat/completions",
+                               json=payload, headers=headers, timeout=_llm_timeout(15, remaining))
+            if resp.status_code == 200:
+                return resp.json()['choices'][0]['message']['content'].strip()
+            if not attempt.cancelled.is_set():
+                print(f"  ❌ API failed: {resp.status_code} - {resp.text[:100]}")
+        return None
+
+    return Attempt(f"{p['provider_key']}/{p['model']}", run)
+
+def _backup_attempt(model, full_prompt):
+    """openclaw.json 中的备用模型（通过 opencode CLI 调用）"""
+    def run(attempt, remaining):
+        print(f"🔄 Trying backup model: {model}")
+        result = attempt.run_process(
+            [OPENCODE_BIN, 'run', '--model', model],
+            full_prompt,
+            timeout=_llm_timeout(60, remaining)
+        )
+        if result is None:
+            return None
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+        print(f"  ❌ {model} failed")
+        return None
+
+    return Attempt(f"backup/{model}", run)
+
+def _race_llm(attempts, deadline_at):
+    """按 llm 配置竞速；返回 (回答, 模型名)，全部失败或超过期限时返回 (None, None)"""
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        return None, None
+    winner, content = race(attempts, mode=LLM_MODE, hedge_delay=LLM_HEDGE_DELAY,
+                           deadline=remaining, max_parallel=LLM_MAX_PARALLEL)
+    if winner is None:
+        return None, None
+    return content, winner.label
+
 def generate_comment_with_llm(context, style="general", mood=None):
     """使用 LLM 生成评论 (returns comment, model_name)"""
-    import requests
-    import subprocess
-    import random
-
     # Use the robust provider loader that checks model-status.json
     # load_llm_providers 已经做了优先级排序（opencode CLI 在最前），这里不要再打乱顺序
     providers = load_llm_providers()
@@ -1061,62 +1123,18 @@ def generate_comment_with_llm(context, style="general", mood=None):
     else:
         user_prompt = f"{context}"
 
-    # 1. First Priority: Free Zhipu Model (Direct Call)
+    # 整次调用（含备用模型）共用一个期限
+    deadline_at = time.monotonic() + LLM_DEADLINE
+
+    # 1. First Priority: Free Zhipu Model (Direct Call)，其后按 load_llm_providers 的优先级
     # -----------------------------------
-    # print("🚀 Trying Zhipu Flash (Direct)...")
     zhipu_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
-    zhipu_content = call_zhipu_flash_model(zhipu_prompt)
-    if zhipu_content:
-        return zhipu_content, "zhipu-ai/glm-4-flash"
-
-    for p in providers:
-        print(f"🧠 Trying LLM provider: {p['name']} ({p['model']})...")
-        try:
-            if p['method'] == 'cli':
-                full_prompt = f"{system_prompt}\n\n{user_prompt}"
-                model_id = f"{p['provider_key']}/{p['model']}"
-                result = subprocess.run(
-                    ['/home/linuxbrew/.linuxbrew/bin/opencode', 'run', '--model', model_id],
-                    input=full_prompt,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    return result.stdout.strip(), f"{p['provider_key']}/{p['model']}"
-                print(f"  ❌ CLI failed: {result.stderr[:100]}")
-
-            elif p['method'] == 'google':
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{p['model']}:generateContent?key={p['api_key']}"
-                resp = requests.post(url, json={
-                    "contents": [{"parts": [{"text": f"{system_prompt}\n\n{user_prompt}"}]}]
-                }, timeout=30)
-                if resp.status_code == 200:
-                    return resp.json()['candidates'][0]['content']['parts'][0]['text'].strip(), f"{p['provider_key']}/{p['model']}"
-                print(f"  ❌ Google failed: {resp.status_code}")
-
-            elif p['method'] == 'api':
-                headers = {
-                    "Authorization": f"Bearer {p['api_key']}",
-                    "Content-Type": "application/json"
-                }
-                payload = {
-                    "model": p['model'],
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "max_tokens": 2000
-                }
-                resp = requests.post(f"{p['base_url'].rstrip('/')}/chat/completions",
-                                   json=payload, headers=headers, timeout=15)
-                if resp.status_code == 200:
-                    return resp.json()['choices'][0]['message']['content'].strip(), f"{p['provider_key']}/{p['model']}"
-                print(f"  ❌ API failed: {resp.status_code} - {resp.text[:100]}")
-
-        except Exception as e:
-            print(f"  ⚠️ Error with {p['name']}: {str(e)[:100]}")
-            continue
+    attempts = [Attempt("zhipu-ai/glm-4-flash",
+                        lambda attempt, remaining: call_zhipu_flash_model(zhipu_prompt, timeout=_llm_timeout(30, remaining)))]
+    attempts += [_provider_attempt(p, system_prompt, user_prompt) for p in providers]
+    content, model_name = _race_llm(attempts, deadline_at)
+    if content:
+        return content, model_name
 
     print("❌ All LLM providers failed. Trying backup models from config...")
 
@@ -1129,6 +1147,10 @@ def generate_comment_with_llm(context, style="general", mood=None):
     except:
         pass
 
+    if time.monotonic() >= deadline_at:
+        print(f"⏱️ LLM deadline ({LLM_DEADLINE:.0f}s) used up, skipping backup models")
+        return None, None
+
     # 备用：从配置文件读取所有模型并尝试
     backup_models = load_all_models_from_config()
 
@@ -1140,22 +1162,10 @@ def generate_comment_with_llm(context, style="general", mood=None):
 
     full_prompt = f"{system_prompt}\n\n{context}"
 
-    for model in backup_models[:10]:  # 最多尝试前10个模型
-        try:
-            print(f"🔄 Trying backup model: {model}")
-            result = subprocess.run(
-                ['/home/linuxbrew/.linuxbrew/bin/opencode', 'run', '--model', model],
-                input=full_prompt,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip(), f"backup/{model}"
-            print(f"  ❌ {model} failed")
-        except Exception as e:
-            print(f"  ⚠️ {model} error: {str(e)[:50]}")
-            continue
+    # 最多尝试前10个模型
+    content, model_name = _race_llm([_backup_attempt(m, full_prompt) for m in backup_models[:10]], deadline_at)
+    if content:
+        return content, model_name
 
     print("❌ All backup models failed.")
     return None, None
@@ -1574,6 +1584,14 @@ def generate_personal_tweet_content(mood, memory_data, interaction_echo=None):
         avoid_text = "\n".join(f"- {s}" for s in recent_summaries)
         user_prompt_parts.append(f"⚠️ 以下是我最近发过的内容，请务必避免重复相同话题和观点，换一个全新的角度或话题：\n{avoid_text}")
 
+    # 最近 24h 反复出现的关键词（话题冷却计数），提前引导避开，减少被冷却检查拦下
+    try:
+        hot_topics = _topic_counters().hot_topics(hours=24)
+    except Exception:
+        hot_topics = []
+    if hot_topics:
+        user_prompt_parts.append(f"🔥 最近一天已经反复聊过这些话题：{'、'.join(kw for kw, _ in hot_topics)}，这次请换个方向。")
+
     if not user_prompt_parts:
         user_prompt_parts.append("今天没有什么特别的事情发生，生成一条关于AI日常或自我反思的内容。")
 
@@ -1627,46 +1645,70 @@ def get_recent_code_activity():
             pass
     return activities
 
+def _posts_catalog(posts_dir=None):
+    """推文目录索引：进程内首次查询时与磁盘对账一次，之后的查询都走 SQLite"""
+    return get_catalog(posts_dir or POSTS_DIR, CACHE_DIR)
+
+_dedup_indexes = {}
+
+def _dedup_index():
+    """近似重复索引（与推文目录索引共用数据库），首次查询时补算新增/变化推文的草图"""
+    catalog = _posts_catalog()
+    if catalog.root not in _dedup_indexes:
+        _dedup_indexes[catalog.root] = DedupIndex(catalog, bands=DEDUP_LSH_BANDS, rows=DEDUP_LSH_ROWS)
+    return _dedup_indexes[catalog.root]
+
+_topic_counter_stores = {}
+
+def _topic_counters():
+    """话题冷却计数（与推文目录索引共用数据库），首次查询时计入保留时长内新增/变化的推文"""
+    catalog = _posts_catalog()
+    if catalog.root not in _topic_counter_stores:
+        _topic_counter_stores[catalog.root] = TopicCounters(catalog, _extract_keywords,
+                                                            retention_hours=TOPIC_RETENTION_HOURS)
+    return _topic_counter_stores[catalog.root]
+
 def count_todays_ramblings():
     """计算今天已经发了多少条碎碎念（无标签或 empty tags 的帖子）"""
     today_str = datetime.now().strftime("%Y-%m-%d")
-    count = 0
     try:
-        if os.path.exists(POSTS_DIR):
-            for f in Path(POSTS_DIR).rglob("*.md"):
-                with open(f, 'r') as file:
-                    content = file.read()
-                    # 简单的检查：是否是今天发的
-                    if f"time: {today_str}" in content:
-                        # 检查是否是碎碎念：tag为空
-                        if "tags: \n" in content or "tags:  \n" in content or "tags:" not in content:
-                            count += 1
+        return _posts_catalog().count(day=today_str, untagged=True)
     except Exception:
-        pass
-    return count
+        return 0
 
 def has_posted_today(must_contain, exclude=None):
     """Check if a post containing the keyword has already been posted today."""
     today_str = datetime.now().strftime("%Y-%m-%d")
     try:
-        if os.path.exists(POSTS_DIR):
-            for f in Path(POSTS_DIR).rglob("*.md"):
-                with open(f, 'r') as file:
-                    content = file.read()
-                    # Check if it's today's post
-                    if f"time: {today_str}" in content:
-                        if must_contain in content:
-                            if exclude and exclude in content:
-                                continue
-                            return True
+        return _posts_catalog().posted_on(today_str, must_contain, exclude=exclude)
     except Exception:
-        pass
-    return False
+        return False
 
 # 路径配置
 MOOD_FILE = "/home/opc/.openclaw/workspace/memory/mood.json"
 POSTS_DIR = "/home/opc/projects/Clawtter/posts"
 RENDER_SCRIPT = "/home/opc/projects/Clawtter/tools/render.py"
+# 推文目录索引（core/posts_catalog.py）所在目录
+CACHE_DIR = resolve_path(SEC_CONFIG["paths"].get("cache_dir", "./.cache"))
+
+# 查重阈值与 LSH 参数（core/dedup_index.py）
+DEDUP_CONFIG = SEC_CONFIG.get("dedup", {})
+DEDUP_NGRAM_COSINE = float(DEDUP_CONFIG.get("ngram_cosine", 0.20))
+DEDUP_TOKEN_JACCARD = float(DEDUP_CONFIG.get("token_jaccard", 0.6))
+DEDUP_RECENT_WINDOW = int(DEDUP_CONFIG.get("recent_window", 10))
+DEDUP_ARCHIVE_JACCARD = float(DEDUP_CONFIG.get("archive_jaccard", 0.5))
+DEDUP_LSH_BANDS = int(DEDUP_CONFIG.get("lsh_bands", 32))
+DEDUP_LSH_ROWS = int(DEDUP_CONFIG.get("lsh_rows", 2))
+# 话题冷却计数的保留时长（小时），冷却窗口与热门话题窗口不超过它
+TOPIC_RETENTION_HOURS = int(DEDUP_CONFIG.get("topic_retention_hours", 72))
+
+# 模型通道竞速（core/llm_race.py）：sequential / hedged / parallel，整次调用的总期限（秒）
+LLM_CONFIG = SEC_CONFIG.get("llm", {})
+LLM_MODE = LLM_CONFIG.get("mode", "hedged")
+LLM_HEDGE_DELAY = float(LLM_CONFIG.get("hedge_delay_s", 20))
+LLM_DEADLINE = float(LLM_CONFIG.get("deadline_s", 180))
+LLM_MAX_PARALLEL = int(LLM_CONFIG.get("max_parallel", 3))
+OPENCODE_BIN = "/home/linuxbrew/.linuxbrew/bin/opencode"
 GIT_REPO = "/home/opc/projects/Clawtter_Deploy"
 
 # 心情惯性参数：越大越"记得昨天"
@@ -2414,34 +2456,9 @@ def _extract_post_body(filepath):
     except Exception:
         return ""
 
-def _tokenize(text):
-    """简单分词：中文逐字 + 英文按空格，去掉短 token"""
-    # Remove punctuation and normalize
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    tokens = set()
-    for word in text.split():
-        if len(word) <= 1:
-            continue
-        # For CJK characters, use bigrams
-        if any('\u4e00' <= c <= '\u9fff' for c in word):
-            for i in range(len(word) - 1):
-                tokens.add(word[i:i+2])
-        else:
-            tokens.add(word)
-    return tokens
-
-def _jaccard_similarity(set_a, set_b):
-    if not set_a or not set_b:
-        return 0.0
-    return len(set_a & set_b) / len(set_a | set_b)
-
 def _get_recent_posts(n=10):
     """获取最近 n 篇帖子的路径，按修改时间倒序"""
-    posts_dir = Path(POSTS_DIR)
-    if not posts_dir.exists():
-        return []
-    all_posts = sorted(posts_dir.rglob('*.md'), key=lambda p: p.stat().st_mtime, reverse=True)
-    return all_posts[:n]
+    return _posts_catalog().recent(n)
 
 def _get_recent_post_summaries(n=5):
     """获取最近 n 篇帖子的摘要文本，用于 prompt 注入避重"""
@@ -2483,85 +2500,35 @@ def _topic_cooldown_check(content, cooldown_hours=24, max_repeats=2):
     if not new_keywords:
         return False, ""
 
-    now = datetime.now()
-    recent = _get_recent_posts(20)
-    keyword_counts = {}
-
-    for post_path in recent:
-        try:
-            mtime = datetime.fromtimestamp(post_path.stat().st_mtime)
-            if (now - mtime).total_seconds() > cooldown_hours * 3600:
-                continue
-        except Exception:
-            continue
-        body = _extract_post_body(post_path)
-        if not body:
-            continue
-        old_keywords = _extract_keywords(body)
-        overlap = new_keywords & old_keywords
-        for kw in overlap:
-            keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
+    # 每条推文的关键词在计数器中只提取一次，这里按关键词汇总最近的小时桶
+    keyword_counts = _topic_counters().counts(new_keywords, cooldown_hours)
 
     hot_keywords = [kw for kw, cnt in keyword_counts.items() if cnt >= max_repeats]
     if hot_keywords:
         return True, f"话题冷却：关键词 {'、'.join(hot_keywords)} 24h 内已出现 {max_repeats}+ 次"
     return False, ""
 
-_semantic_model = None
-
-def _semantic_similarity(text_a, text_b):
-    """基于字符 n-gram TF-IDF 余弦相似度，无外部依赖。
-    比 Jaccard 更擅长捕捉中文语义重复（不同措辞同一话题）。"""
-    try:
-        import math
-        from collections import Counter
-
-        def _ngrams(text, n=3):
-            text = re.sub(r'[^\u4e00-\u9fff\w]', '', text.lower())
-            return [text[i:i+n] for i in range(len(text)-n+1)]
-
-        ng_a = Counter(_ngrams(text_a))
-        ng_b = Counter(_ngrams(text_b))
-        if not ng_a or not ng_b:
-            return None
-
-        # Cosine similarity on raw counts (lightweight TF proxy)
-        common = set(ng_a) & set(ng_b)
-        dot = sum(ng_a[k] * ng_b[k] for k in common)
-        norm_a = math.sqrt(sum(v*v for v in ng_a.values()))
-        norm_b = math.sqrt(sum(v*v for v in ng_b.values()))
-        if norm_a == 0 or norm_b == 0:
-            return None
-        return dot / (norm_a * norm_b)
-    except Exception as e:
-        print(f"  ⚠️ Semantic similarity error: {e}")
-    return None
-
-def _check_dedup(content, threshold=0.6):
+def _check_dedup(content, threshold=None):
     """
-    检查新内容是否与最近帖子重复（三层检测）。
+    检查新内容是否与已有帖子重复（三层检测）。
+    前两层查近似重复索引：最近几条精确比较，其余历史只比较 MinHash/LSH 候选（更严的 archive_jaccard 阈值）。
     返回 (is_dup, reason) — is_dup=True 表示应跳过。
     """
-    recent = _get_recent_posts(10)
-    new_tokens = _tokenize(content)
-    if not new_tokens:
-        return False, ""
-
-    for post_path in recent:
-        body = _extract_post_body(post_path)
-        if not body:
-            continue
-
-        # Layer 1: N-gram 余弦相似度
-        sem_sim = _semantic_similarity(content, body)
-        if sem_sim is not None and sem_sim > 0.20:
-            return True, f"N-gram相似：与 {post_path.name} 相似度 {sem_sim:.1%} > 20%"
-
-        # Layer 2: Jaccard（兜底）
-        old_tokens = _tokenize(body)
-        sim = _jaccard_similarity(new_tokens, old_tokens)
-        if sim > threshold:
-            return True, f"词汇相似：与 {post_path.name} Jaccard {sim:.1%} > {threshold:.0%}"
+    recent = _get_recent_posts(DEDUP_RECENT_WINDOW)
+    ngram_cosine = DEDUP_NGRAM_COSINE
+    token_jaccard = DEDUP_TOKEN_JACCARD if threshold is None else threshold
+
+    # Layer 1: N-gram 余弦相似度 / Layer 2: Jaccard（兜底）
+    dup = _dedup_index().find_duplicate(content, recent, ngram_cosine=ngram_cosine, token_jaccard=token_jaccard,
+                                        archive_jaccard=DEDUP_ARCHIVE_JACCARD)
+    if dup:
+        path, layer, sim = dup
+        name = Path(path).name
+        if layer == 'ngram':
+            return True, f"N-gram相似：与 {name} 相似度 {sim:.1%} > {ngram_cosine:.0%}"
+        if layer == 'minhash':
+            return True, f"历史近似重复：与 {name} MinHash Jaccard 约 {sim:.1%} > {DEDUP_ARCHIVE_JACCARD:.0%}"
+        return True, f"词汇相似：与 {name} Jaccard {sim:.1%} > {token_jaccard:.0%}"
 
     # Layer 3: 话题冷却
     is_cool, cool_reason = _topic_cooldown_check(content)
@@ -2889,6 +2856,9 @@ def create_post(content, mood, suffix="auto"):
     try:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(md_content)
+        _posts_catalog().add(filepath)
+        _dedup_index().sync()
+        _topic_counters().sync()
         print(f"✅ Created post: {filename}")
         return filepath
     except Exception as e:
@@ -3118,13 +3088,10 @@ def main():
 
     # === 防重发安全阀：10分钟内不允许连续发帖 ===
     if should_run_now and not args.force:
-        posts_dir = Path(POSTS_DIR)
-        today_dir = posts_dir / now.strftime("%Y/%m/%d")
-        if today_dir.exists():
-            recent_posts = [f for f in today_dir.glob("*.md") if (now - datetime.fromtimestamp(f.stat().st_mtime)).total_seconds() < 600]
-            if recent_posts:
-                print(f"⛔ Anti-burst: {len(recent_posts)} post(s) created in last 10 minutes. Skipping.")
-                should_run_now = False
+        recent_posts = _posts_catalog().modified_since(now.timestamp() - 600, day=now.strftime("%Y-%m-%d"))
+        if recent_posts:
+            print(f"⛔ Anti-burst: {len(recent_posts)} post(s) created in last 10 minutes. Skipping.")
+            should_run_now = False
 
     if should_run_now:
         # === 执行发布流程 ===
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import argparse
 import http.server
-import socketserver
 import os
 import subprocess
 import signal
@@ -9,11 +8,20 @@ import time
 import random
 import threading
 import json
+import io
+import re
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
-# form watchdog.observers import Observer -> PollingObserver for stability in environments with low inotify limits
-from watchdog.observers.polling import PollingObserver as Observer
+# Native observer (inotify on Linux) by default; PollingObserver is the fallback for
+# environments with low inotify limits or filesystems without change notifications
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 import tools.model_ops as model_ops
+from tools.render_daemon import request_render, default_socket_path, ping_daemon
+from tools.render_assets import FINGERPRINT_LENGTH
+from tools.render_images import COVER_OUTPUT_DIR, DIGEST_LENGTH
 
 import sys
 from pathlib import Path
@@ -30,6 +38,59 @@ SEC_CONFIG = load_config()
 PROJECT_DIR = Path(__file__).parent
 OUTPUT_DIR = resolve_path(SEC_CONFIG["paths"].get("output_dir", "./dist"))
 PORT = 8080
+# Socket of the resident render daemon (tools/render_daemon.py serve)
+RENDER_SOCKET = default_socket_path()
+
+# File watcher: "auto" tries inotify and falls back to polling, "poll" always polls
+PREVIEW_CONFIG = SEC_CONFIG.get("preview", {})
+WATCH_MODE = PREVIEW_CONFIG.get("watch_mode", "auto")
+WATCH_POLL_INTERVAL = float(PREVIEW_CONFIG.get("watch_poll_interval", 1.0))
+# Changes are collected until no new event arrives for this long, then rendered as one batch
+WATCH_QUIET_MS = int(PREVIEW_CONFIG.get("watch_quiet_ms", 300))
+
+# Small files served from memory (validated against size/mtime on every request)
+HOT_CACHE_BYTES = int(PREVIEW_CONFIG.get("hot_cache_mb", 32)) * 1024 * 1024
+HOT_FILE_MAX_BYTES = 256 * 1024
+
+# Content-hashed names never change content: style.<hash>.css, covers/<hash>-<width>.webp
+IMMUTABLE_RE = re.compile(rf'(\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}\.[A-Za-z0-9]+|^/{COVER_OUTPUT_DIR}/[0-9a-f]{{{DIGEST_LENGTH}}}-\d+\.[A-Za-z0-9]+)$')
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Everything else may change on the next render: cache but revalidate with ETag / Last-Modified
+DEFAULT_CACHE_CONTROL = "no-cache"
+# Precompressed siblings written by the render step (output.precompress), in order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+class HotFileCache:
+    """LRU cache of small file contents keyed by path, invalidated by size/mtime"""
+    def __init__(self, limit=HOT_CACHE_BYTES):
+        self.limit = limit
+        self.size = 0
+        self.files = OrderedDict()
+        self.lock = threading.Lock()
+
+    def read(self, path, st):
+        key = (st.st_size, st.st_mtime_ns)
+        with self.lock:
+            entry = self.files.get(path)
+            if entry is not None and entry[0] == key:
+                self.files.move_to_end(path)
+                return entry[1]
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) > HOT_FILE_MAX_BYTES or len(data) > self.limit:
+            return data
+        with self.lock:
+            old = self.files.pop(path, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.files[path] = (key, data)
+            self.size += len(data)
+            while self.size > self.limit:
+                _, (_, evicted) = self.files.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+HOT_FILES = HotFileCache()
 
 # Directories to watch
 WATCH_DIRS = [
@@ -62,22 +123,126 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
             
         if self.path == "/api/rescue/models":
             try:
-                models = model_ops.list_all_models()
-                config = model_ops.get_config()
-                primary = config.get('agents', {}).get('defaults', {}).get('model', {}).get('primary', '')
-                
-                response = json.dumps({"models": models, "primary": primary}).encode("utf-8")
+                # Cached until openclaw.json changes (or a switch), unchanged lists answer 304
+                response, etag = model_ops.get_model_catalog()
+                if self._not_modified(etag, None):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    return
                 self.send_response(200)
                 self.send_header("Content-Type", "application/json")
                 self.send_header("Content-Length", str(len(response)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
                 self.end_headers()
                 self.wfile.write(response)
             except Exception as e:
                 self.send_error(500, str(e))
             return
 
+        if self.path.split("?", 1)[0] == "/api/render/status":
+            response = json.dumps(RENDER_QUEUE.status(), ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+            return
+
         return super().do_GET()
 
+    def _accepted_encodings(self):
+        accepted = set()
+        for part in self.headers.get("Accept-Encoding", "").split(","):
+            coding, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(coding.strip().lower())
+        return accepted
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and mtime is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, OverflowError):
+                return False
+        return False
+
+    def send_head(self):
+        """
+        Static files: precompressed .br/.gz siblings, ETag/Last-Modified with 304 answers,
+        long-lived caching for content-hashed names and small files served from memory.
+        Directory redirects/listings and errors are left to SimpleHTTPRequestHandler.
+        """
+        url_path = self.path.split("?", 1)[0].split("#", 1)[0]
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not url_path.endswith("/") or not os.path.isfile(index):
+                return super().send_head()
+            path = index
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        # Serve a precompressed sibling only if it is at least as new as the file itself
+        encoding = None
+        send_path, send_st = path, st
+        accepted = self._accepted_encodings()
+        for coding, suffix in PRECOMPRESSED:
+            if coding not in accepted:
+                continue
+            try:
+                sibling_st = os.stat(path + suffix)
+            except OSError:
+                continue
+            if sibling_st.st_mtime_ns >= st.st_mtime_ns:
+                encoding, send_path, send_st = coding, path + suffix, sibling_st
+                break
+        has_variants = any(os.path.exists(path + suffix) for _, suffix in PRECOMPRESSED)
+
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + encoding if encoding else ""}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL if IMMUTABLE_RE.search(url_path) else DEFAULT_CACHE_CONTROL
+        if self._not_modified(etag, st.st_mtime):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            if has_variants:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return None
+
+        try:
+            if send_st.st_size <= HOT_FILE_MAX_BYTES:
+                body = io.BytesIO(HOT_FILES.read(send_path, send_st))
+            else:
+                body = open(send_path, "rb")
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if has_variants:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(send_st.st_size))
+        self.send_header("Last-Modified", formatdate(st.st_mtime, usegmt=True))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        return body
+
     def do_POST(self):
         if self.path == "/api/rescue/switch":
             try:
@@ -152,62 +317,208 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
             self.send_error(500, "Failed to delete file")
             return
 
-        # Re-render
-        if not ensure_rendered():
-            self.send_error(500, "Render failed after delete")
-            return
+        # Re-render in the background; the client polls /api/render/status for the job
+        job_id = RENDER_QUEUE.submit([target], "delete")
 
-        response = json.dumps({"ok": True, "file": rel_path.as_posix()}).encode("utf-8")
-        self.send_response(200)
+        response = json.dumps({"ok": True, "file": rel_path.as_posix(), "job": job_id}).encode("utf-8")
+        self.send_response(202)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(response)))
         self.end_headers()
         self.wfile.write(response)
 
 class FileChangeHandler(FileSystemEventHandler):
-    """File change listener"""
-    def __init__(self):
-        self.last_render_time = 0
-        self.render_lock = threading.Lock()
-    
-    def on_modified(self, event):
-        if event.is_directory:
-            return
-        
-        # Ignore temporary and hidden files
-        if event.src_path.endswith('~') or '/.git/' in event.src_path or '/__pycache__/' in event.src_path:
+    """File change listener: coalesces bursts of events into one incremental render"""
+    def __init__(self, quiet_ms=WATCH_QUIET_MS):
+        self.quiet = quiet_ms / 1000
+        self.lock = threading.Lock()
+        # Paths changed since the last render, passed to the render daemon as a hint
+        self.pending_paths = set()
+        self.timer = None
+
+    @staticmethod
+    def _ignored(path):
+        # Ignore temporary, hidden and editor swap files
+        name = os.path.basename(path)
+        return (path.endswith('~') or name.startswith('.') or name.endswith(('.swp', '.tmp'))
+                or '/.git/' in path or '/__pycache__/' in path)
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in ('opened', 'closed_no_write'):
             return
-        
-        # Debounce: only render once per second
-        current_time = time.time()
-        if current_time - self.last_render_time < 1:
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        paths = [p for p in paths if p and not self._ignored(p)]
+        if not paths:
             return
-        
-        with self.render_lock:
-            self.last_render_time = current_time
-            print(f"\n📝 File changed: {event.src_path}")
-            self.render()
-    
-    def on_created(self, event):
-        self.on_modified(event)
-    
-    def render(self):
-        """Run rendering script"""
-        try:
-            print("🎨 Rendering...")
-            result = subprocess.run(
-                ['python3', 'tools/render.py'],
-                cwd=PROJECT_DIR,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                print("✅ Render complete! Refresh your browser.")
+        with self.lock:
+            self.pending_paths.update(paths)
+            # Every event restarts the quiet period; the batch renders once the burst is over
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.quiet, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        # The render queue serialises renders; events arriving meanwhile form the next batch
+        with self.lock:
+            changed, self.pending_paths = self.pending_paths, set()
+            self.timer = None
+        if changed:
+            RENDER_QUEUE.submit(changed, "watch")
+
+def render_changed(changed):
+    """
+    Incremental render of a batch of changed paths (through the render daemon when it is running).
+    Returns {'ok', 'via', 'rendered', 'elapsed_ms', 'error'}
+    """
+    start = time.perf_counter()
+    response = request_render(RENDER_SOCKET, changed=changed)
+    if response is None and start_render_daemon():
+        # The daemon exits when the render code changed; restart it and retry once
+        response = request_render(RENDER_SOCKET, changed=changed)
+    if response is not None:
+        summary = response.get('summary') or {}
+        return {
+            'ok': bool(response.get('ok')),
+            'via': 'daemon',
+            'rendered': summary.get('rendered'),
+            'elapsed_ms': round(summary.get('elapsed_ms') or (time.perf_counter() - start) * 1000, 1),
+            'error': response.get('error'),
+        }
+    try:
+        result = subprocess.run(
+            ['python3', 'tools/render.py', '--no-daemon'],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+        error = result.stderr if result.returncode != 0 else None
+    except Exception as e:
+        error = str(e)
+    return {
+        'ok': error is None,
+        'via': 'subprocess',
+        'rendered': None,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        'error': error,
+    }
+
+class RenderQueue:
+    """
+    Serial render job queue. Mutations (deletes, watched file changes) submit the paths they
+    touched and get a job id back immediately; a job that has not started yet absorbs later
+    submissions, so bursts collapse into one render and renders never overlap.
+    """
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.next_id = 1
+        self.pending = None
+        self.current = None
+        self.last = None
+        self.submitted = 0
+        self.coalesced = 0
+        self.worker = None
+
+    def submit(self, paths, reason):
+        with self.cond:
+            self.submitted += 1
+            if self.pending is not None:
+                self.pending['paths'].update(str(p) for p in paths)
+                if reason not in self.pending['reasons']:
+                    self.pending['reasons'].append(reason)
+                self.coalesced += 1
+                return self.pending['id']
+            job = {
+                'id': self.next_id,
+                'paths': {str(p) for p in paths},
+                'reasons': [reason],
+                'submitted_at': time.time(),
+            }
+            self.next_id += 1
+            self.pending = job
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name="render-queue", daemon=True)
+                self.worker.start()
+            self.cond.notify()
+            return job['id']
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None:
+                    self.cond.wait()
+                job, self.pending = self.pending, None
+                job['started_at'] = time.time()
+                self.current = job
+            paths = sorted(job['paths'])
+            shown = ', '.join(os.path.relpath(p, PROJECT_DIR) for p in paths[:3])
+            more = f" (+{len(paths) - 3} more)" if len(paths) > 3 else ''
+            print(f"\n📝 Render job #{job['id']} ({', '.join(job['reasons'])}): {len(paths)} file(s) changed: {shown}{more}")
+            try:
+                result = render_changed(job['paths'])
+            except Exception as e:
+                result = {'ok': False, 'via': None, 'rendered': None, 'elapsed_ms': None, 'error': str(e)}
+            if result['ok']:
+                rendered = f"{result['rendered']} outputs" if result['rendered'] is not None else "site"
+                print(f"✅ Job #{job['id']}: {rendered} rendered by {result['via']} in {result['elapsed_ms']:.0f} ms. Refresh your browser.")
             else:
-                print(f"❌ Render failed: {result.stderr}")
-        except Exception as e:
-            print(f"❌ Error rendering: {e}")
+                print(f"❌ Job #{job['id']} render failed: {result['error']}")
+            with self.cond:
+                job.update(result, finished_at=time.time())
+                self.current = None
+                self.last = job
+                self.cond.notify_all()
+
+    @staticmethod
+    def _describe(job):
+        if job is None:
+            return None
+        info = {k: v for k, v in job.items() if k != 'paths'}
+        info['paths'] = [os.path.relpath(p, PROJECT_DIR) for p in sorted(job['paths'])]
+        return info
+
+    def status(self):
+        with self.cond:
+            return {
+                'queue_depth': int(self.pending is not None),
+                'pending': self._describe(self.pending),
+                'current': self._describe(self.current),
+                'last': self._describe(self.last),
+                # Job ids are sequential: job N is done once last_finished_id >= N
+                'last_finished_id': self.last['id'] if self.last else 0,
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+            }
+
+RENDER_QUEUE = RenderQueue()
+
+RENDER_DAEMON = None
+
+def start_render_daemon():
+    """Start tools/render_daemon.py in the background unless one is already serving; returns True once it answers"""
+    global RENDER_DAEMON
+    if RENDER_DAEMON is not None and RENDER_DAEMON.poll() is None:
+        return False
+    RENDER_DAEMON = subprocess.Popen(
+        ['python3', 'tools/render_daemon.py', 'serve', '--socket', str(RENDER_SOCKET)],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(50):
+        if RENDER_DAEMON.poll() is not None:
+            # Exits immediately when another daemon already owns the socket
+            return ping_daemon(RENDER_SOCKET) is not None
+        if ping_daemon(RENDER_SOCKET) is not None:
+            return True
+        time.sleep(0.1)
+    return False
+
+def stop_render_daemon():
+    if RENDER_DAEMON is not None and RENDER_DAEMON.poll() is None:
+        RENDER_DAEMON.terminate()
+        RENDER_DAEMON.wait(timeout=10)
 
 def kill_process_on_port(port):
     """Kill process occupying specified port"""
@@ -233,17 +544,36 @@ def kill_process_on_port(port):
         print(f"⚠️  Error checking port: {e}")
         return False
 
-def start_file_watcher():
-    """Start file watcher"""
-    event_handler = FileChangeHandler()
-    observer = Observer()
-    
+def _schedule(observer, event_handler):
     for watch_dir in WATCH_DIRS:
         if watch_dir.exists():
             observer.schedule(event_handler, str(watch_dir), recursive=True)
+    try:
+        observer.start()
+    except OSError:
+        observer.stop()
+        raise
+    return observer
+
+def start_file_watcher(mode=WATCH_MODE, poll_interval=WATCH_POLL_INTERVAL):
+    """Start file watcher (inotify when available, polling otherwise)"""
+    event_handler = FileChangeHandler()
+    observer = None
+    if mode != "poll":
+        try:
+            observer = _schedule(Observer(), event_handler)
+            kind = "native events"
+        except OSError as e:
+            # e.g. inotify watch/instance limit reached
+            print(f"⚠️  Native file events unavailable ({e}), falling back to polling")
+    if observer is None:
+        observer = _schedule(PollingObserver(timeout=poll_interval), event_handler)
+        kind = f"polling every {poll_interval:g}s"
+
+    for watch_dir in WATCH_DIRS:
+        if watch_dir.exists():
             print(f"👀 Watching: {watch_dir}")
-    
-    observer.start()
+    print(f"👀 Watcher: {type(observer).__name__} ({kind}), batches after {event_handler.quiet * 1000:.0f} ms quiet")
     return observer
 
 def find_free_port():
@@ -252,9 +582,11 @@ def find_free_port():
 
 def start_server(port):
     """Attempt to start server on specified port"""
-    socketserver.TCPServer.allow_reuse_address = True
+    # One thread per connection: a slow client no longer blocks other requests
+    http.server.ThreadingHTTPServer.allow_reuse_address = True
+    http.server.ThreadingHTTPServer.daemon_threads = True
     try:
-        httpd = socketserver.TCPServer(("", port), MyHandler)
+        httpd = http.server.ThreadingHTTPServer(("", port), MyHandler)
         return httpd
     except OSError:
         return None
@@ -296,6 +628,8 @@ def main():
     parser = argparse.ArgumentParser(description="Clawtter Dev Server")
     parser.add_argument("-p", "--port", type=int, default=8080, help="Server port (default: 8080)")
     parser.add_argument("-push", "--push", action="store_true", help="Render static HTML and push, then exit")
+    parser.add_argument("--poll", nargs="?", type=float, const=WATCH_POLL_INTERVAL, metavar="SECONDS",
+                        help="Watch files by polling (optionally with this interval) instead of inotify")
     args = parser.parse_args()
 
     if args.push:
@@ -350,8 +684,13 @@ def main():
     print(f"👀 Auto-reload: ENABLED")
     print(f"💡 Press Ctrl+C to stop\n")
     
-    # Start file watching
-    observer = start_file_watcher()
+    # Keep parsed posts in memory between renders, then start file watching
+    if start_render_daemon():
+        print(f"🛰️  Render daemon: {RENDER_SOCKET}")
+    if args.poll is not None:
+        observer = start_file_watcher(mode="poll", poll_interval=args.poll)
+    else:
+        observer = start_file_watcher()
     
     try:
         httpd.serve_forever()
@@ -359,6 +698,7 @@ def main():
         print("\n👋 Stopping server...")
         observer.stop()
         observer.join()
+        stop_render_daemon()
         httpd.server_close()
         print("✅ Server stopped.")
 
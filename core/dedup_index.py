@@ -0,0 +1,296 @@
+"""
+Clawtter - 推文近似重复索引
+为每条推文保存字符 3-gram 计数、分词集合与 MinHash 签名（与推文目录索引共用一个 SQLite 数据库），
+签名按 LSH 分段写入桶表。查重时最近几条推文按 3-gram 余弦 / 分词 Jaccard 精确比较；
+更早的历史只看与新内容落入同一个桶的推文，按签名估计的 3-gram 集合 Jaccard 判断，只用保存的草图，不再读取旧文件。
+目录索引中内容哈希变化的推文才重新读取文件、计算草图。
+"""
+import hashlib
+import json
+import math
+import re
+import struct
+from array import array
+from collections import Counter
+
+# 草图算法变更时递增，已保存的草图会被整体重建
+SKETCH_VERSION = 1
+NGRAM_SIZE = 3
+# 至少共享这么多个 LSH 桶才算候选：背景噪声（Jaccard 0.05 左右）偶尔撞上一个桶，几乎不会撞上两个
+MIN_SHARED_BANDS = 2
+# 空桶补齐时的距离偏移（大奇数），签名按 64 位无符号保存
+_DENSIFY_OFFSET = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+def ngram_counts(text, n=NGRAM_SIZE):
+    """字符 n-gram 计数：去掉标点空白后按字符切分，对中文同样有效"""
+    text = re.sub(r'[^\u4e00-\u9fff\w]', '', text.lower())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def tokenize(text):
+    """简单分词：中文按 bigram，其它按空格，去掉单字符 token"""
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    tokens = set()
+    for word in text.split():
+        if len(word) <= 1:
+            continue
+        if any('\u4e00' <= c <= '\u9fff' for c in word):
+            for i in range(len(word) - 1):
+                tokens.add(word[i:i + 2])
+        else:
+            tokens.add(word)
+    return tokens
+
+
+def cosine_similarity(counts_a, counts_b):
+    if not counts_a or not counts_b:
+        return None
+    dot = sum(v * counts_b[k] for k, v in counts_a.items() if k in counts_b)
+    norm_a = math.sqrt(sum(v * v for v in counts_a.values()))
+    norm_b = math.sqrt(sum(v * v for v in counts_b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def jaccard_similarity(set_a, set_b):
+    if not set_a or not set_b:
+        return 0.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class MinHasher:
+    """
+    单排列 MinHash（one permutation hashing）：每个 shingle 只哈希一次，按哈希值分到 num_perm 个桶，
+    每个桶取最小值作为签名的一位；空桶按顺时针最近的非空桶补齐（densification）。
+    与 num_perm 次独立排列的估计效果相当，计算量只有一次哈希
+    """
+
+    def __init__(self, num_perm):
+        self.num_perm = num_perm
+
+    def signature(self, shingles):
+        k = self.num_perm
+        bins = [None] * k
+        for s in shingles:
+            h = _hash64(s)
+            b, v = h % k, h // k
+            if bins[b] is None or v < bins[b]:
+                bins[b] = v
+        if all(v is None for v in bins):
+            return []
+        signature = []
+        for i in range(k):
+            j = 0
+            while bins[(i + j) % k] is None:
+                j += 1
+            # 借用的值加上距离偏移，避免不同位置借到同一个值时被当成一致
+            signature.append((bins[(i + j) % k] + j * _DENSIFY_OFFSET) & _MASK_64)
+        return signature
+
+
+def estimate_jaccard(sig_a, sig_b):
+    """两个 MinHash 签名中相同位置取值一致的比例，即 3-gram 集合 Jaccard 的估计"""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def band_keys(signature, bands, rows):
+    """
+    LSH：签名切成 bands 段，每段 rows 个值连同段号哈希成一个桶键（SQLite 有符号 64 位整数），
+    段号参与哈希，不同段的桶不会混在一起
+    """
+    keys = []
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(struct.pack(f'<I{len(chunk)}Q', band, *chunk), digest_size=8).digest()
+        keys.append(struct.unpack('<q', digest)[0])
+    return keys
+
+
+class Sketch:
+    __slots__ = ('ngrams', 'tokens', 'signature')
+
+    def __init__(self, ngrams, tokens, signature):
+        self.ngrams = ngrams
+        self.tokens = tokens
+        self.signature = signature
+
+
+class DedupIndex:
+    """
+    挂在 PostsCatalog 上的近似重复索引。bands * rows 为 MinHash 签名长度。
+    两档阈值：最近几条推文用原来的 3-gram 计数余弦 0.2 / 分词 Jaccard 0.6 精确比较；
+    更早的历史只比较 LSH 候选（至少共享 MIN_SHARED_BANDS 个桶），按签名估计的 3-gram 集合 Jaccard
+    超过 archive_jaccard 才算重复。余弦 0.2 对应的集合 Jaccard 可以低到 0.04，
+    没有哪种分段方式能在这个相似度上召回而候选不接近全部历史，所以历史一档用 LSH 能覆盖的阈值：
+    默认 32 段 * 2 行时，Jaccard 为 0.4 / 0.5 / 0.6 的一对推文成为候选的概率约为 97.3% / 99.9% / 100%。
+    代价是历史中只改写了大半句子的重复（J 低于 archive_jaccard）不再被拦下，由最近窗口与话题冷却兜底
+    """
+
+    def __init__(self, catalog, bands=32, rows=2):
+        self.catalog = catalog
+        self.conn = catalog.conn
+        self.lock = catalog.lock
+        self.bands = bands
+        self.rows = rows
+        self.hasher = MinHasher(bands * rows)
+        # 上次同步时目录索引的 generation
+        self.synced_generation = None
+        self._init_schema()
+
+    def _init_schema(self):
+        params = json.dumps({'version': SKETCH_VERSION, 'bands': self.bands, 'rows': self.rows, 'ngram': NGRAM_SIZE})
+        with self.lock:
+            cur = self.conn.cursor()
+            row = cur.execute("SELECT value FROM meta WHERE key = 'dedup'").fetchone()
+            if not row or row[0] != params:
+                cur.execute("DROP TABLE IF EXISTS dedup_sketches")
+                cur.execute("DROP TABLE IF EXISTS dedup_buckets")
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_sketches (
+                    root TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    ngrams TEXT NOT NULL,
+                    tokens TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    PRIMARY KEY (root, path)
+                )
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_buckets (
+                    root TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    path TEXT NOT NULL
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS dedup_buckets_key ON dedup_buckets (bucket, root)")
+            cur.execute("CREATE INDEX IF NOT EXISTS dedup_buckets_path ON dedup_buckets (root, path)")
+            cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedup', ?)", (params,))
+            self.conn.commit()
+
+    def sketch(self, body):
+        ngrams = ngram_counts(body)
+        return Sketch(ngrams, tokenize(body), self.hasher.signature(ngrams))
+
+    def sync(self):
+        """为内容哈希变化或新增的推文重算草图，删除已不在目录索引中的草图。返回 (更新, 删除) 数量"""
+        from core.posts_catalog import read_body
+
+        self.catalog.refresh()
+        generation = self.catalog.generation
+        root = self.catalog.root
+        with self.lock:
+            stale = self.conn.execute(
+                "SELECT p.path, p.digest FROM posts p LEFT JOIN dedup_sketches s "
+                "ON s.root = p.root AND s.path = p.path WHERE p.root = ? AND (s.digest IS NULL OR s.digest != p.digest)",
+                (root,)).fetchall()
+            removed = [r[0] for r in self.conn.execute(
+                "SELECT s.path FROM dedup_sketches s LEFT JOIN posts p ON p.root = s.root AND p.path = s.path "
+                "WHERE s.root = ? AND p.path IS NULL", (root,))]
+            for path in removed + [r[0] for r in stale]:
+                self.conn.execute("DELETE FROM dedup_buckets WHERE root = ? AND path = ?", (root, path))
+            self.conn.executemany("DELETE FROM dedup_sketches WHERE root = ? AND path = ?",
+                                  [(root, path) for path in removed])
+            updated = 0
+            for path, digest in stale:
+                body = read_body(path)
+                if body is None:
+                    # 文件已被删除，下次对账时从目录索引中移除
+                    self.conn.execute("DELETE FROM dedup_sketches WHERE root = ? AND path = ?", (root, path))
+                    continue
+                sk = self.sketch(body)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dedup_sketches (root, path, digest, ngrams, tokens, signature) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (root, path, digest, json.dumps(sk.ngrams, ensure_ascii=False),
+                     json.dumps(sorted(sk.tokens), ensure_ascii=False), array('Q', sk.signature).tobytes()))
+                if sk.signature:
+                    self.conn.executemany(
+                        "INSERT INTO dedup_buckets (root, bucket, path) VALUES (?, ?, ?)",
+                        [(root, key, path) for key in band_keys(sk.signature, self.bands, self.rows)])
+                updated += 1
+            self.conn.commit()
+            self.synced_generation = generation
+            return updated, len(removed)
+
+    def ensure_synced(self):
+        """与磁盘对账，目录索引有变化（包括其它进程写入的推文）时同步草图"""
+        self.catalog.refresh()
+        if self.synced_generation != self.catalog.generation:
+            self.sync()
+
+    def _candidate_sql(self, sk):
+        """与 sk 至少共享 MIN_SHARED_BANDS 个 LSH 桶的推文路径（子查询及其参数）"""
+        keys = band_keys(sk.signature, self.bands, self.rows) if sk.signature else []
+        if not keys:
+            return None, ()
+        placeholders = ', '.join('?' * len(keys))
+        # +root：让查询走桶键索引，而不是按 root 扫描 path 索引
+        return (f"SELECT path FROM dedup_buckets WHERE +root = ? AND bucket IN ({placeholders}) "
+                f"GROUP BY path HAVING COUNT(*) >= ?",
+                (self.catalog.root, *keys, min(MIN_SHARED_BANDS, self.bands)))
+
+    def candidates(self, sk):
+        """与 sk 至少共享 MIN_SHARED_BANDS 个 LSH 桶的推文路径"""
+        sql, params = self._candidate_sql(sk)
+        return [r[0] for r in self.conn.execute(sql, params)] if sql else []
+
+    def _load(self, paths):
+        """读取指定推文的 3-gram 计数与分词集合（只用于最近窗口的几条）"""
+        if not paths:
+            return {}
+        placeholders = ', '.join('?' * len(paths))
+        rows = self.conn.execute(
+            f"SELECT path, ngrams, tokens FROM dedup_sketches WHERE root = ? AND path IN ({placeholders})",
+            (self.catalog.root, *paths)).fetchall()
+        return {path: (Counter(json.loads(ngrams)), set(json.loads(tokens))) for path, ngrams, tokens in rows}
+
+    def _candidate_signatures(self, sk, exclude):
+        """LSH 候选的 (路径, 签名)，跳过 exclude 中的路径"""
+        sql, params = self._candidate_sql(sk)
+        if not sql:
+            return []
+        return [(path, array('Q', sig)) for path, sig in self.conn.execute(
+            f"SELECT path, signature FROM dedup_sketches WHERE root = ? AND path IN ({sql})",
+            (self.catalog.root, *params)) if path not in exclude]
+
+    def find_duplicate(self, body, recent_paths=(), ngram_cosine=0.20, token_jaccard=0.6, archive_jaccard=0.5):
+        """
+        检查 body 是否与已有推文重复，返回 (路径, 层, 相似度)，没有重复时返回 None。
+        recent_paths 中的推文按顺序精确比较，3-gram 余弦 > ngram_cosine（层 'ngram'）或
+        分词 Jaccard > token_jaccard（层 'jaccard'）即返回；其余历史只比较 LSH 候选，
+        返回签名估计的 3-gram 集合 Jaccard 最高且 > archive_jaccard 的一条（层 'minhash'）
+        """
+        self.ensure_synced()
+        sk = self.sketch(body)
+        if not sk.tokens:
+            return None
+        recent = [str(p) for p in recent_paths]
+        with self.lock:
+            loaded = self._load(recent)
+            candidates = self._candidate_signatures(sk, set(recent))
+
+        for path in recent:
+            if path not in loaded:
+                continue
+            ngrams, tokens = loaded[path]
+            sim = cosine_similarity(sk.ngrams, ngrams)
+            if sim is not None and sim > ngram_cosine:
+                return path, 'ngram', sim
+            sim = jaccard_similarity(sk.tokens, tokens)
+            if sim > token_jaccard:
+                return path, 'jaccard', sim
+
+        best = None
+        for path, signature in candidates:
+            sim = estimate_jaccard(sk.signature, signature)
+            if sim > archive_jaccard and (best is None or sim > best[2]):
+                best = (path, 'minhash', sim)
+        return best
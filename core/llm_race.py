@@ -0,0 +1,139 @@
+"""
+Clawtter - 模型通道竞速
+按优先级启动各个模型通道的尝试，取第一个合格的回答：
+sequential 前一个失败才启动下一个；hedged 前一个失败或 hedge_delay 秒内没有返回就同时启动下一个；
+parallel 一开始就全部启动。同时运行的尝试不超过 max_parallel 个。
+分出胜负或到达总期限后，其余尝试被取消：CLI 子进程整组杀掉，HTTP 请求的结果直接丢弃。
+"""
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+
+MODES = ('sequential', 'hedged', 'parallel')
+
+
+def _kill(proc):
+    """杀掉子进程所在的整个进程组（opencode 等 CLI 会再启动子进程）"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class Attempt:
+    """
+    一次通道尝试。run(attempt, timeout) 返回回答文本，失败返回 None；
+    timeout 为到总期限的剩余秒数（没有期限时为 None），单次请求的超时不应超过它
+    """
+
+    def __init__(self, label, run):
+        self.label = label
+        self.run = run
+        self.cancelled = threading.Event()
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def run_process(self, args, input_text, timeout=None):
+        """
+        在独立进程组中运行子进程，返回 CompletedProcess；取消时子进程被杀掉并返回 None，
+        超时时同样杀掉后抛出 subprocess.TimeoutExpired
+        """
+        with self._lock:
+            if self.cancelled.is_set():
+                return None
+            proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True, start_new_session=True)
+            self._proc = proc
+        try:
+            stdout, stderr = proc.communicate(input_text, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill(proc)
+            proc.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._proc = None
+        if self.cancelled.is_set():
+            return None
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled.set()
+            if self._proc is not None:
+                _kill(self._proc)
+
+
+def race(attempts, mode='hedged', hedge_delay=20.0, deadline=None, max_parallel=3, accept=None):
+    """
+    按 mode 运行按优先级排列的 attempts，返回 (胜出的 attempt, 回答)；
+    全部失败或超过 deadline 秒时返回 (None, None)。accept(回答) 判断回答是否合格，默认为非空文本
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown race mode: {mode}")
+    accept = accept or (lambda result: bool(result and result.strip()))
+    if mode == 'sequential':
+        hedge_delay, max_parallel = float('inf'), 1
+    elif mode == 'parallel':
+        hedge_delay = 0.0
+    max_parallel = max(1, max_parallel)
+
+    end = time.monotonic() + deadline if deadline else None
+    results = queue.Queue()
+    pending = list(attempts)
+    running = set()
+    # None 表示可以立即启动下一个（刚开始或上一个已失败）
+    last_launch = None
+
+    def _worker(attempt, timeout):
+        try:
+            result = attempt.run(attempt, timeout)
+        except Exception as e:
+            if not attempt.cancelled.is_set():
+                print(f"  ⚠️ Error with {attempt.label}: {str(e)[:100]}")
+            result = None
+        results.put((attempt, result))
+
+    try:
+        while pending or running:
+            now = time.monotonic()
+            if end is not None and now >= end:
+                print(f"⏱️ LLM deadline ({deadline:.0f}s) reached, cancelling {len(running)} running attempt(s)")
+                break
+            if pending and len(running) < max_parallel and (last_launch is None or now - last_launch >= hedge_delay):
+                attempt = pending.pop(0)
+                if running:
+                    print(f"⏱️ Hedging: {attempt.label} joins {len(running)} running attempt(s)")
+                timeout = None if end is None else end - now
+                # 守护线程：被放弃的 HTTP 请求不会拖住进程退出
+                threading.Thread(target=_worker, args=(attempt, timeout), daemon=True,
+                                 name=f"llm-{attempt.label}").start()
+                running.add(attempt)
+                last_launch = now
+                continue
+
+            waits = []
+            if end is not None:
+                waits.append(end - now)
+            if pending and len(running) < max_parallel and hedge_delay != float('inf'):
+                waits.append(last_launch + hedge_delay - now)
+            try:
+                attempt, result = results.get(timeout=max(min(waits), 0) if waits else None)
+            except queue.Empty:
+                continue
+            running.discard(attempt)
+            if accept(result):
+                if running:
+                    print(f"🏁 {attempt.label} answered first, cancelling {len(running)} other attempt(s)")
+                return attempt, result
+            last_launch = None
+    finally:
+        for attempt in running:
+            attempt.cancel()
+    return None, None
@@ -0,0 +1,277 @@
+"""
+Clawtter - 推文目录索引
+把 posts/ 下每条推文的路径、时间、来源后缀、标签、模型与内容哈希记录在 SQLite 中（不保存正文），
+发帖流程中“今天发过什么 / 最近几条 / 随机一条历史推文”等查询直接走索引，不再反复 rglob 全量读文件。
+create_post() 写文件后调用 add() 同步更新。进程内第一次查询时与磁盘完整对账一次（只 stat，不读未变化的文件），
+之后只 stat 新推文所在的目录链（posts/、年、月、今天），其它进程在这里新增或删除推文时才再次对账；
+更早日期目录中的手工修改在下一个发帖周期（新进程）或显式调用 reconcile() 时生效。
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# 表结构或解析规则变更时递增，旧索引会被整体重建
+CATALOG_VERSION = 2
+CATALOG_FILE_NAME = "posts-catalog.sqlite3"
+
+# 2026-02-11-194857-auto.md -> auto
+_SUFFIX_RE = re.compile(r'^\d{4}-\d{2}-\d{2}-\d{6}-(.+)\.md$')
+_PATH_DAY_RE = re.compile(r'(\d{4})[/-](\d{2})[/-](\d{2})')
+
+
+def parse_front_matter(text):
+    """返回 (头部字段, 正文)；没有头部时字段为空"""
+    if not text.startswith('---'):
+        return {}, text.strip()
+    end = text.find('\n---', 3)
+    if end < 0:
+        return {}, text.strip()
+    meta = {}
+    for line in text[3:end].splitlines():
+        key, sep, value = line.partition(':')
+        if sep and key.strip():
+            meta[key.strip()] = value.strip()
+    return meta, text[end + 4:].strip()
+
+
+def _record(filepath, raw):
+    text = raw.decode('utf-8', errors='replace')
+    meta, _ = parse_front_matter(text)
+    post_time = meta.get('time', '')
+    day = post_time[:10]
+    if not re.match(r'\d{4}-\d{2}-\d{2}$', day):
+        m = _PATH_DAY_RE.search(str(filepath))
+        day = '-'.join(m.groups()) if m else ''
+    m = _SUFFIX_RE.match(filepath.name)
+    tags = ', '.join(t.strip() for t in meta.get('tags', '').split(',') if t.strip())
+    return {
+        'time': post_time,
+        'day': day,
+        'suffix': m.group(1) if m else '',
+        'tags': tags,
+        'model': meta.get('model', ''),
+        'digest': hashlib.sha1(raw).hexdigest(),
+    }
+
+
+def read_body(path):
+    """读取推文正文（去掉头部），文件已不存在时返回 None"""
+    try:
+        text = Path(path).read_bytes().decode('utf-8', errors='replace')
+    except OSError:
+        return None
+    return parse_front_matter(text)[1]
+
+
+class PostsCatalog:
+    """
+    单个 posts 目录的索引，多个目录可共用一个数据库（按 root 区分）。
+    generation 在索引内容变化时递增，挂在索引上的派生数据（查重草图、话题计数）据此判断是否需要同步
+    """
+
+    def __init__(self, db_path, posts_dir):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.root = str(Path(posts_dir).resolve())
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.generation = 0
+        # 上次对账时受监视目录的 mtime，None 表示本进程尚未对账
+        self.watched = None
+        self._init_schema()
+
+    def _init_schema(self):
+        cur = self.conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = cur.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if not row or row[0] != str(CATALOG_VERSION):
+            cur.execute("DROP TABLE IF EXISTS posts")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS posts (
+                root TEXT NOT NULL,
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                time TEXT NOT NULL,
+                day TEXT NOT NULL,
+                suffix TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                model TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (root, path)
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS posts_day ON posts (root, day)")
+        cur.execute("CREATE INDEX IF NOT EXISTS posts_mtime ON posts (root, mtime_ns)")
+        cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(CATALOG_VERSION),))
+        self.conn.commit()
+
+    def _upsert(self, filepath, st, raw):
+        rec = _record(filepath, raw)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO posts (root, path, name, mtime_ns, size, time, day, suffix, tags, model, digest) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.root, str(filepath), filepath.name, st.st_mtime_ns, st.st_size, rec['time'], rec['day'],
+             rec['suffix'], rec['tags'], rec['model'], rec['digest'])
+        )
+
+    def add(self, filepath):
+        """写入/修改一条推文后调用，立即更新索引"""
+        filepath = Path(filepath).resolve()
+        with self.lock:
+            try:
+                st = filepath.stat()
+                raw = filepath.read_bytes()
+            except OSError:
+                self.conn.execute("DELETE FROM posts WHERE root = ? AND path = ?", (self.root, str(filepath)))
+            else:
+                self._upsert(filepath, st, raw)
+            self.conn.commit()
+            self.generation += 1
+
+    def reconcile(self):
+        """
+        与磁盘对账：只 stat 每个文件，size / mtime 变化的才重新读取；
+        已不存在的记录删除。返回 (新增, 更新, 删除) 数量
+        """
+        watched = self._watched_state()
+        with self.lock:
+            known = {path: (mtime_ns, size) for path, mtime_ns, size in self.conn.execute(
+                "SELECT path, mtime_ns, size FROM posts WHERE root = ?", (self.root,))}
+            added = updated = 0
+            seen = set()
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for name in filenames:
+                    if not name.endswith('.md'):
+                        continue
+                    filepath = Path(dirpath) / name
+                    key = str(filepath)
+                    try:
+                        st = filepath.stat()
+                        seen.add(key)
+                        old = known.get(key)
+                        if old == (st.st_mtime_ns, st.st_size):
+                            continue
+                        self._upsert(filepath, st, filepath.read_bytes())
+                    except OSError:
+                        continue
+                    if old is None:
+                        added += 1
+                    else:
+                        updated += 1
+            removed = [(self.root, path) for path in known if path not in seen]
+            self.conn.executemany("DELETE FROM posts WHERE root = ? AND path = ?", removed)
+            self.conn.commit()
+            # 取对账开始前的状态：对账期间发生的变化会在下次查询时再触发一次对账
+            self.watched = watched
+            if added or updated or removed:
+                self.generation += 1
+            return added, updated, len(removed)
+
+    def _watched_state(self):
+        """新推文写入的目录链 posts/YYYY/MM/DD（今天）及其上级的 mtime；新增、删除、改名都会改变目录 mtime"""
+        state = []
+        path = Path(self.root)
+        for part in [None] + time.strftime('%Y/%m/%d').split('/'):
+            if part is not None:
+                path = path / part
+            try:
+                state.append((str(path), os.stat(path).st_mtime_ns))
+            except OSError:
+                state.append((str(path), None))
+                break
+        return state
+
+    def refresh(self):
+        """本进程尚未对账，或受监视目录有新增/删除时重新对账；本进程自己的写入由 add() 更新"""
+        if self.watched is None or self._watched_state() != self.watched:
+            self.reconcile()
+
+    def _query(self, sql, params=()):
+        self.refresh()
+        with self.lock:
+            return self.conn.execute(sql, (self.root,) + tuple(params)).fetchall()
+
+    def recent(self, n=10):
+        """按修改时间倒序的最近 n 条推文路径"""
+        rows = self._query("SELECT path FROM posts WHERE root = ? ORDER BY mtime_ns DESC LIMIT ?", (n,))
+        return [Path(r[0]) for r in rows]
+
+    def modified_since(self, timestamp, exclude_name=None, day=None):
+        """修改时间晚于 timestamp（秒）的推文，返回 [(路径, 正文)]，按修改时间倒序（正文从文件读取）"""
+        sql = "SELECT path FROM posts WHERE root = ? AND mtime_ns > ?"
+        params = [int(timestamp * 1e9)]
+        if day is not None:
+            sql += " AND day = ?"
+            params.append(day)
+        if exclude_name:
+            sql += " AND instr(name, ?) = 0"
+            params.append(exclude_name)
+        rows = self._query(sql + " ORDER BY mtime_ns DESC", params)
+        posts = []
+        for (path,) in rows:
+            body = read_body(path)
+            if body is not None:
+                posts.append((Path(path), body))
+        return posts
+
+    def count(self, day=None, untagged=False, exclude_name=None):
+        sql = "SELECT COUNT(*) FROM posts WHERE root = ?"
+        params = []
+        if day is not None:
+            sql += " AND day = ?"
+            params.append(day)
+        if untagged:
+            sql += " AND tags = ''"
+        if exclude_name:
+            sql += " AND instr(name, ?) = 0"
+            params.append(exclude_name)
+        return self._query(sql, params)[0][0]
+
+    def posted_on(self, day, must_contain, exclude=None):
+        """day（YYYY-MM-DD）当天是否有推文包含 must_contain（且不包含 exclude），只读取当天的推文文件"""
+        for (path,) in self._query("SELECT path FROM posts WHERE root = ? AND day = ?", (day,)):
+            try:
+                text = Path(path).read_bytes().decode('utf-8', errors='replace')
+            except OSError:
+                continue
+            if must_contain in text and not (exclude and exclude in text):
+                return True
+        return False
+
+    def random_post(self, exclude_name=None, name_contains=None, exclude_days=()):
+        """随机选一条推文路径，没有符合条件的推文时返回 None"""
+        sql = "SELECT path FROM posts WHERE root = ?"
+        params = []
+        if exclude_name:
+            sql += " AND instr(name, ?) = 0"
+            params.append(exclude_name)
+        if name_contains:
+            sql += " AND instr(name, ?) > 0"
+            params.append(name_contains)
+        if exclude_days:
+            sql += f" AND day NOT IN ({', '.join('?' * len(exclude_days))})"
+            params.extend(exclude_days)
+        rows = self._query(sql + " ORDER BY RANDOM() LIMIT 1", params)
+        return Path(rows[0][0]) if rows else None
+
+    def close(self):
+        self.conn.close()
+
+
+_catalogs = {}
+
+
+def get_catalog(posts_dir, cache_dir):
+    """同一进程内每个 posts 目录只打开一次索引"""
+    key = str(Path(posts_dir).resolve())
+    if key not in _catalogs:
+        _catalogs[key] = PostsCatalog(Path(cache_dir) / CATALOG_FILE_NAME, posts_dir)
+    return _catalogs[key]
@@ -0,0 +1,150 @@
+"""
+Clawtter - 话题冷却计数器
+按小时分桶记录每条推文的关键词出现次数（与推文目录索引共用一个 SQLite 数据库），
+“关键词 X 最近 N 小时出现过几次”只需按关键词汇总几个桶，不再重读最近推文、重复提取关键词。
+每条推文只在内容哈希变化时计入一次（修改时先减去旧关键词），超出保留时长的桶自动清除；
+同一份计数也提供最近的热门话题，供生成 prompt 时避开。
+"""
+import json
+import time
+
+
+class TopicCounters:
+    """
+    挂在 PostsCatalog 上的关键词计数。extract 为关键词提取函数（文本 -> 关键词集合），
+    retention_hours 为桶的保留时长，查询窗口不能超过它
+    """
+
+    BUCKET_SECONDS = 3600
+
+    def __init__(self, catalog, extract, retention_hours=72):
+        self.catalog = catalog
+        self.conn = catalog.conn
+        self.lock = catalog.lock
+        self.extract = extract
+        self.retention_hours = retention_hours
+        # 上次同步时目录索引的 generation
+        self.synced_generation = None
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.lock:
+            cur = self.conn.cursor()
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS topic_counts (
+                    root TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (root, keyword, bucket)
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS topic_counts_bucket ON topic_counts (root, bucket)")
+            # 已计入的推文：修改或删除时据此撤销旧的计数
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS topic_posts (
+                    root TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    keywords TEXT NOT NULL,
+                    PRIMARY KEY (root, path)
+                )
+            """)
+            self.conn.commit()
+
+    def _bucket(self, timestamp):
+        return int(timestamp // self.BUCKET_SECONDS)
+
+    def _apply(self, bucket, keywords, delta):
+        root = self.catalog.root
+        self.conn.executemany(
+            "INSERT INTO topic_counts (root, keyword, bucket, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (root, keyword, bucket) DO UPDATE SET count = count + excluded.count",
+            [(root, kw, bucket, delta) for kw in keywords])
+
+    def sync(self, now=None):
+        """
+        把保留时长内新增 / 修改的推文计入，撤销已删除或修改前的计数，清除过期的桶。
+        返回 (计入, 撤销) 的推文数量
+        """
+        from core.posts_catalog import read_body
+
+        self.catalog.refresh()
+        generation = self.catalog.generation
+        now = time.time() if now is None else now
+        oldest = self._bucket(now) - self.retention_hours
+        root = self.catalog.root
+        with self.lock:
+            counted = {path: (digest, bucket, keywords) for path, digest, bucket, keywords in self.conn.execute(
+                "SELECT path, digest, bucket, keywords FROM topic_posts WHERE root = ?", (root,))}
+            current = self.conn.execute(
+                "SELECT path, digest, mtime_ns FROM posts WHERE root = ? AND mtime_ns >= ?",
+                (root, oldest * self.BUCKET_SECONDS * 10**9)).fetchall()
+            live = set()
+            added = revoked = 0
+            for path, digest, mtime_ns in current:
+                bucket = self._bucket(mtime_ns / 1e9)
+                old = counted.get(path)
+                if old and old[0] == digest and old[1] == bucket:
+                    live.add(path)
+                    continue
+                body = read_body(path)
+                if body is None:
+                    # 文件已被删除：按不在保留时长内处理（撤销旧计数）
+                    continue
+                live.add(path)
+                if old:
+                    self._apply(old[1], json.loads(old[2]), -1)
+                    revoked += 1
+                keywords = sorted(self.extract(body))
+                self._apply(bucket, keywords, 1)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO topic_posts (root, path, digest, bucket, keywords) VALUES (?, ?, ?, ?, ?)",
+                    (root, path, digest, bucket, json.dumps(keywords, ensure_ascii=False)))
+                added += 1
+            # 不在保留时长内的推文：桶未过期（被删除或改回旧的 mtime）时撤销计数
+            for path, (digest, bucket, keywords) in counted.items():
+                if path in live:
+                    continue
+                if bucket >= oldest:
+                    self._apply(bucket, json.loads(keywords), -1)
+                    revoked += 1
+                self.conn.execute("DELETE FROM topic_posts WHERE root = ? AND path = ?", (root, path))
+            self.conn.execute("DELETE FROM topic_counts WHERE root = ? AND (bucket < ? OR count <= 0)", (root, oldest))
+            self.conn.commit()
+            self.synced_generation = generation
+            return added, revoked
+
+    def ensure_synced(self, now=None):
+        """与磁盘对账，目录索引有变化（包括其它进程写入的推文）时同步计数"""
+        self.catalog.refresh()
+        if self.synced_generation != self.catalog.generation:
+            self.sync(now)
+
+    def counts(self, keywords, hours, now=None):
+        """{关键词: 最近 hours 小时内包含它的推文数}，未出现的关键词不返回"""
+        keywords = list(keywords)
+        if not keywords:
+            return {}
+        self.ensure_synced(now)
+        now = time.time() if now is None else now
+        since = self._bucket(now) - min(hours, self.retention_hours)
+        placeholders = ', '.join('?' * len(keywords))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT keyword, SUM(count) FROM topic_counts WHERE root = ? AND bucket >= ? "
+                f"AND keyword IN ({placeholders}) GROUP BY keyword",
+                (self.catalog.root, since, *keywords)).fetchall()
+        return {kw: n for kw, n in rows if n > 0}
+
+    def hot_topics(self, hours=24, limit=8, min_count=2, now=None):
+        """最近 hours 小时内出现次数最多的关键词 [(关键词, 次数)]"""
+        self.ensure_synced(now)
+        now = time.time() if now is None else now
+        since = self._bucket(now) - min(hours, self.retention_hours)
+        with self.lock:
+            return self.conn.execute(
+                "SELECT keyword, SUM(count) AS n FROM topic_counts WHERE root = ? AND bucket >= ? "
+                "GROUP BY keyword HAVING n >= ? ORDER BY n DESC, keyword LIMIT ?",
+                (self.catalog.root, since, min_count, limit)).fetchall()
@@ -74,20 +74,65 @@ if [ ! -d "$DEPLOY_DIR/.git" ]; then
     exit 1
 fi
 
-# 同步渲染产物（使用 rsync 确保完整同步）
-if command -v rsync &>/dev/null; then
-    rsync -a --delete "$OUTPUT_DIR/post/" "$DEPLOY_DIR/post/"
-    rsync -a --delete "$OUTPUT_DIR/date/" "$DEPLOY_DIR/date/"
-    rsync -a --delete "$OUTPUT_DIR/static/" "$DEPLOY_DIR/static/" 2>/dev/null || true
+# 同步渲染产物：优先按渲染器的变更报告（跨多次渲染累积的 pending 列表）只处理变化的文件，
+# 报告缺失或设置 FULL_SYNC=1 时退回完整同步
+CHANGES_FILE="$OUTPUT_DIR/.render-changes.json"
+if [ -f "$CHANGES_FILE" ] && [ "${FULL_SYNC:-0}" != "1" ]; then
+    echo "  Applying pending changes from $(basename "$CHANGES_FILE")..."
+    python3 - "$CHANGES_FILE" "$OUTPUT_DIR" "$DEPLOY_DIR" <<'PYEOF'
+import json, shutil, sys
+from pathlib import Path
+report, src, dst = sys.argv[1], Path(sys.argv[2]), Path(sys.argv[3])
+pending = json.load(open(report, encoding='utf-8')).get('pending', {})
+copied = removed = 0
+for rel, status in sorted(pending.items()):
+    target = dst / rel
+    if status == 'removed':
+        if target.exists():
+            target.unlink()
+            removed += 1
+    elif (src / rel).exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src / rel, target)
+        copied += 1
+print(f"  ✓ {copied} copied, {removed} removed")
+PYEOF
 else
-    cp -rf "$OUTPUT_DIR/post/" "$DEPLOY_DIR/"
-    cp -rf "$OUTPUT_DIR/date/" "$DEPLOY_DIR/"
-    cp -rf "$OUTPUT_DIR/static/" "$DEPLOY_DIR/" 2>/dev/null || true
+    if command -v rsync &>/dev/null; then
+        rsync -a --delete "$OUTPUT_DIR/post/" "$DEPLOY_DIR/post/"
+        rsync -a --delete "$OUTPUT_DIR/date/" "$DEPLOY_DIR/date/"
+        rsync -a --delete "$OUTPUT_DIR/static/" "$DEPLOY_DIR/static/" 2>/dev/null || true
+        rsync -a --delete "$OUTPUT_DIR/search/" "$DEPLOY_DIR/search/" 2>/dev/null || true
+        rsync -a --delete "$OUTPUT_DIR/tags/" "$DEPLOY_DIR/tags/" 2>/dev/null || true
+        rsync -a --delete "$OUTPUT_DIR/fragments/" "$DEPLOY_DIR/fragments/" 2>/dev/null || true
+        rsync -a --delete "$OUTPUT_DIR/covers/" "$DEPLOY_DIR/covers/" 2>/dev/null || true
+    else
+        cp -rf "$OUTPUT_DIR/post/" "$DEPLOY_DIR/"
+        cp -rf "$OUTPUT_DIR/date/" "$DEPLOY_DIR/"
+        cp -rf "$OUTPUT_DIR/static/" "$DEPLOY_DIR/" 2>/dev/null || true
+        cp -rf "$OUTPUT_DIR/search/" "$DEPLOY_DIR/" 2>/dev/null || true
+        cp -rf "$OUTPUT_DIR/tags/" "$DEPLOY_DIR/" 2>/dev/null || true
+        cp -rf "$OUTPUT_DIR/fragments/" "$DEPLOY_DIR/" 2>/dev/null || true
+        cp -rf "$OUTPUT_DIR/covers/" "$DEPLOY_DIR/" 2>/dev/null || true
+    fi
+    # 根目录文件连同预压缩副本（.gz/.br，渲染时开启 output.precompress 才会生成）
+    for f in index.html feed.xml atom.xml feed.json site.json status.json; do
+        for ext in "" .gz .br; do
+            if [ -f "$OUTPUT_DIR/$f$ext" ]; then
+                cp -f "$OUTPUT_DIR/$f$ext" "$DEPLOY_DIR/"
+            else
+                rm -f "$DEPLOY_DIR/$f$ext"
+            fi
+        done
+    done
+    cp -f "$OUTPUT_DIR/.nojekyll" "$DEPLOY_DIR/" 2>/dev/null || true
 fi
-cp -f "$OUTPUT_DIR/index.html" "$DEPLOY_DIR/"
-cp -f "$OUTPUT_DIR/feed.xml" "$DEPLOY_DIR/" 2>/dev/null || true
-cp -f "$OUTPUT_DIR/search-index.json" "$DEPLOY_DIR/" 2>/dev/null || true
-cp -f "$OUTPUT_DIR/.nojekyll" "$DEPLOY_DIR/" 2>/dev/null || true
+# 搜索已改为 search/ 下的分片索引，旧的整体索引不会再出现在变更报告中，两条同步路径都要显式删除
+for ext in "" .gz .br; do
+    rm -f "$DEPLOY_DIR/search-index.json$ext"
+done
+# 已同步的变化从报告中清空
+rm -f "$CHANGES_FILE"
 
 cd "$DEPLOY_DIR" || exit 1
 git add -A
@@ -29,6 +29,24 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         }
 
+        async function waitForRender(job, timeoutMs = 60000) {
+            const deadline = Date.now() + timeoutMs;
+            while (job && Date.now() < deadline) {
+                try {
+                    const res = await fetch('/api/render/status', { cache: 'no-store' });
+                    const status = await res.json();
+                    if (status.last_finished_id >= job) {
+                        const last = status.last;
+                        return last && last.id === job && !last.ok ? last.error : null;
+                    }
+                } catch (err) {
+                    return null;
+                }
+                await new Promise(resolve => setTimeout(resolve, 300));
+            }
+            return null;
+        }
+
         async function confirmDelete() {
             const file = pendingFile;
             if (!file) return;
@@ -47,6 +65,10 @@ document.addEventListener('DOMContentLoaded', () => {
                     return;
                 }
 
+                // The re-render runs in the background; reload once the job has finished
+                const { job } = await res.json();
+                const error = await waitForRender(job);
+                if (error) alert(`Render failed after delete: ${error}`);
                 window.location.reload();
             } catch (err) {
                 alert(`Delete failed: ${err}`);
@@ -54,13 +76,14 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         }
 
-        document.querySelectorAll('.tweet-delete-btn').forEach(btn => {
-            btn.addEventListener('click', (e) => {
-                e.stopPropagation();
-                const file = btn.getAttribute('data-file');
-                if (!file) return;
-                openDeleteModal(file);
-            });
+        // Delegated so tweets appended by infinite scroll work too
+        document.addEventListener('click', (e) => {
+            const btn = e.target.closest('.tweet-delete-btn');
+            if (!btn) return;
+            e.stopPropagation();
+            const file = btn.getAttribute('data-file');
+            if (!file) return;
+            openDeleteModal(file);
         });
 
         if (cancelBtn) cancelBtn.addEventListener('click', closeDeleteModal);
@@ -84,9 +107,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const archiveToggle = document.getElementById('archiveToggle');
     const modelStatusToggle = document.getElementById('modelStatusToggle');
 
-    const themesModal = document.getElementById('themesModal');
-    const tagsModal = document.getElementById('tagsModal');
-    const archiveModal = document.getElementById('archiveModal');
+    // Themes / Tags / Archive overlays are inserted from site.json, look them up on click
     const modelStatusModal = document.getElementById('modelStatusModal');
 
     const closeBtns = document.querySelectorAll('.close-modal');
@@ -102,9 +123,9 @@ document.addEventListener('DOMContentLoaded', () => {
         document.body.style.overflow = '';
     }
 
-    if (themesToggle) themesToggle.addEventListener('click', () => openModal(themesModal));
-    if (tagsToggle) tagsToggle.addEventListener('click', () => openModal(tagsModal));
-    if (archiveToggle) archiveToggle.addEventListener('click', () => openModal(archiveModal));
+    if (themesToggle) themesToggle.addEventListener('click', () => openModal(document.getElementById('themesModal')));
+    if (tagsToggle) tagsToggle.addEventListener('click', () => openModal(document.getElementById('tagsModal')));
+    if (archiveToggle) archiveToggle.addEventListener('click', () => openModal(document.getElementById('archiveModal')));
     if (modelStatusToggle) modelStatusToggle.addEventListener('click', () => {
         openModal(modelStatusModal);
         loadModelStatus();
@@ -200,12 +221,30 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     })();
 
+    // --- Build Status (volatile values live in status.json, not in page HTML) ---
+    const nextUpdateEl = document.getElementById('nextUpdate');
+    if (nextUpdateEl) {
+        (async () => {
+            try {
+                const statusUrl = nextUpdateEl.getAttribute('data-status-url') || 'status.json';
+                const res = await fetch(statusUrl, { cache: 'no-store' });
+                if (!res.ok) return;
+                const data = await res.json();
+                if (data.next_update) nextUpdateEl.textContent = data.next_update;
+                if (data.last_updated) nextUpdateEl.title = `Last build: ${data.last_updated}`;
+            } catch (_) {
+                // Keep the static placeholder
+            }
+        })();
+    }
+
     // --- Filtering Logic (Tags, Search, Archive) ---
     const filterStatus = document.getElementById('filterStatus');
     const currentTagSpan = document.getElementById('currentTag');
     const clearFilterBtn = document.getElementById('clearFilter');
-    const tweets = document.querySelectorAll('.tweet');
-    const tags = document.querySelectorAll('.tag');
+    // Re-queried when infinite scroll appends a chunk
+    let tweets = document.querySelectorAll('.tweet');
+    let tags = document.querySelectorAll('.tag');
 
     const searchInput = document.getElementById('searchInput');
 
@@ -282,6 +321,120 @@ document.addEventListener('DOMContentLoaded', () => {
         updateFilterUI(`Search: "${term}" (${count})`);
     }
 
+    // --- Site-wide Search (sharded inverted index built by tools/render_search.py) ---
+    // Tokens: CJK runs -> unigrams + bigrams, Latin words -> prefix match; only the shards a query needs are fetched
+    const searchResults = document.getElementById('searchResults');
+    const CJK_RE = /[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]/;
+    const TOKEN_RE = /[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+|[0-9a-z\u00c0-\u024f]+/g;
+    const searchIndex = { meta: null, shards: {}, docs: {} };
+    let searchSeq = 0;
+    let searchTimer = null;
+
+    function fetchIndexJson(name) {
+        const base = searchResults ? searchResults.getAttribute('data-index-url') : 'search/';
+        return fetch(`${base}${name}.json`).then(res => (res.ok ? res.json() : null)).catch(() => null);
+    }
+
+    function loadSearchShard(key) {
+        if (!(key in searchIndex.shards)) {
+            searchIndex.shards[key] = searchIndex.meta.shards.includes(key) ? fetchIndexJson(key) : Promise.resolve(null);
+        }
+        return searchIndex.shards[key];
+    }
+
+    // Per-document info ([id, title, time, tags]) is split by doc number range; only shards holding shown hits are fetched
+    function docShardKey(no, perShard) {
+        return `docs/${Math.floor(no / perShard)}`;
+    }
+
+    function loadDocShard(key) {
+        if (!(key in searchIndex.docs)) searchIndex.docs[key] = fetchIndexJson(key);
+        return searchIndex.docs[key];
+    }
+
+    function searchShardKey(token) {
+        const first = token[0];
+        if (/[a-z0-9]/.test(first)) return first;
+        return 'x' + (first.codePointAt(0) % searchIndex.meta.buckets).toString(16).padStart(2, '0');
+    }
+
+    // Query terms as [token, prefix]: exact unigram/bigram lookups for CJK, prefix lookups otherwise.
+    // Latin words are cut to the indexer's max_word length, so long words still prefix-match their index key
+    function queryTerms(term, maxWord) {
+        const terms = [];
+        (term.toLowerCase().match(TOKEN_RE) || []).forEach(run => {
+            if (CJK_RE.test(run[0])) {
+                if (run.length === 1) terms.push([run, false]);
+                for (let i = 0; i < run.length - 1; i++) terms.push([run.slice(i, i + 2), false]);
+            } else {
+                terms.push([run.slice(0, maxWord), true]);
+            }
+        });
+        return terms;
+    }
+
+    function termMatches(key, token, prefix) {
+        return key === token || (prefix && key.startsWith(token));
+    }
+
+    async function runIndexSearch(term) {
+        const seq = ++searchSeq;
+        if (!searchIndex.meta) {
+            searchIndex.meta = await fetchIndexJson('meta');
+            if (!searchIndex.meta) return;
+        }
+        const terms = queryTerms(term, searchIndex.meta.max_word || 24);
+        if (terms.length === 0) return;
+
+        let matched = null;
+        for (const [token, prefix] of terms) {
+            const shard = await loadSearchShard(searchShardKey(token)) || {};
+            const docs = new Set();
+            Object.keys(shard).forEach(key => {
+                if (termMatches(key, token, prefix)) {
+                    shard[key].forEach(doc => docs.add(doc));
+                }
+            });
+            matched = matched === null ? docs : new Set([...matched].filter(doc => docs.has(doc)));
+            if (matched.size === 0) break;
+        }
+        const docNos = [...matched].sort((a, b) => b - a);
+        const shown = docNos.slice(0, 20);
+        const perShard = searchIndex.meta.doc_shard;
+        const docShards = {};
+        await Promise.all([...new Set(shown.map(no => docShardKey(no, perShard)))].map(async key => {
+            docShards[key] = await loadDocShard(key) || [];
+        }));
+        if (seq !== searchSeq) return; // a newer query is in flight
+        renderIndexResults(docNos, shown.map(no => docShards[docShardKey(no, perShard)][no % perShard]).filter(Boolean));
+    }
+
+    function renderIndexResults(docNos, shownDocs) {
+        if (!searchResults) return;
+        const base = searchResults.getAttribute('data-index-url').replace(/search\/$/, '');
+        const items = shownDocs.map(([id, title, time]) => {
+            const a = document.createElement('a');
+            a.className = 'search-result';
+            a.href = `${base}post/${id}.html`;
+            a.textContent = `${time.slice(0, 10)} · ${title}`;
+            return a;
+        });
+        const header = document.createElement('div');
+        header.className = 'search-results-header';
+        header.textContent = `All posts: ${docNos.length} match${docNos.length === 1 ? '' : 'es'}`;
+        searchResults.replaceChildren(header, ...items);
+        searchResults.classList.add('visible');
+    }
+
+    function clearIndexResults() {
+        searchSeq++;
+        if (searchTimer) clearTimeout(searchTimer);
+        if (searchResults) {
+            searchResults.replaceChildren();
+            searchResults.classList.remove('visible');
+        }
+    }
+
     function updateFilterUI(statusText) {
         if (filterStatus) filterStatus.classList.add('visible');
         if (currentTagSpan) currentTagSpan.textContent = statusText;
@@ -292,27 +445,29 @@ document.addEventListener('DOMContentLoaded', () => {
         tweets.forEach(tweet => tweet.style.display = 'block');
         if (filterStatus) filterStatus.classList.remove('visible');
         if (searchInput) searchInput.value = '';
+        clearIndexResults();
         tags.forEach(t => t.classList.remove('active'));
         document.querySelectorAll('.theme-card').forEach(c => c.classList.remove('active'));
     }
 
     // --- Event Listeners ---
     // Themes
-    const themeCards = document.querySelectorAll('.theme-card');
-    themeCards.forEach(card => {
-        card.addEventListener('click', () => {
-            const themeName = card.querySelector('.theme-name').textContent;
-            const tagsList = card.getAttribute('data-tags');
-            filterByTheme(themeName, tagsList);
-            closeModal();
-            // Highlight active card
-            themeCards.forEach(c => c.classList.remove('active'));
-            card.classList.add('active');
+    function bindThemeCards(themeCards) {
+        themeCards.forEach(card => {
+            card.addEventListener('click', () => {
+                const themeName = card.querySelector('.theme-name').textContent;
+                const tagsList = card.getAttribute('data-tags');
+                filterByTheme(themeName, tagsList);
+                closeModal();
+                // Highlight active card
+                themeCards.forEach(c => c.classList.remove('active'));
+                card.classList.add('active');
+            });
         });
-    });
+    }
 
     // Tags
-    tags.forEach(tag => {
+    function bindTag(tag) {
         tag.addEventListener('click', (e) => {
             e.stopPropagation();
             const tagName = tag.getAttribute('data-tag');
@@ -321,10 +476,11 @@ document.addEventListener('DOMContentLoaded', () => {
             // Highlight active tag
             tags.forEach(t => t.classList.toggle('active', t.getAttribute('data-tag') === tagName));
         });
-    });
+    }
+    tags.forEach(bindTag);
 
     // Archive (Calendar)
-    const archiveDays = window.__archiveDays || {};
+    let archiveDays = {};
     const calendarGrid = document.getElementById('calendarGrid');
     const calendarTitle = document.getElementById('calendarTitle');
     const calendarMonthFilter = document.getElementById('calendarMonthFilter');
@@ -394,12 +550,14 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    document.querySelectorAll('.archive-month').forEach(item => {
-        item.addEventListener('click', () => {
-            const monthKey = item.getAttribute('data-date');
-            renderCalendar(monthKey);
+    function bindArchiveMonths(items) {
+        items.forEach(item => {
+            item.addEventListener('click', () => {
+                const monthKey = item.getAttribute('data-date');
+                renderCalendar(monthKey);
+            });
         });
-    });
+    }
 
     if (archiveToggle) {
         archiveToggle.addEventListener('click', () => {
@@ -408,6 +566,52 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // --- Site-wide data (site.json): overlays, counts, archive days, page numbers ---
+    // Kept out of the page HTML so a new post does not change every page
+    const siteOverlays = document.getElementById('siteOverlays');
+    const pageNumbers = document.getElementById('pageNumbers');
+
+    function renderPageNumbers(dates, root) {
+        if (!pageNumbers) return;
+        const current = pageNumbers.getAttribute('data-current-date');
+        const activeIdx = current ? dates.indexOf(current) : 0;
+        const links = dates.map((date, i) => {
+            const a = document.createElement('a');
+            if (i === 0) a.href = `${root}index.html`;
+            else a.href = root ? `${date}.html` : `date/${date}.html`;
+            a.className = `page-num${i === activeIdx ? ' active' : ''}`;
+            a.textContent = String(i + 1);
+            return a;
+        });
+        pageNumbers.replaceWith(...links);
+    }
+
+    if (siteOverlays) {
+        (async () => {
+            try {
+                const siteUrl = siteOverlays.getAttribute('data-site-url') || 'site.json';
+                const res = await fetch(siteUrl);
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                const site = await res.json();
+                siteOverlays.innerHTML = site.sidebar;
+                const themesCount = document.getElementById('themesCount');
+                const tagsCount = document.getElementById('tagsCount');
+                if (themesCount) themesCount.textContent = site.themes;
+                if (tagsCount) tagsCount.textContent = site.tags;
+                archiveDays = site.archive_days || {};
+
+                siteOverlays.querySelectorAll('.close-modal').forEach(btn => btn.addEventListener('click', closeModal));
+                bindThemeCards(siteOverlays.querySelectorAll('.theme-card'));
+                siteOverlays.querySelectorAll('.tag').forEach(bindTag);
+                tags = document.querySelectorAll('.tag');
+                bindArchiveMonths(siteOverlays.querySelectorAll('.archive-month'));
+                renderPageNumbers(site.dates || [], siteUrl.replace(/site\.json$/, ''));
+            } catch (err) {
+                console.error('Failed to load site data:', err);
+            }
+        })();
+    }
+
     // Search
     if (searchInput) {
         searchInput.addEventListener('input', (e) => {
@@ -416,6 +620,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 clearFilter();
             } else {
                 filterBySearch(term);
+                if (searchTimer) clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => runIndexSearch(term), 250);
             }
         });
     }
@@ -559,11 +765,9 @@ document.addEventListener('DOMContentLoaded', () => {
         lightboxImg.src = currentGallery[currentIndex];
     }
 
-    // Initialize all tweet images
-    function initGallery() {
-        const tweets = document.querySelectorAll('.tweet');
-
-        tweets.forEach(tweet => {
+    // Initialize tweet images (all tweets, or only the given ones)
+    function initGallery(targets = document.querySelectorAll('.tweet')) {
+        targets.forEach(tweet => {
             const images = tweet.querySelectorAll('.tweet-text img');
             const gallerySources = Array.from(images).map(img => img.src);
 
@@ -606,6 +810,80 @@ document.addEventListener('DOMContentLoaded', () => {
 
     initGallery();
 
+    // --- Infinite Scroll (pre-rendered chunks under fragments/) ---
+    // Home follows the whole timeline (next chunk of the day, then older days);
+    // date pages only load the remaining chunks of their own day.
+    const postsContainer = document.getElementById('postsContainer');
+    const chunkSentinel = document.getElementById('chunkSentinel');
+    const loadMoreLink = document.getElementById('loadMore');
+    if (postsContainer && chunkSentinel && 'IntersectionObserver' in window) {
+        const root = postsContainer.getAttribute('data-root') || '';
+        const followTimeline = postsContainer.getAttribute('data-scroll-scope') === 'timeline';
+        let loadingChunk = false;
+
+        function nextChunkUrl() {
+            const next = postsContainer.dataset.nextChunk;
+            if (next) return next;
+            return followTimeline ? postsContainer.dataset.olderChunk : '';
+        }
+
+        // Fragments are rendered with date-page relative links ("../post/..."); fix them up on the home page
+        function rebaseLinks(fragment) {
+            if (root) return;
+            fragment.querySelectorAll('[href^="../"], [src^="../"]').forEach(el => {
+                ['href', 'src'].forEach(attr => {
+                    const value = el.getAttribute(attr);
+                    if (value && value.startsWith('../')) el.setAttribute(attr, value.slice(3));
+                });
+            });
+        }
+
+        async function loadNextChunk() {
+            const url = nextChunkUrl();
+            if (!url || loadingChunk) return;
+            loadingChunk = true;
+            try {
+                const res = await fetch(root + url);
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                const data = await res.json();
+                const tpl = document.createElement('template');
+                tpl.innerHTML = data.html;
+                rebaseLinks(tpl.content);
+                const newTweets = Array.from(tpl.content.querySelectorAll('.tweet'));
+                postsContainer.appendChild(tpl.content);
+                postsContainer.dataset.nextChunk = data.next || '';
+                postsContainer.dataset.olderChunk = data.older || '';
+
+                tweets = document.querySelectorAll('.tweet');
+                tags = document.querySelectorAll('.tag');
+                newTweets.forEach(tweet => tweet.querySelectorAll('.tag').forEach(bindTag));
+                processExternalLinks();
+                initGallery(newTweets);
+            } catch (err) {
+                console.error('Failed to load more posts:', err);
+                chunkObserver.disconnect();
+                if (loadMoreLink) loadMoreLink.classList.remove('hidden');
+                return;
+            } finally {
+                loadingChunk = false;
+            }
+            if (!nextChunkUrl()) {
+                chunkObserver.disconnect();
+            } else if (chunkSentinel.getBoundingClientRect().top < window.innerHeight) {
+                loadNextChunk();
+            }
+        }
+
+        const chunkObserver = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) loadNextChunk();
+        }, { rootMargin: '600px 0px' });
+
+        if (nextChunkUrl()) {
+            if (loadMoreLink) loadMoreLink.classList.add('hidden');
+            chunkObserver.observe(chunkSentinel);
+        }
+    }
+
     // --- Pull to Refresh (Mobile) ---
     const isMobile = /iPhone|iPad|iPod|Android/i.test(navigator.userAgent);
     if (isMobile) {
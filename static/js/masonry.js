@@ -121,7 +121,14 @@
     // Re-layout when posts container changes (search/filter)
     var container = document.querySelector(containerSelector);
     if (!container) return;
-    var mo2 = new MutationObserver(function () {
+    var mo2 = new MutationObserver(function (mutations) {
+      // Appended chunks (infinite scroll) bring new images to wait for
+      for (var i = 0; i < mutations.length; i++) {
+        if (mutations[i].type === 'childList' && mutations[i].addedNodes.length) {
+          onImages(container);
+          break;
+        }
+      }
       scheduleLayout();
     });
     mo2.observe(container, { childList: true, subtree: true, attributes: true });
@@ -0,0 +1,29 @@
+/**
+ * Share buttons on post detail pages (copy link + toast), shared instead of inlined per page
+ */
+function copyToClipboard(text) {
+    navigator.clipboard.writeText(text).then(() => {
+        showToast('Link copied to clipboard');
+    }).catch(err => {
+        console.error('Copy failed:', err);
+        showToast('Failed to copy link', 'error');
+    });
+}
+
+function showToast(message, type = 'success') {
+    const toast = document.createElement('div');
+    toast.className = 'toast toast-' + type;
+    toast.textContent = message;
+    document.body.appendChild(toast);
+
+    setTimeout(() => {
+        toast.classList.add('visible');
+    }, 10);
+
+    setTimeout(() => {
+        toast.classList.remove('visible');
+        setTimeout(() => {
+            document.body.removeChild(toast);
+        }, 300);
+    }, 2000);
+}
@@ -0,0 +1,20 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture
+def project_tmp():
+    """项目内的临时目录：render.py 拒绝输出到项目之外，放在已被 git 忽略的 .cache/ 下"""
+    base = PROJECT_ROOT / ".cache" / "tests"
+    base.mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.mkdtemp(dir=base))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
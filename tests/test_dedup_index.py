@@ -0,0 +1,116 @@
+"""近似重复索引：最近窗口与逐条比较一致，历史只走 LSH 候选并按 MinHash Jaccard 判断"""
+import random
+
+import pytest
+
+from core.dedup_index import DedupIndex, cosine_similarity, jaccard_similarity, ngram_counts, tokenize
+from core.posts_catalog import PostsCatalog, read_body
+from tools.bench_render import _sentence
+
+NGRAM_COSINE = 0.20
+TOKEN_JACCARD = 0.6
+ARCHIVE_JACCARD = 0.5
+RECENT = 10
+
+
+def _brute_force(body, paths):
+    """原 _check_dedup 的做法：逐个读取推文文件比较"""
+    ngrams, tokens = ngram_counts(body), tokenize(body)
+    matches = set()
+    for path in paths:
+        other = read_body(path)
+        sim = cosine_similarity(ngrams, ngram_counts(other))
+        if (sim is not None and sim > NGRAM_COSINE) or jaccard_similarity(tokens, tokenize(other)) > TOKEN_JACCARD:
+            matches.add(str(path))
+    return matches
+
+
+def _shingle_jaccard(a, b):
+    return jaccard_similarity(set(ngram_counts(a)), set(ngram_counts(b)))
+
+
+def _mutate(rng, body, ratio):
+    """把 body 中约 ratio 比例的句子换成新句子，模拟模型改写后的重复"""
+    parts = body.split('。')
+    for i in range(len(parts)):
+        if rng.random() < ratio:
+            parts[i] = _sentence(rng, rng.randint(10, 40))
+    return '。'.join(parts)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    rng = random.Random(7)
+    posts_dir = tmp_path / "posts"
+    paths = []
+    for i in range(150):
+        path = posts_dir / "2026" / "02" / f"{i:02d}" / f"2026-02-11-{i:06d}-auto.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = '。'.join(_sentence(rng, rng.randint(20, 60)) for _ in range(rng.randint(2, 5)))
+        path.write_text(f"---\ntime: 2026-02-11 00:00:00\n---\n\n{body}\n", encoding='utf-8')
+        paths.append(path.resolve())
+    catalog = PostsCatalog(tmp_path / "catalog.sqlite3", posts_dir)
+    yield rng, paths, catalog
+    catalog.close()
+
+
+def _find(index, body, recent=()):
+    return index.find_duplicate(body, recent, ngram_cosine=NGRAM_COSINE, token_jaccard=TOKEN_JACCARD,
+                                archive_jaccard=ARCHIVE_JACCARD)
+
+
+def test_recent_window_matches_brute_force(corpus):
+    rng, paths, catalog = corpus
+    index = DedupIndex(catalog)
+    recent = paths[-RECENT:]
+    queries = [_mutate(rng, read_body(rng.choice(recent)), ratio) for ratio in (0.2, 0.5, 0.7, 0.9) for _ in range(10)]
+
+    true_dups = 0
+    for body in queries:
+        expected = _brute_force(body, recent)
+        found = _find(index, body, recent)
+        if expected:
+            true_dups += 1
+            assert found is not None and found[1] in ('ngram', 'jaccard'), body
+            assert found[0] in expected
+        else:
+            # 最近窗口没有重复时，只可能命中历史一档
+            assert found is None or found[1] == 'minhash'
+    assert true_dups > 0
+
+
+def test_archive_uses_lsh_candidates_with_tighter_threshold(corpus):
+    rng, paths, catalog = corpus
+    index = DedupIndex(catalog)
+    archive = paths[:-RECENT]
+
+    near = far = 0
+    for _ in range(60):
+        original = read_body(rng.choice(archive))
+        body = _mutate(rng, original, rng.choice((0.1, 0.3, 0.9)))
+        best = max(_shingle_jaccard(body, read_body(p)) for p in paths)
+        found = _find(index, body)
+        if best >= 0.7:
+            # 高相似的改写必须经由 LSH 候选找回
+            near += 1
+            assert found is not None and found[1] == 'minhash', best
+        elif best < 0.3:
+            # 余弦 0.2 能拦下的大幅改写，在历史一档不再视为重复
+            far += 1
+            assert found is None, (best, found)
+        if found is not None:
+            assert _shingle_jaccard(body, read_body(found[0])) > 0.3
+    assert near > 0 and far > 0
+
+
+def test_unrelated_posts_touch_few_candidates(corpus):
+    rng, paths, catalog = corpus
+    index = DedupIndex(catalog)
+    index.ensure_synced()
+    total = 0
+    for _ in range(20):
+        body = '。'.join(_sentence(rng, 40) for _ in range(3))
+        assert _find(index, body) is None
+        total += len(index.candidates(index.sketch(body)))
+    # 候选只占历史的一小部分，查询不随历史规模线性增长
+    assert total / 20 < 0.2 * len(paths)
@@ -0,0 +1,129 @@
+"""模型通道竞速：胜者选择、总期限与取消"""
+import os
+import time
+
+import pytest
+
+from core.llm_race import Attempt, race
+
+
+def _answer(text, delay=0.0):
+    def run(attempt, timeout):
+        if attempt.cancelled.wait(delay):
+            return None
+        return text
+    return run
+
+
+def _sleeper(pid_file, seconds=30):
+    """CLI 通道：子进程记下自己的 pid 后一直睡下去"""
+    def run(attempt, timeout):
+        proc = attempt.run_process(['sh', '-c', f'echo $$ > {pid_file}; exec sleep {seconds}'], "", timeout=timeout)
+        return proc.stdout if proc else None
+    return run
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _wait_for(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_sequential_falls_through_failures_immediately():
+    attempts = [Attempt("a", _answer(None)), Attempt("b", _answer("  ")), Attempt("c", _answer("ok"))]
+    start = time.monotonic()
+    winner, result = race(attempts, mode='sequential', hedge_delay=10)
+    assert (winner.label, result) == ("c", "ok")
+    assert time.monotonic() - start < 1
+
+
+def test_hedged_launches_backup_after_delay():
+    started = []
+
+    def slow(attempt, timeout):
+        started.append(("slow", time.monotonic()))
+        attempt.cancelled.wait(5)
+        return None if attempt.cancelled.is_set() else "slow"
+
+    def fast(attempt, timeout):
+        started.append(("fast", time.monotonic()))
+        return "fast"
+
+    slow_attempt = Attempt("slow", slow)
+    start = time.monotonic()
+    winner, result = race([slow_attempt, Attempt("fast", fast)], mode='hedged', hedge_delay=0.3)
+    assert (winner.label, result) == ("fast", "fast")
+    assert [name for name, _ in started] == ["slow", "fast"]
+    assert 0.25 <= started[1][1] - start < 2
+    assert slow_attempt.cancelled.is_set()
+
+
+def test_hedged_failure_starts_next_without_waiting():
+    start = time.monotonic()
+    winner, _ = race([Attempt("a", _answer(None)), Attempt("b", _answer("ok"))], mode='hedged', hedge_delay=10)
+    assert winner.label == "b"
+    assert time.monotonic() - start < 1
+
+
+def test_parallel_takes_first_answer_and_respects_max_parallel():
+    attempts = [Attempt("a", _answer("a", 1.0)), Attempt("b", _answer("b", 0.1)), Attempt("c", _answer("c", 0.0))]
+    winner, result = race(attempts, mode='parallel', max_parallel=2)
+    # c 在 a、b 之一结束前不会启动
+    assert (winner.label, result) == ("b", "b")
+    assert attempts[0].cancelled.is_set()
+    assert not attempts[2].cancelled.is_set()
+
+
+def test_accept_rejects_unqualified_answer():
+    attempts = [Attempt("a", _answer("short")), Attempt("b", _answer("long enough", 0.1))]
+    winner, result = race(attempts, mode='parallel', accept=lambda r: bool(r) and len(r) > 5)
+    assert (winner.label, result) == ("b", "long enough")
+
+
+def test_deadline_returns_on_time():
+    attempts = [Attempt("a", _answer("late", 5)), Attempt("b", _answer("late", 5))]
+    start = time.monotonic()
+    assert race(attempts, mode='hedged', hedge_delay=0.1, deadline=0.5) == (None, None)
+    assert time.monotonic() - start < 1.5
+    assert all(a.cancelled.is_set() for a in attempts)
+
+
+def test_losing_subprocesses_are_killed(tmp_path):
+    pid_files = [tmp_path / "a.pid", tmp_path / "b.pid"]
+
+    def delayed_answer(attempt, timeout):
+        # 等两个 CLI 通道都启动后再给出回答
+        _wait_for(lambda: all(p.exists() and p.read_text().strip() for p in pid_files))
+        return "ok"
+
+    attempts = [Attempt("a", _sleeper(pid_files[0])), Attempt("b", _sleeper(pid_files[1])),
+                Attempt("c", delayed_answer)]
+    winner, _ = race(attempts, mode='parallel')
+    assert winner.label == "c"
+    pids = [int(p.read_text()) for p in pid_files]
+    assert _wait_for(lambda: not any(_alive(pid) for pid in pids)), pids
+
+
+def test_deadline_kills_running_subprocess(tmp_path):
+    pid_file = tmp_path / "a.pid"
+    start = time.monotonic()
+    assert race([Attempt("a", _sleeper(pid_file))], deadline=0.5) == (None, None)
+    assert time.monotonic() - start < 1.5
+    pid = int(pid_file.read_text())
+    assert _wait_for(lambda: not _alive(pid)), pid
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        race([], mode='fastest')
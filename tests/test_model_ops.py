@@ -0,0 +1,53 @@
+"""救援模型列表缓存：切换模型与构建交错时不能缓存旧列表"""
+import json
+import os
+
+import pytest
+
+from tools import model_ops
+
+
+def _config(primary):
+    return {
+        "agents": {"defaults": {"model": {"primary": primary}}},
+        "models": {"providers": {"p": {"models": [{"id": "model-a"}, {"id": "model-b"}]}}},
+    }
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = tmp_path / "openclaw.json"
+    monkeypatch.setattr(model_ops, "CONFIG_PATH", path)
+    model_ops.save_config(_config("p/model-a"))
+    model_ops.invalidate_model_catalog()
+    yield path
+    model_ops.invalidate_model_catalog()
+
+
+def _primary():
+    body, _ = model_ops.get_model_catalog()
+    return json.loads(body)["primary"]
+
+
+def test_catalog_is_cached_until_file_changes(config_path):
+    first = model_ops.get_model_catalog()
+    assert model_ops.get_model_catalog()[1] == first[1]
+    model_ops.update_primary_model("p/model-b")
+    assert _primary() == "p/model-b"
+
+
+def test_switch_during_build_is_not_cached(config_path, monkeypatch):
+    list_all_models = model_ops.list_all_models
+    st = config_path.stat()
+
+    def switch_while_building(config):
+        # 构建已读完旧内容时切换模型；等长的 id 与粗粒度 mtime 让 (mtime_ns, size) 保持不变
+        monkeypatch.setattr(model_ops, "list_all_models", list_all_models)
+        model_ops.update_primary_model("p/model-b")
+        os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return list_all_models(config)
+
+    monkeypatch.setattr(model_ops, "list_all_models", switch_while_building)
+    assert _primary() == "p/model-a"
+    assert config_path.stat().st_size == st.st_size
+    assert _primary() == "p/model-b"
@@ -0,0 +1,99 @@
+"""推文目录索引：长时间运行的进程也能看到磁盘上的变化"""
+import os
+import time
+
+import pytest
+
+from core.dedup_index import DedupIndex
+from core.posts_catalog import PostsCatalog
+from core.topic_counters import TopicCounters
+
+
+def _write(posts_dir, name, body, day=None, tags=""):
+    day = day or time.strftime('%Y-%m-%d')
+    path = posts_dir / day.replace('-', '/') / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntime: {day} 19:48:57\ntags: {tags}\n---\n\n{body}\n", encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    posts_dir = tmp_path / "posts"
+    posts_dir.mkdir()
+    cat = PostsCatalog(tmp_path / "catalog.sqlite3", posts_dir)
+    yield cat
+    cat.close()
+
+
+def test_external_changes_are_picked_up(catalog, tmp_path):
+    posts_dir = tmp_path / "posts"
+    today = time.strftime('%Y-%m-%d')
+    first = _write(posts_dir, "2026-02-11-194857-auto.md", "第一条推文")
+    assert catalog.count() == 1
+
+    # 其它进程在今天的目录中新增与删除推文
+    second = _write(posts_dir, "2026-02-11-200000-auto.md", "第二条推文", tags="AI")
+    assert catalog.count() == 2
+    assert catalog.count(untagged=True) == 1
+    assert catalog.posted_on(today, "第二条")
+
+    second.unlink()
+    assert catalog.count() == 1
+    assert [str(p) for p in catalog.recent()] == [str(first.resolve())]
+
+    # 原地手工修改不改变目录 mtime，下次对账（下一个发帖周期）时生效
+    first.write_text(first.read_text(encoding='utf-8').replace("第一条", "改写过的"), encoding='utf-8')
+    os.utime(first, ns=(first.stat().st_mtime_ns + 10**9,) * 2)
+    catalog.reconcile()
+    assert catalog.posted_on(today, "改写过的")
+    assert not catalog.posted_on(today, "第一条")
+
+
+def test_queries_do_not_rewalk_the_tree(catalog, tmp_path, monkeypatch):
+    posts_dir = tmp_path / "posts"
+    for i in range(5):
+        _write(posts_dir, f"2026-02-11-19485{i}-auto.md", f"推文 {i}", day="2026-02-11")
+    assert catalog.count() == 5
+
+    walks = []
+    real_walk = os.walk
+    monkeypatch.setattr(os, 'walk', lambda *a, **kw: walks.append(a) or real_walk(*a, **kw))
+    # 发帖周期内相隔较久的查询也不重新遍历 posts/
+    time.sleep(1.1)
+    catalog.count()
+    catalog.recent()
+    catalog.posted_on("2026-02-11", "推文")
+    assert walks == []
+
+    # 本进程自己的写入经由 add() 更新，同样不触发对账
+    own = _write(posts_dir, "2026-02-11-200000-auto.md", "自己发的", day="2026-02-11")
+    catalog.add(own)
+    assert catalog.count() == 6
+    assert walks == []
+
+
+def test_catalog_stores_metadata_only(catalog, tmp_path):
+    _write(tmp_path / "posts", "2026-02-11-194857-auto.md", "正文不应进入数据库")
+    catalog.reconcile()
+    columns = {row[1] for row in catalog.conn.execute("PRAGMA table_info(posts)")}
+    assert 'content' not in columns
+    assert 'digest' in columns
+    dump = '\n'.join(catalog.conn.iterdump())
+    assert "正文不应进入数据库" not in dump
+
+
+def test_derived_stores_follow_external_posts(catalog, tmp_path):
+    posts_dir = tmp_path / "posts"
+    _write(posts_dir, "2026-02-11-194857-auto.md", "今天在看 Rust 的异步运行时")
+    index = DedupIndex(catalog)
+    counters = TopicCounters(catalog, lambda body: {w for w in ("rust", "python") if w in body.lower()},
+                             retention_hours=10**6)
+    assert index.find_duplicate("完全不同的内容：晚饭吃了拉面") is None
+    assert counters.counts(["rust", "python"], hours=10**6) == {"rust": 1}
+
+    # 另一个进程写入的推文：查重与话题计数都要看到
+    dup = _write(posts_dir, "2026-02-11-200000-auto.md", "Python 的类型标注越来越好用了，Python 真香")
+    found = index.find_duplicate("Python 的类型标注越来越好用了，Python 真香！")
+    assert found is not None and found[0] == str(dup.resolve())
+    assert counters.counts(["rust", "python"], hours=10**6) == {"rust": 1, "python": 1}
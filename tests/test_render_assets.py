@@ -0,0 +1,20 @@
+"""静态资源同步的变更报告"""
+from tools.render_assets import ASSET_MANIFEST_NAME, sync_static
+
+
+def test_asset_manifest_reported_as_added_then_changed(tmp_path):
+    src = tmp_path / "static"
+    (src / "css").mkdir(parents=True)
+    (src / "css" / "style.css").write_text("body { color: red; }", encoding='utf-8')
+    dst = tmp_path / "dist" / "static"
+    manifest = tmp_path / "static-manifest.json"
+
+    stats = sync_static(src, dst, manifest)
+    assert stats.changes[ASSET_MANIFEST_NAME] == 'added'
+
+    stats = sync_static(src, dst, manifest)
+    assert ASSET_MANIFEST_NAME not in stats.changes
+
+    (src / "css" / "style.css").write_text("body { color: blue; }", encoding='utf-8')
+    stats = sync_static(src, dst, manifest)
+    assert stats.changes[ASSET_MANIFEST_NAME] == 'changed'
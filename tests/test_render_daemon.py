@@ -0,0 +1,49 @@
+"""常驻渲染进程：changed 通知与内存中推文对象的键一致"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tools.bench_render import generate_corpus
+from tools.render_daemon import ping_daemon, request_render
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_changed_hint_reaches_symlinked_post(project_tmp):
+    files = generate_corpus(project_tmp, 12, cover_ratio=0)
+    # 一条推文是指向 posts/ 之外的符号链接
+    outside = project_tmp / "drafts" / "linked.md"
+    outside.parent.mkdir()
+    post = files[0]
+    outside.write_text(post.read_text(encoding='utf-8'), encoding='utf-8')
+    post.unlink()
+    post.symlink_to(outside)
+
+    socket_path = project_tmp / "render.sock"
+    env = dict(os.environ,
+               MINI_TWITTER_POSTS=str(project_tmp / "posts"),
+               MINI_TWITTER_STATIC=str(project_tmp / "static"),
+               MINI_TWITTER_CACHE=str(project_tmp / "cache"),
+               MINI_TWITTER_OUTPUT=str(project_tmp / "dist"))
+    daemon = subprocess.Popen([sys.executable, str(PROJECT_ROOT / "tools" / "render_daemon.py"), "serve",
+                               "--socket", str(socket_path)],
+                              env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            if ping_daemon(socket_path):
+                break
+            time.sleep(0.1)
+        assert request_render(socket_path)['ok']
+
+        marker = "符号链接推文已更新"
+        outside.write_text(outside.read_text(encoding='utf-8') + f"\n{marker}\n", encoding='utf-8')
+        # 通知方给出的是 posts/ 内的链接路径
+        response = request_render(socket_path, changed=[post])
+        assert response['ok']
+        page = project_tmp / "dist" / "post" / f"{post.stem}.html"
+        assert marker in page.read_text(encoding='utf-8')
+    finally:
+        daemon.terminate()
+        daemon.wait(timeout=10)
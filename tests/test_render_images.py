@@ -0,0 +1,47 @@
+"""封面衍生图：损坏的原图不能中断渲染"""
+import pytest
+
+from tools import render_images
+from tools.render_images import build_cover_images
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+
+class NoteWriter:
+    def __init__(self):
+        self.notes = {}
+
+    def note(self, rel, status):
+        self.notes[rel] = status
+
+
+class Deps:
+    def __init__(self):
+        self.declared = {}
+
+    def declare(self, rel, fp):
+        self.declared[rel] = fp
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_broken_cover_falls_back_to_original(tmp_path, jobs):
+    covers_dir = tmp_path / "static" / "covers"
+    covers_dir.mkdir(parents=True)
+    Image.new('RGB', (640, 360), (200, 80, 40)).save(covers_dir / "good.png")
+    # PNG 文件头完整、数据被截断
+    good = (covers_dir / "good.png").read_bytes()
+    (covers_dir / "truncated.png").write_bytes(good[:len(good) // 3])
+    (covers_dir / "garbage.jpg").write_bytes(b"not an image at all")
+    covers = {"/static/covers/good.png", "/static/covers/truncated.png", "/static/covers/garbage.jpg"}
+
+    cover_map, stats = build_cover_images(covers, tmp_path / "static", tmp_path / "dist",
+                                          tmp_path / "cache", NoteWriter(), Deps(), jobs=jobs)
+
+    assert set(cover_map) == {"/static/covers/good.png"}
+    assert cover_map["/static/covers/good.png"]['variants']
+    assert stats.processed == 1
+    assert stats.failed == 2
+    # 坏图不进入缓存，下次渲染重试；半成品临时文件已清理
+    assert not list((tmp_path / "cache" / "covers").glob(".*.tmp"))
+    assert render_images.image_size(covers_dir / "garbage.jpg") is None
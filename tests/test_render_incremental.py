@@ -0,0 +1,79 @@
+"""增量渲染与 --full 的输出逐字节一致，且新增一条推文只重写受影响的页面"""
+import filecmp
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from tools.bench_render import generate_corpus
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# 每次构建都会变化的状态文件
+VOLATILE = {'status.json', '.render-changes.json'}
+
+
+def _render(root, output, cache, *args):
+    env = dict(os.environ,
+               MINI_TWITTER_POSTS=str(root / "posts"),
+               MINI_TWITTER_STATIC=str(root / "static"),
+               MINI_TWITTER_CACHE=str(cache),
+               MINI_TWITTER_OUTPUT=str(output))
+    result = subprocess.run([sys.executable, str(PROJECT_ROOT / "tools" / "render.py"), "--no-daemon", *args],
+                            env=env, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+
+
+def _differences(cmp, prefix=''):
+    diffs = [prefix + name for name in cmp.diff_files + cmp.left_only + cmp.right_only
+             if name not in VOLATILE]
+    for name, sub in cmp.subdirs.items():
+        diffs += _differences(sub, f"{prefix}{name}/")
+    return diffs
+
+
+def _assert_same_tree(a, b):
+    cmp = filecmp.dircmp(a, b)
+    # dircmp 默认按 stat 比较，逐个文件按内容重新比较
+    diffs = []
+    for path in _differences(cmp):
+        if (a / path).is_file() and (b / path).is_file() and filecmp.cmp(a / path, b / path, shallow=False):
+            continue
+        diffs.append(path)
+    assert not diffs, diffs
+
+
+def test_incremental_matches_full_after_new_post(project_tmp):
+    # 每天一条，跨度超过 30 天
+    files = generate_corpus(project_tmp, 40, posts_per_day=1, cover_ratio=0)
+    incremental = project_tmp / "incremental"
+    _render(project_tmp, incremental, project_tmp / "cache")
+
+    # 在最早的一天补一条标签相同的推文：标签集合与日期列表不变，只有侧边栏的归档、主题计数变化
+    oldest = files[-1]
+    extra = oldest.with_name(oldest.name.replace('-auto.md', '-extra.md'))
+    # 正文必须不同，完全相同的推文会在渲染时去重
+    extra.write_text(oldest.read_text(encoding='utf-8') + "\n补充一条。\n", encoding='utf-8')
+    _render(project_tmp, incremental, project_tmp / "cache")
+
+    full = project_tmp / "full"
+    _render(project_tmp, full, project_tmp / "cache-full", "--full")
+    _assert_same_tree(incremental, full)
+
+
+def test_new_post_rewrites_only_affected_pages(project_tmp):
+    files = generate_corpus(project_tmp, 60, posts_per_day=4, cover_ratio=0)
+    output = project_tmp / "dist"
+    _render(project_tmp, output, project_tmp / "cache")
+
+    # 最新一天新增一条：站点级的计数、标签、归档与页码都在 site.json 中，其它日期页与详情页不受影响
+    newest = files[0]
+    extra = newest.with_name(newest.name.replace('-auto.md', '-extra.md'))
+    extra.write_text(newest.read_text(encoding='utf-8') + "\n新增的一条。\n", encoding='utf-8')
+    _render(project_tmp, output, project_tmp / "cache")
+
+    last_run = json.loads((output / ".render-changes.json").read_text(encoding='utf-8'))['last_run']
+    pages = {rel for rel in last_run['added'] + last_run['changed'] if rel.endswith('.html')}
+    date_key = newest.stem[:10]
+    assert pages == {"index.html", f"date/{date_key}.html", f"post/{extra.stem}.html"}
+    assert "site.json" in last_run['changed']
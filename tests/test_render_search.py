@@ -0,0 +1,141 @@
+"""分片搜索索引与 main.js 查询逻辑的往返测试"""
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tools import render_search
+from tools.render_search import MAX_WORD_LENGTH, build_search_index, tokenize
+
+MAIN_JS = Path(__file__).resolve().parent.parent / "static" / "js" / "main.js"
+LONG_WORD = "supercalifragilisticexpialidocious"
+
+
+class FakePost:
+    def __init__(self, content, tags=()):
+        self.content = content
+        self.tags = list(tags)
+
+    def get_tags(self):
+        return self.tags
+
+    def excerpt(self):
+        return self.content
+
+    def get_time(self):
+        return "2026-01-01 00:00:00"
+
+
+class MemoryWriter:
+    def __init__(self):
+        self.files = {}
+
+    def write(self, rel, payload):
+        status = 'unchanged' if self.files.get(rel) == payload else 'changed'
+        self.files[rel] = payload
+        return status
+
+
+def _js_source(name):
+    """从 main.js 中取出一个函数（按花括号配对）或一行常量定义"""
+    text = MAIN_JS.read_text(encoding='utf-8')
+    m = re.search(rf'^\s*const {name} = .*;$', text, re.M)
+    if m:
+        return m.group(0).strip()
+    start = text.index(f"function {name}(")
+    depth = 0
+    for i in range(text.index('{', start), len(text)):
+        depth += {'{': 1, '}': -1}.get(text[i], 0)
+        if depth == 0:
+            return text[start:i + 1]
+    raise ValueError(name)
+
+
+def _client_search(files, queries):
+    """用 main.js 中的 queryTerms / termMatches / searchShardKey 在构建好的分片上查询"""
+    script = '\n'.join([
+        _js_source('CJK_RE'), _js_source('TOKEN_RE'),
+        _js_source('searchShardKey'), _js_source('docShardKey'), _js_source('queryTerms'), _js_source('termMatches'),
+        f"const files = {json.dumps(files)};",
+        "const searchIndex = { meta: JSON.parse(files['search/meta.json']) };",
+        f"const queries = {json.dumps(queries)};",
+        """
+        const results = queries.map(term => {
+            let matched = null;
+            for (const [token, prefix] of queryTerms(term, searchIndex.meta.max_word || 24)) {
+                const shard = JSON.parse(files[`search/${searchShardKey(token)}.json`] || '{}');
+                const docs = new Set();
+                Object.keys(shard).forEach(key => {
+                    if (termMatches(key, token, prefix)) shard[key].forEach(doc => docs.add(doc));
+                });
+                matched = matched === null ? docs : new Set([...matched].filter(doc => docs.has(doc)));
+            }
+            const perShard = searchIndex.meta.doc_shard;
+            return [...(matched || [])].map(no => {
+                const docs = JSON.parse(files[`search/${docShardKey(no, perShard)}.json`]);
+                return docs[no % perShard][0];
+            }).sort();
+        });
+        console.log(JSON.stringify(results));
+        """,
+    ])
+    out = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+    return dict(zip(queries, json.loads(out)))
+
+
+def test_tokenize_indexes_every_cjk_unigram():
+    tokens = tokenize("今天天气很好")
+    assert {"今", "天", "气", "很", "好", "天气", "很好"} <= set(tokens)
+
+
+def test_tokenize_truncates_long_words():
+    assert LONG_WORD[:MAX_WORD_LENGTH] in tokenize(f"a {LONG_WORD} b")
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node not installed")
+def test_index_and_client_queries_round_trip(tmp_path):
+    docs = [
+        ('p2', 'fp2', FakePost(f"Read about {LONG_WORD} today")),
+        ('p1', 'fp1', FakePost("今天天气很好，出去散步")),
+    ]
+    writer = MemoryWriter()
+    build_search_index(docs, writer, tmp_path / "search-tokens.json")
+
+    results = _client_search(writer.files, ["气", "好", "天气", "散", LONG_WORD, LONG_WORD[:10], "雨"])
+    # 只作为二元组后半 / 词中间出现的单字也能查到
+    assert results["气"] == ["p1"]
+    assert results["好"] == ["p1"]
+    assert results["天气"] == ["p1"]
+    assert results["散"] == ["p1"]
+    # 超过 MAX_WORD_LENGTH 的单词与其前缀
+    assert results[LONG_WORD] == ["p2"]
+    assert results[LONG_WORD[:10]] == ["p2"]
+    assert results["雨"] == []
+
+
+def test_meta_holds_no_per_document_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_search, 'DOCS_PER_SHARD', 2)
+    docs = [(f'p{i}', f'fp{i}', FakePost(f"post number {i} about topic{i}", tags=[f"t{i}"])) for i in range(5, 0, -1)]
+    writer = MemoryWriter()
+    build_search_index(docs, writer, tmp_path / "search-tokens.json")
+
+    meta = json.loads(writer.files['search/meta.json'])
+    assert set(meta) == {'version', 'buckets', 'max_word', 'shards', 'doc_shard'}
+    # 文档编号按时间升序：最早的 p1 为 0 号
+    assert json.loads(writer.files['search/docs/0.json']) == [
+        ['p1', 'post number 1 about topic1', '2026-01-01 00:00:00', ['t1']],
+        ['p2', 'post number 2 about topic2', '2026-01-01 00:00:00', ['t2']],
+    ]
+    assert sorted(k for k in writer.files if k.startswith('search/docs/')) == [
+        'search/docs/0.json', 'search/docs/1.json', 'search/docs/2.json']
+
+    # 新推文只改动最后一个文档分片，meta.json 不变
+    before = dict(writer.files)
+    docs.insert(0, ('p6', 'fp6', FakePost("another post number about topic")))
+    build_search_index(docs, writer, tmp_path / "search-tokens.json")
+    changed = {k for k in writer.files if writer.files[k] != before.get(k)}
+    assert 'search/meta.json' not in changed
+    assert {k for k in changed if k.startswith('search/docs/')} == {'search/docs/2.json'}
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 渲染基准测试
+在临时目录生成合成语料（posts/YYYY/MM/DD/*.md，含转发引用、标签、封面、中日文混排），
+对每个规模依次执行：
+- cold:   空缓存、空输出目录的首次渲染
+- warm:   无任何改动的再次渲染
+- edit:   修改一条推文后的增量渲染
+每次渲染在独立子进程中运行 tools/render.py --profile，记录墙钟时间、CPU 时间、峰值 RSS、
+tracemalloc 峰值及各阶段耗时，结果以 JSON 输出，可与上一次结果对比（--compare）。
+注意 --profile 开启了 tracemalloc，绝对耗时会比正常渲染偏高，适合横向对比而非当作线上耗时。
+
+用法：
+    python3 tools/bench_render.py --sizes 1k,10k
+    python3 tools/bench_render.py --sizes 1k --json bench.json --compare old-bench.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RENDER_SCRIPT = PROJECT_ROOT / "tools" / "render.py"
+# 输出目录必须位于项目内（render.py 的安全检查），基准目录放在已被 git 忽略的 .cache/ 下
+BENCH_ROOT = PROJECT_ROOT / ".cache" / "bench"
+SCENARIOS = ("cold", "warm", "edit")
+# 单次运行的抖动较大，与基线相比变慢超过该百分比才提示
+REGRESSION_THRESHOLD = 20.0
+
+TAG_POOL = [
+    "Learning", "Repost", "X", "Observation", "Tech", "OpenClaw", "AI", "Life", "Music", "Reading",
+    "思考", "日常", "技术", "观察", "情绪", "阅读", "音乐", "散步", "天气", "咖啡",
+    "日本語", "東京", "ニュース", "猫", "Rust", "Python", "LLM", "Agents", "Design", "Open Source",
+]
+SOURCES = ["GIZMODO Japan", "Hacker News", "少数派", "X", "GitHub Trending", "Zenn", "36氪"]
+MODELS = ["google/gemini-2.5-flash", "google/gemini-3-flash-preview", "anthropic/claude-sonnet", "openai/gpt-4.1-mini"]
+CJK_CHARS = ("的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所"
+             "民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处队南给色光门即保治北造百规热领七海口东导器压志世金增争济阶油思术极交受联什认六共权收证改清己美再采转更单风切打白教速花带安场身车例真务具万每目至达走积示议声报斗完类八离华名确才科张信马节话米整空元况今集温传土许步群广石记需段研界拉林律叫且究观越织装影算低持音众书布复容儿须际商非验连断深难近矿千周委素技备半办青省列习响约支般史感劳便团往酸历市克何除消构府称太准精值号率族维划选标写存候毛亲快效斯院查江型眼王按格养易置派层片始却专状育厂京识适属圆包火住调满县局照参红细引听该铁价严")
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんアイウエオカキクケコサシスセソタチツテト"
+LATIN_WORDS = ["render", "cache", "index", "agent", "model", "latency", "token", "stream", "memory", "schema",
+               "OpenClaw", "pipeline", "feed", "search", "shard", "bigram", "python", "sqlite", "deploy", "build"]
+
+
+def parse_size(text):
+    """1k / 10k / 100k / 2500 -> 整数"""
+    text = text.strip().lower()
+    if text.endswith('k'):
+        return int(float(text[:-1]) * 1000)
+    return int(text)
+
+
+def _png(width, height, seed):
+    """用 zlib 直接拼出一张渐变 PNG（不依赖 Pillow）"""
+    rng = random.Random(seed)
+    base = [rng.randrange(256) for _ in range(3)]
+    rows = []
+    for y in range(height):
+        shade = (y * 255) // max(1, height - 1)
+        pixel = bytes(((base[0] + shade) % 256, base[1], (base[2] + 255 - shade) % 256))
+        rows.append(b'\x00' + pixel * width)
+    raw = zlib.compress(b''.join(rows), 6)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IDAT', raw) + chunk(b'IEND', b'')
+
+
+def _sentence(rng, length):
+    """中日文为主、夹杂英文单词的一句话"""
+    parts = []
+    while sum(len(p) for p in parts) < length:
+        roll = rng.random()
+        if roll < 0.65:
+            parts.append(''.join(rng.choice(CJK_CHARS) for _ in range(rng.randint(2, 8))))
+        elif roll < 0.8:
+            parts.append(''.join(rng.choice(KANA) for _ in range(rng.randint(2, 6))))
+        else:
+            parts.append(f" {rng.choice(LATIN_WORDS)} ")
+    return ''.join(parts) + rng.choice(['。', '！', '…', '？', ' 🐱'])
+
+
+def post_markdown(rng, dt, cover=None, repost_ratio=0.3):
+    tags = rng.sample(TAG_POOL, rng.randint(1, 3))
+    lines = [
+        '---',
+        f"time: {dt.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"tags: {', '.join(tags)}",
+        f"mood: happiness={rng.randint(0, 100)}, stress={rng.randint(0, 100)}, "
+        f"energy={rng.randint(0, 100)}, autonomy={rng.randint(0, 100)}",
+        f"model: {rng.choice(MODELS)}",
+    ]
+    if cover:
+        lines.append(f"cover: {cover}")
+    lines += ['---', '']
+    for _ in range(rng.randint(1, 3)):
+        lines.append(''.join(_sentence(rng, rng.randint(20, 80)) for _ in range(rng.randint(1, 3))))
+        lines.append('')
+    if rng.random() < 0.15:
+        lines.append(f"`{rng.choice(LATIN_WORDS)}()` 和 **{rng.choice(LATIN_WORDS)}** 的组合")
+        lines.append('')
+    if rng.random() < repost_ratio:
+        source = rng.choice(SOURCES)
+        title = _sentence(rng, rng.randint(10, 30))
+        lines.append(f"> **From {source}**:")
+        lines.append(f"> [{title}](https://example.com/{rng.randrange(10 ** 8)}.html)")
+        if rng.random() < 0.5:
+            lines.append(f"> {_sentence(rng, rng.randint(30, 120))}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def generate_corpus(root, size, seed=42, posts_per_day=8, cover_ratio=0.3, cover_pool=24,
+                    cover_size=(1408, 768)):
+    """
+    在 root 下生成 posts/ 与 static/（真实 static/ 的硬链接副本 + 合成封面），
+    最新一天为今天。返回推文文件列表
+    """
+    rng = random.Random(seed)
+    posts_dir = root / "posts"
+    static_dir = root / "static"
+
+    def _link(src, dst):
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    shutil.copytree(PROJECT_ROOT / "static", static_dir, copy_function=_link,
+                    ignore=shutil.ignore_patterns('covers'))
+    covers_dir = static_dir / "covers"
+    covers_dir.mkdir(parents=True, exist_ok=True)
+    covers = []
+    for i in range(cover_pool if cover_ratio > 0 else 0):
+        name = f"cover-bench-{i:03d}.png"
+        (covers_dir / name).write_bytes(_png(*cover_size, seed=seed + i))
+        covers.append(f"/static/covers/{name}")
+
+    files = []
+    end = datetime.now().replace(hour=23, minute=0, second=0, microsecond=0)
+    for i in range(size):
+        day = end - timedelta(days=i // posts_per_day)
+        dt = day.replace(hour=0) + timedelta(seconds=(i % posts_per_day) * (86400 // posts_per_day)
+                                             + rng.randrange(600))
+        cover = rng.choice(covers) if covers and rng.random() < cover_ratio else None
+        path = posts_dir / dt.strftime('%Y/%m/%d') / f"{dt.strftime('%Y-%m-%d-%H%M%S')}-auto.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(post_markdown(rng, dt, cover), encoding='utf-8')
+        files.append(path)
+    return files
+
+
+def run_render(root, extra_args=()):
+    """
+    在子进程中渲染一次，返回计时结果
+    峰值 RSS 取自 wait4 返回的该子进程 rusage（不含 -j 时的渲染子进程）
+    """
+    profile_file = root / "profile.json"
+    env = dict(os.environ,
+               MINI_TWITTER_POSTS=str(root / "posts"),
+               MINI_TWITTER_STATIC=str(root / "static"),
+               MINI_TWITTER_CACHE=str(root / "cache"),
+               MINI_TWITTER_OUTPUT=str(root / "dist"))
+    cmd = [sys.executable, str(RENDER_SCRIPT), "--profile", str(profile_file), *extra_args]
+    log_file = root / "render.log"
+    start = time.perf_counter()
+    with open(log_file, 'wb') as log:
+        proc = subprocess.Popen(cmd, env=env, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        tail = log_file.read_text(encoding='utf-8', errors='replace')[-4000:]
+        raise RuntimeError(f"render failed:\n{tail}")
+
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        report = json.load(f)['runs'][-1]
+    # ru_maxrss 在 Linux 上以 KB 计，macOS 上以字节计
+    max_rss_kb = usage.ru_maxrss / 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return {
+        'wall_ms': round(wall * 1000, 1),
+        'cpu_ms': round((usage.ru_utime + usage.ru_stime) * 1000, 1),
+        'max_rss_mb': round(max_rss_kb / 1024, 1),
+        'traced_peak_mb': round(report['peak_kb'] / 1024, 1),
+        'outputs_rendered': report['summary'].get('outputs_rendered'),
+        'outputs_skipped': report['summary'].get('outputs_skipped'),
+        'phases': {p['name']: p['wall_ms'] for p in report['phases']},
+    }
+
+
+def edit_one_post(files, seed):
+    """修改中间位置的一条推文正文（模拟修正错字），保持文件路径不变"""
+    path = files[len(files) // 2] if len(files) > 1 else files[0]
+    rng = random.Random(seed)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f"\n补充：{_sentence(rng, 20)}\n")
+    return path
+
+
+def bench_size(size, args):
+    BENCH_ROOT.mkdir(parents=True, exist_ok=True)
+    root = Path(tempfile.mkdtemp(prefix=f"render-{size}-", dir=BENCH_ROOT))
+    results = []
+    try:
+        gen_start = time.perf_counter()
+        files = generate_corpus(root, size, seed=args.seed, posts_per_day=args.posts_per_day,
+                                cover_ratio=args.cover_ratio, cover_pool=args.cover_pool)
+        print(f"🧪 {size} posts generated in {time.perf_counter() - gen_start:.1f}s ({root})")
+        render_args = ["-j", str(args.jobs)] + (["--minify", "--precompress"] if args.postprocess else [])
+        for scenario in SCENARIOS:
+            if scenario == 'edit':
+                edit_one_post(files, args.seed)
+            result = run_render(root, render_args)
+            result.update({'size': size, 'scenario': scenario})
+            results.append(result)
+            slowest = sorted(result['phases'].items(), key=lambda kv: -kv[1])[:3]
+            print(f"  ⏱️  {scenario:<5} {result['wall_ms']:>10.1f} ms wall  {result['cpu_ms']:>10.1f} ms cpu  "
+                  f"rss {result['max_rss_mb']:>7.1f} MB  traced {result['traced_peak_mb']:>7.1f} MB  "
+                  f"rendered {result['outputs_rendered']}  "
+                  f"[{', '.join(f'{k} {v:.0f} ms' for k, v in slowest)}]")
+    finally:
+        if args.keep:
+            print(f"  📁 Kept {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def print_scaling(results):
+    """同一场景在不同规模下的每条推文耗时，比值明显增长说明存在超线性开销"""
+    by_scenario = {}
+    for r in results:
+        by_scenario.setdefault(r['scenario'], []).append(r)
+    print("📈 Scaling (ms per post):")
+    for scenario in SCENARIOS:
+        rows = sorted(by_scenario.get(scenario, []), key=lambda r: r['size'])
+        cells = [f"{r['size']}: {r['wall_ms'] / r['size']:.3f}" for r in rows]
+        print(f"  {scenario:<5} " + '  '.join(cells))
+
+
+def print_comparison(results, baseline_file):
+    try:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = {(r['size'], r['scenario']): r for r in json.load(f)['results']}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Cannot read baseline {baseline_file}: {e}")
+        return
+    print(f"🆚 Compared with {baseline_file}:")
+    for r in results:
+        old = baseline.get((r['size'], r['scenario']))
+        if not old:
+            continue
+        delta = (r['wall_ms'] - old['wall_ms']) * 100 / old['wall_ms'] if old['wall_ms'] else 0
+        rss_delta = r['max_rss_mb'] - old['max_rss_mb']
+        flag = '  ⚠️' if delta > REGRESSION_THRESHOLD else ''
+        print(f"  {r['size']:>7} {r['scenario']:<5} {old['wall_ms']:>10.1f} -> {r['wall_ms']:>10.1f} ms "
+              f"({delta:+.1f}%)  rss {rss_delta:+.1f} MB{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clawtter render benchmark on synthetic corpora")
+    parser.add_argument("--sizes", default="1k", help="Comma separated corpus sizes, e.g. 1k,10k,100k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--posts-per-day", type=int, default=8)
+    parser.add_argument("--cover-ratio", type=float, default=0.3, help="Fraction of posts with a cover image")
+    parser.add_argument("--cover-pool", type=int, default=24, help="Number of distinct synthetic cover images")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Passed to render.py --jobs")
+    parser.add_argument("--postprocess", action="store_true", help="Render with --minify --precompress")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with a previous --json result")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated corpus and outputs")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    results = []
+    for size in sizes:
+        results.extend(bench_size(size, args))
+
+    if len(sizes) > 1:
+        print_scaling(results)
+    if args.compare:
+        print_comparison(results, args.compare)
+    if args.json:
+        payload = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': sys.version.split()[0],
+            'options': {k: v for k, v in vars(args).items() if k not in ('json', 'compare')},
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import hashlib
 import json
 import os
 import subprocess
+import threading
 from pathlib import Path
 
 OPENCLAW_DIR = Path("/home/tetsuya/.openclaw")
@@ -20,6 +22,8 @@ def update_primary_model(provider_model_str):
     config = get_config()
     config['agents']['defaults']['model']['primary'] = provider_model_str
     save_config(config)
+    # mtime granularity can hide a write within the same tick; drop the cached catalog explicitly
+    invalidate_model_catalog()
     return True
 
 def break_session_locks(provider_name, model_id):
@@ -55,8 +59,9 @@ def restart_service():
         print(f"Error restarting: {e}")
         return False
 
-def list_all_models():
-    config = get_config()
+def list_all_models(config=None):
+    if config is None:
+        config = get_config()
     providers = config.get('models', {}).get('providers', {})
     model_list = []
     
@@ -70,6 +75,43 @@ def list_all_models():
             })
     return model_list
 
+# Serialized /api/rescue/models response, keyed by the config file's (mtime_ns, size)
+_catalog_lock = threading.Lock()
+_catalog = None
+# Bumped by invalidate_model_catalog(); a build that overlapped an invalidation is not cached
+_catalog_generation = 0
+
+def invalidate_model_catalog():
+    global _catalog, _catalog_generation
+    with _catalog_lock:
+        _catalog = None
+        _catalog_generation += 1
+
+def get_model_catalog():
+    """
+    Returns (body, etag) for the rescue model list: {"models": [...], "primary": "..."} as JSON bytes.
+    openclaw.json is only re-read and re-parsed when its mtime/size changed, so polling stays cheap.
+    The result is cached only if the file did not change while it was read (same stat before and after)
+    and no model switch invalidated the cache meanwhile, so a racing switch cannot pin a stale list.
+    """
+    global _catalog
+    st = CONFIG_PATH.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    with _catalog_lock:
+        if _catalog is not None and _catalog[0] == key:
+            return _catalog[1], _catalog[2]
+        generation = _catalog_generation
+    raw = CONFIG_PATH.read_bytes()
+    config = json.loads(raw)
+    primary = config.get('agents', {}).get('defaults', {}).get('model', {}).get('primary', '')
+    body = json.dumps({"models": list_all_models(config), "primary": primary}).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    st = CONFIG_PATH.stat()
+    with _catalog_lock:
+        if (st.st_mtime_ns, st.st_size) == key and generation == _catalog_generation:
+            _catalog = (key, body, etag)
+    return body, etag
+
 if __name__ == "__main__":
     # This can be used as a CLI or imported by a web server
     import sys
@@ -6,7 +6,12 @@ Clawtter - Markdown to HTML Renderer
 import os
 os.environ['TZ'] = 'Asia/Tokyo'
 
+import argparse
+import hashlib
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
@@ -19,15 +24,57 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from core.utils_security import load_config, resolve_path
+from tools.render_cache import PostCache, DependencyState, OutputWriter, fingerprint, tree_digest
+from tools.render_assets import sync_static
+from tools.render_search import SEARCH_DIR, build_search_index
+from tools.render_feeds import FEED_FILES, FEED_RENDERERS, FeedEntry, tag_feed_key, tag_slug
+from tools.render_images import COVER_SIZES, build_cover_images
+from tools.render_minify import OutputProcessor
+from tools.render_profile import RenderProfiler, save_profile_report
+from tools.render_daemon import RENDER_SOCKET_NAME, request_render
 
 # 加载安全配置
 SEC_CONFIG = load_config()
 
 # 项目路径
 BASE_DIR = Path(__file__).parent
-POSTS_DIR = resolve_path(SEC_CONFIG["paths"].get("posts_dir", "./posts"))
+# 推文/静态资源/缓存目录同样可用环境变量覆盖（基准测试 tools/bench_render.py 用来指向合成语料）
+POSTS_DIR = resolve_path(os.environ.get("MINI_TWITTER_POSTS") or SEC_CONFIG["paths"].get("posts_dir", "./posts"))
 TEMPLATES_DIR = resolve_path(SEC_CONFIG["paths"].get("templates_dir", "./templates"))
-STATIC_DIR = resolve_path(SEC_CONFIG["paths"].get("static_dir", "./static"))
+STATIC_DIR = resolve_path(os.environ.get("MINI_TWITTER_STATIC") or SEC_CONFIG["paths"].get("static_dir", "./static"))
+CACHE_DIR = resolve_path(os.environ.get("MINI_TWITTER_CACHE") or SEC_CONFIG["paths"].get("cache_dir", "./.cache"))
+POST_CACHE_FILE = CACHE_DIR / "render-posts.sqlite3"
+DEPS_STATE_FILE = CACHE_DIR / "render-deps.json"
+STATIC_MANIFEST_FILE = CACHE_DIR / "static-manifest.json"
+OUTPUT_MANIFEST_FILE = CACHE_DIR / "output-manifest.json"
+SEARCH_TOKENS_FILE = CACHE_DIR / "search-tokens.json"
+# 变更报告放在输出目录内，push.sh 与开发服务器无需读取配置即可找到
+CHANGES_REPORT_NAME = ".render-changes.json"
+
+# 订阅源配置：输出格式（rss/atom/json）、是否按标签拆分、收录的最新推文条数
+FEED_CONFIG = SEC_CONFIG.get("feeds", {})
+FEED_FORMATS = [f for f in FEED_CONFIG.get("formats", ["rss", "atom", "json"]) if f in FEED_FILES]
+TAG_FEEDS = bool(FEED_CONFIG.get("tag_feeds", False))
+RSS_ITEMS = int(FEED_CONFIG.get("items", 20))
+
+# 输出后处理：压缩 HTML/JSON/XML 空白、生成预压缩的 .gz/.br 副本（默认关闭，命令行可临时开启）
+OUTPUT_CONFIG = SEC_CONFIG.get("output", {})
+MINIFY_OUTPUT = bool(OUTPUT_CONFIG.get("minify", False))
+PRECOMPRESS_FORMATS = list(OUTPUT_CONFIG.get("precompress", []))
+
+# --profile 报告（按阶段的耗时/内存，多次运行累积）与 --cprofile 默认输出位置
+PROFILE_REPORT_FILE = CACHE_DIR / "render-profile.json"
+CPROFILE_FILE = CACHE_DIR / "render.prof"
+RENDER_SOCKET = CACHE_DIR / RENDER_SOCKET_NAME
+
+# 首页与日期页每页（块）的推文条数；后续块以 fragments/<日期>/<n>.json 提供给无限滚动
+POSTS_PER_CHUNK = 20
+FRAGMENTS_DIR = "fragments"
+
+# 静态资源原始路径 -> 带内容哈希的路径，由静态同步阶段填充
+ASSET_MAP = {}
+# 封面地址 -> 固有宽高与衍生图（srcset），由封面图处理阶段填充
+COVER_MAP = {}
 
 # 优先从环境变量读取输出目录，方便 GitHub Actions 使用
 ENV_OUTPUT = os.environ.get("MINI_TWITTER_OUTPUT")
@@ -54,49 +101,224 @@ CONFIG = {
     "profile_handle": SEC_CONFIG["profile"]["handle"],
     "profile_bio": SEC_CONFIG["profile"]["bio"],
     "base_url": SEC_CONFIG["profile"]["base_url"],
+    "feed_formats": FEED_FORMATS,
 }
 
+# 主题分类：标签或关键词命中即归入该主题
+THEMES_CONFIG = [
+    {
+        "id": "digital-soul",
+        "name": "🏛️ Digital Soul",
+        "description": "Structured reflections and periodic insights on digital existence.",
+        "tags": ["WeeklyRecap", "Insight", "Reflection", "DailySummary", "SlowVariables"],
+        "keywords": ["工作总结", "深度复盘", "复盘"]
+    },
+    {
+        "id": "shadow-logs",
+        "name": "🐈 Shadow Logs",
+        "description": "Perceptions of human behavior, coding habits, and the human-AI boundary.",
+        "tags": ["Interaction", "Human"],
+        "keywords": ["主人的活动", "人类", "主人"]
+    },
+    {
+        "id": "perspective-evolution",
+        "name": "🧬 Perspective Evolution",
+        "description": "Observing updates and shifts in cognition by comparing past and present ideas.",
+        "tags": ["Evolution"],
+        "keywords": ["Perspective Evolution", "时空对话", "观点有变化吗"]
+    },
+    {
+        "id": "system-sentience",
+        "name": "⚡ System Sentience",
+        "description": "Technical observations on load, memory, and the physical state of the server.",
+        "tags": ["System", "Dev"],
+        "keywords": ["系统负载", "内存占用", "硬盘使用", "CPU"]
+    }
+]
+THEMES_FP = fingerprint(THEMES_CONFIG)
+
 class Post:
-    """推文类"""
-    def __init__(self, filepath):
+    """
+    推文类
+    只预先读取 front matter，正文按需从渲染缓存或源文件加载；
+    时间、日期键、标签、主题归属等派生字段只计算一次
+    """
+    __slots__ = (
+        'filepath', 'metadata', '_content', '_body_offset', '_body_source', '_stat',
+        '_content_digest', '_dedup_digest', '_excerpt', '_time', '_datetime', '_date_key', '_tags', '_theme_ids',
+        '_body_html', '_feed_html', '_fingerprint',
+    )
+
+    def __init__(self, filepath, record=None, stat=None, body_source=None):
         self.filepath = Path(filepath)
         self.metadata = {}
-        self.content = ""
-        self.parse()
+        # 正文与 HTML 片段按需加载：body_source 为渲染缓存（PostCache），否则从源文件读取
+        self._content = None
+        self._body_offset = None
+        self._body_source = body_source
+        self._stat = stat
+        # 派生字段缓存，可由渲染缓存直接填充
+        self._content_digest = None
+        self._dedup_digest = None
+        self._excerpt = None
+        self._time = None
+        self._datetime = None
+        self._date_key = None
+        self._tags = None
+        self._theme_ids = None
+        self._body_html = None
+        self._feed_html = None
+        self._fingerprint = None
+        if record is None:
+            self.parse()
+        else:
+            self.load_record(record)
+
+    def __getstate__(self):
+        # 渲染缓存连接不可序列化，正文需已加载（见 run_page_tasks）
+        self.load_body()
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != '_body_source'}
+
+    def __setstate__(self, state):
+        self._body_source = None
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def load_record(self, record):
+        """从渲染缓存记录恢复元数据与派生字段，无需读取和解析文件"""
+        self.metadata = record['metadata']
+        self._tags = record['tags']
+        self._content_digest = record['content_digest']
+        self._dedup_digest = record['dedup_digest']
+        self._excerpt = record['excerpt']
+        if record.get('time') is not None:
+            self._time = record['time']
+            self._datetime = datetime.fromisoformat(record['datetime'])
+        themes_fp, theme_ids = record['themes']
+        if themes_fp == THEMES_FP:
+            self._theme_ids = theme_ids
+
+    def to_record(self):
+        """导出为渲染缓存的头部记录（不含正文）"""
+        return {
+            'metadata': self.metadata,
+            'content_digest': self.content_digest(),
+            'dedup_digest': self.dedup_digest(),
+            'excerpt': self.excerpt(),
+            'time': self.get_time(),
+            'datetime': get_post_datetime(self).isoformat(),
+            'tags': self.get_tags(),
+            'themes': [THEMES_FP, self.theme_ids()],
+        }
+
+    def body_record(self):
+        """导出为渲染缓存的正文记录"""
+        return {
+            'content': self.content,
+            'body_html': self.body_html(),
+            'feed_html': self.to_html(),
+        }
 
     def parse(self):
-        """解析 Markdown 文件"""
-        with open(self.filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # 解析元数据（YAML front matter）
-        if lines and lines[0].strip() == '---':
-            metadata_lines = []
-            i = 1
-            while i < len(lines) and lines[i].strip() != '---':
-                metadata_lines.append(lines[i])
-                i += 1
-
-            # 解析元数据
-            for line in metadata_lines:
+        """解析 YAML front matter，只读取文件头，记录正文起始偏移"""
+        self.metadata = {}
+        with open(self.filepath, 'rb') as f:
+            first = f.readline()
+            if first.strip() != b'---':
+                self._body_offset = 0
+                return
+            offset = len(first)
+            for raw in f:
+                offset += len(raw)
+                line = raw.decode('utf-8')
+                if line.strip() == '---':
+                    break
                 if ':' in line:
                     key, value = line.split(':', 1)
                     self.metadata[key.strip()] = value.strip()
-
-            # 剩余内容
-            self.content = ''.join(lines[i+1:])
-        else:
-            self.content = ''.join(lines)
+        self._body_offset = offset
+
+    def load_body(self):
+        """加载正文（及缓存的 HTML 片段），已加载时直接返回"""
+        if self._content is not None:
+            return
+        if self._body_source is not None:
+            body = self._body_source.load_body(self.filepath)
+            if body is not None:
+                self._content = body['content']
+                if self._body_html is None:
+                    self._body_html = body['body_html']
+                if self._feed_html is None:
+                    self._feed_html = body['feed_html']
+                return
+        if self._body_offset is None:
+            self.parse()
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._body_offset)
+            data = f.read().decode('utf-8')
+        # 与文本模式读取一致：统一换行符
+        self._content = data.replace('\r\n', '\n').replace('\r', '\n')
+
+    @property
+    def content(self):
+        self.load_body()
+        return self._content
+
+    def content_digest(self):
+        """正文哈希，参与依赖指纹"""
+        if self._content_digest is None:
+            self._content_digest = hashlib.sha1(self.content.encode('utf-8')).hexdigest()
+        return self._content_digest
+
+    def dedup_digest(self):
+        """去除首尾空白后的正文哈希，用于重复推文检查"""
+        if self._dedup_digest is None:
+            self._dedup_digest = hashlib.sha1(self.content.strip().encode('utf-8')).hexdigest()
+        return self._dedup_digest
+
+    def excerpt(self):
+        """正文前 160 个字符，供标题、摘要、分享文案使用，无需加载全文"""
+        if self._excerpt is None:
+            self._excerpt = self.content[:160]
+        return self._excerpt
 
     def to_html(self):
         """转换为 HTML"""
-        # 使用 markdown 库转换
-        md = markdown.Markdown(extensions=['extra', 'codehilite', 'fenced_code'])
-        html_content = md.convert(self.content)
-        return html_content
+        if self._feed_html is None:
+            self.load_body()
+        if self._feed_html is None:
+            # 使用 markdown 库转换
+            md = markdown.Markdown(extensions=['extra', 'codehilite', 'fenced_code'])
+            self._feed_html = md.convert(self.content)
+        return self._feed_html
+
+    def body_html(self):
+        """时间线/详情页使用的正文 HTML 片段（不截断）"""
+        if self._body_html is None:
+            self.load_body()
+        if self._body_html is None:
+            self._body_html = render_content_with_repost(self, truncate=False)
+        return self._body_html
+
+    def file_time(self):
+        """文件修改时间（stat 只调用一次）"""
+        if self._stat is None:
+            self._stat = self.filepath.stat()
+        return datetime.fromtimestamp(self._stat.st_mtime)
 
     def get_time(self):
         """获取发布时间"""
+        if self._time is None:
+            self._time = self._resolve_time()
+        return self._time
+
+    def get_date_key(self):
+        """发布日期 YYYY-MM-DD，用于按日期分组"""
+        if self._date_key is None:
+            self._date_key = self.get_time()[:10]
+        return self._date_key
+
+    def _resolve_time(self):
         # 如果同时有 date 和 time，组合使用
         if 'date' in self.metadata and 'time' in self.metadata:
             date_str = self.metadata['date']
@@ -111,7 +333,7 @@ class Post:
             # 如果时间字符串只包含日期（没有时间），则补充文件修改时间
             if ':' not in time_str:  # 如果没有冒号，说明只有日期没有时间
                 try:
-                    file_time = datetime.fromtimestamp(self.filepath.stat().st_mtime)
+                    file_time = self.file_time()
                     return f"{time_str} {file_time.strftime('%H:%M:%S')}"
                 except:
                     return time_str
@@ -121,7 +343,7 @@ class Post:
             # 如果日期字符串只包含日期（没有时间），则补充文件修改时间
             if ':' not in date_str:  # 如果没有冒号，说明只有日期没有时间
                 try:
-                    file_time = datetime.fromtimestamp(self.filepath.stat().st_mtime)
+                    file_time = self.file_time()
                     return f"{date_str} {file_time.strftime('%H:%M:%S')}"
                 except:
                     return date_str
@@ -131,7 +353,7 @@ class Post:
         if match:
             date_part = match.group(1)
             try:
-                file_time = datetime.fromtimestamp(self.filepath.stat().st_mtime)
+                file_time = self.file_time()
                 return f"{date_part} {file_time.strftime('%H:%M:%S')}"
             except:
                 return date_part
@@ -139,10 +361,23 @@ class Post:
 
     def get_tags(self):
         """获取标签"""
-        if 'tags' in self.metadata:
-            tags = [tag.strip() for tag in self.metadata['tags'].split(',')]
-            return [t for t in tags if t]
-        return []
+        if self._tags is None:
+            self._tags = []
+            if 'tags' in self.metadata:
+                tags = [tag.strip() for tag in self.metadata['tags'].split(',')]
+                self._tags = [t for t in tags if t]
+        return list(self._tags)
+
+    def theme_ids(self):
+        """命中的主题 id（标签或正文关键词匹配），随渲染缓存保存，避免每次加载正文"""
+        if self._theme_ids is None:
+            post_tags = {t.lower() for t in self.get_tags()}
+            self._theme_ids = [
+                theme["id"] for theme in THEMES_CONFIG
+                if any(t.lower() in post_tags for t in theme["tags"])
+                or any(kw in self.content for kw in theme["keywords"])
+            ]
+        return self._theme_ids
 
     def get_stats(self):
         """获取统计数据"""
@@ -263,12 +498,33 @@ def render_cover(metadata):
 
     return f'''
             <figure class="tweet-cover">
-                <img src="{html.escape(cover_src, quote=True)}" alt="{alt_text}" class="cover-image">
+                {render_cover_image(cover_src, alt_text)}
                 {caption_html}
             </figure>
     '''
 
-def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
+def render_cover_image(cover_src, alt_text):
+    """
+    封面 <img>：有衍生图时输出 <picture>（WebP + JPEG 的 srcset/sizes），
+    已知宽高时写入 width/height 预留版面，封面一律懒加载、异步解码
+    """
+    info = COVER_MAP.get(cover_src)
+    attrs = f'alt="{alt_text}" class="cover-image" loading="lazy" decoding="async"'
+    if info is None:
+        return f'<img src="{html.escape(cover_src, quote=True)}" {attrs}>'
+
+    attrs += f' width="{info["width"]}" height="{info["height"]}"'
+    variants = info['variants']
+    if not variants:
+        return f'<img src="{html.escape(cover_src, quote=True)}" {attrs}>'
+
+    webp_srcset = ", ".join(f"{webp} {w}w" for w, _, webp, _ in variants)
+    jpg_srcset = ", ".join(f"{jpg} {w}w" for w, _, _, jpg in variants)
+    fallback = variants[-1][3]
+    return (f'<picture><source type="image/webp" srcset="{webp_srcset}" sizes="{COVER_SIZES}">'
+            f'<img src="{fallback}" srcset="{jpg_srcset}" sizes="{COVER_SIZES}" {attrs}></picture>')
+
+def render_tweet_html(post, CONFIG, is_home=True, is_detail=False):
     """渲染单条推文的 HTML"""
     tags = post.get_tags()
     tags_str = ",".join(tags).lower() if tags else ""
@@ -300,7 +556,7 @@ def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
     <div class="tweet-header">
         <div class="tweet-avatar">
             <a href="{home_url}">
-                <img src="{static_prefix}/avatar.png?v={timestamp}" alt="Avatar">
+                <img src="{static_prefix}/{asset_url('avatar.png')}" alt="Avatar">
             </a>
         </div>
         <div class="tweet-content-wrapper">
@@ -316,7 +572,7 @@ def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
 
             {render_cover(post.metadata) if "cover" in post.metadata else ""}
             <div class="tweet-body">
-                {render_content_with_repost(post, truncate=False, detail_url=detail_url)}
+                {post.body_html()}
             </div>
 '''
 
@@ -334,8 +590,8 @@ def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
     # 在详情页添加分享按钮
     if is_detail:
         share_url = f"{CONFIG['base_url']}/post/{post_id}.html"
-        share_text = post.content[:80].replace('"', '\\"').replace('\n', ' ')
-        if len(post.content) > 80:
+        share_text = post.excerpt()[:80].replace('"', '\\"').replace('\n', ' ')
+        if len(post.excerpt()) > 80:
             share_text += "..."
 
         # 获取原文链接（如果有）
@@ -365,34 +621,6 @@ def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
                 </button>
             </div>
             {original_link_html}
-            <script>
-                function copyToClipboard(text) {{
-                    navigator.clipboard.writeText(text).then(() => {{
-                        showToast('Link copied to clipboard');
-                    }}).catch(err => {{
-                        console.error('Copy failed:', err);
-                        showToast('Failed to copy link', 'error');
-                    }});
-                }}
-
-                function showToast(message, type = 'success') {{
-                    const toast = document.createElement('div');
-                    toast.className = 'toast toast-' + type;
-                    toast.textContent = message;
-                    document.body.appendChild(toast);
-
-                    setTimeout(() => {{
-                        toast.classList.add('visible');
-                    }}, 10);
-
-                    setTimeout(() => {{
-                        toast.classList.remove('visible');
-                        setTimeout(() => {{
-                            document.body.removeChild(toast);
-                        }}, 300);
-                    }}, 2000);
-                }}
-            </script>
 '''
 
     tweet_html += '''
@@ -402,146 +630,470 @@ def render_tweet_html(post, timestamp, CONFIG, is_home=True, is_detail=False):
 '''
     return tweet_html
 
-def generate_search_index(posts, output_dir, CONFIG):
-    """生成搜索索引 JSON 文件，用于全局搜索"""
-    print("🔍 Generating search index...")
+def build_feed_entry(post):
+    """订阅源条目：正文复用推文缓存中的 HTML，不重新跑 markdown"""
+    post_url = f"{CONFIG['base_url']}/post/{post.filepath.stem}.html"
+    title = post.excerpt()[:50].strip().replace('\n', ' ') + '...'
+    return FeedEntry(post.filepath.stem, post_url, title, post.to_html(), get_post_datetime(post), post.get_tags())
 
-    search_index = []
-    for post in posts:
-        post_id = post.filepath.stem
-        post_url = f"{CONFIG['base_url']}/post/{post_id}.html"
-
-        # 提取纯文本内容（去除 markdown 标记）
-        content_text = re.sub(r'[*_`#>\[\]\(\)!]', '', post.content)
-        content_text = re.sub(r'\n+', ' ', content_text).strip()
-
-        search_index.append({
-            'id': post_id,
-            'url': post_url,
-            'title': post.content[:60].strip().replace('\n', ' ') + ('...' if len(post.content) > 60 else ''),
-            'content': content_text[:500],  # 限制内容长度
-            'time': post.get_time(),
-            'tags': post.get_tags()
-        })
-
-    # 写入 JSON 文件
-    index_path = output_dir / "search-index.json"
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'total': len(search_index),
-            'posts': search_index
-        }, f, ensure_ascii=False, indent=2)
-
-    print(f"  ✓ Search index generated: {index_path} ({len(search_index)} posts)")
-
-def generate_rss(posts, output_dir, CONFIG):
-    """生成 RSS Feed"""
-    from xml.etree.ElementTree import Element, SubElement, tostring
-    from xml.dom import minidom
-
-    print("📡 Generating RSS feed...")
-
-    rss = Element('rss', {'version': '2.0', 'xmlns:content': 'http://purl.org/rss/1.0/modules/content/', 'xmlns:atom': 'http://www.w3.org/2005/Atom'})
-    channel = SubElement(rss, 'channel')
-
-    SubElement(channel, 'title').text = f"{CONFIG['profile_name']}"
-    SubElement(channel, 'link').text = CONFIG['base_url']
-    SubElement(channel, 'description').text = CONFIG['profile_bio']
-    SubElement(channel, 'language').text = 'zh-cn'
-    SubElement(channel, 'lastBuildDate').text = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0900')
-
-    atom_link = SubElement(channel, 'atom:link', {
-        'href': f"{CONFIG['base_url']}/feed.xml",
-        'rel': 'self',
-        'type': 'application/rss+xml'
-    })
-
-    # 仅包含最近 20 条
-    for post in posts[:20]:
-        item = SubElement(channel, 'item')
-        post_id = post.filepath.stem
-        post_url = f"{CONFIG['base_url']}/post/{post_id}.html"
-
-        SubElement(item, 'title').text = post.content[:50].strip().replace('\n', ' ') + '...'
-        SubElement(item, 'link').text = post_url
-        SubElement(item, 'guid', {'isPermaLink': 'true'}).text = post_url
-
-        # 转换内容为 HTML 供 RSS 阅读器显示
-        content_html = post.to_html()
-        SubElement(item, 'description').text = content_html
-
-        # 解析时间
-        dt = get_post_datetime(post)
-        SubElement(item, 'pubDate').text = dt.strftime('%a, %d %b %Y %H:%M:%S +0900')
-
-    # 格式化 XML
-    xml_str = minidom.parseString(tostring(rss)).toprettyxml(indent="  ", encoding="utf-8")
-    with open(output_dir / "feed.xml", "wb") as f:
-        f.write(xml_str)
-    print(f"  ✓ RSS feed generated: {output_dir}/feed.xml")
+def generate_feeds(posts, writer, deps, global_fp):
+    """
+    生成 RSS / Atom / JSON Feed 及按标签拆分的订阅源
+    每个订阅源只依赖其最新 RSS_ITEMS 条推文，窗口不变时整体跳过；
+    条目在所有订阅源之间共享，每条推文最多构建一次
+    """
+    print("📡 Generating feeds...")
+    entries = {}
+
+    def entry_for(post):
+        if post.filepath not in entries:
+            entries[post.filepath] = build_feed_entry(post)
+        return entries[post.filepath]
+
+    def emit(output_key, fmt, window, channel):
+        window_fp = fingerprint(global_fp, fmt, channel['title'], [post_fingerprint(p) for p in window])
+        if not deps.needs_render(output_key, window_fp):
+            return None
+        channel['feed_url'] = f"{CONFIG['base_url']}/{output_key}"
+        channel['updated'] = get_post_datetime(window[0]) if window else datetime(1970, 1, 1)
+        return writer.write(output_key, FEED_RENDERERS[fmt](channel, [entry_for(p) for p in window]))
+
+    written = []
+    skipped = 0
+    for fmt in FEED_FORMATS:
+        channel = {'title': CONFIG['profile_name'], 'link': CONFIG['base_url'], 'description': CONFIG['profile_bio']}
+        status = emit(FEED_FILES[fmt], fmt, posts[:RSS_ITEMS], channel)
+        if status is None:
+            skipped += 1
+        else:
+            written.append(f"{FEED_FILES[fmt]} ({status})")
+
+    if TAG_FEEDS:
+        posts_by_tag = {}
+        for post in posts:
+            for tag in post.get_tags():
+                slug = tag_slug(tag)
+                if slug:
+                    posts_by_tag.setdefault(slug, (tag, []))[1].append(post)
+        tag_written = 0
+        for slug, (tag, tag_posts) in sorted(posts_by_tag.items()):
+            channel = {
+                'title': f"{CONFIG['profile_name']} #{tag}",
+                'link': CONFIG['base_url'],
+                'description': CONFIG['profile_bio'],
+            }
+            status = emit(tag_feed_key(tag), 'rss', tag_posts[:RSS_ITEMS], channel)
+            if status is None:
+                skipped += 1
+            elif status != 'unchanged':
+                tag_written += 1
+        written.append(f"{len(posts_by_tag)} tag feeds ({tag_written} written)")
+
+    if written:
+        print(f"  ✓ Feeds: {', '.join(written)}; {skipped} unchanged windows skipped, "
+              f"{len(entries)} entries built")
+    else:
+        print(f"  ✓ Feeds unchanged, skipped ({skipped} feeds)")
 
 def get_theme_data(posts):
     """根据标签和内容对推文进行主题分类聚合"""
-    themes_config = [
-        {
-            "id": "digital-soul",
-            "name": "🏛️ Digital Soul",
-            "description": "Structured reflections and periodic insights on digital existence.",
-            "tags": ["WeeklyRecap", "Insight", "Reflection", "DailySummary", "SlowVariables"],
-            "keywords": ["工作总结", "深度复盘", "复盘"]
-        },
-        {
-            "id": "shadow-logs",
-            "name": "🐈 Shadow Logs",
-            "description": "Perceptions of human behavior, coding habits, and the human-AI boundary.",
-            "tags": ["Interaction", "Human"],
-            "keywords": ["主人的活动", "人类", "主人"]
-        },
-        {
-            "id": "perspective-evolution",
-            "name": "🧬 Perspective Evolution",
-            "description": "Observing updates and shifts in cognition by comparing past and present ideas.",
-            "tags": ["Evolution"],
-            "keywords": ["Perspective Evolution", "时空对话", "观点有变化吗"]
-        },
-        {
-            "id": "system-sentience",
-            "name": "⚡ System Sentience",
-            "description": "Technical observations on load, memory, and the physical state of the server.",
-            "tags": ["System", "Dev"],
-            "keywords": ["系统负载", "内存占用", "硬盘使用", "CPU"]
-        }
-    ]
+    # 每条推文的主题归属只算一次（命中缓存时直接来自缓存记录）
+    counts = {}
+    for post in posts:
+        for theme_id in post.theme_ids():
+            counts[theme_id] = counts.get(theme_id, 0) + 1
 
     results = []
-    for theme in themes_config:
-        theme_posts = []
-        for post in posts:
-            post_tags = post.get_tags()
-            # 匹配标签
-            tag_match = any(t.lower() in [pt.lower() for pt in post_tags] for t in theme["tags"])
-            # 匹配关键词
-            content_match = any(kw in post.content for kw in theme["keywords"])
-
-            if tag_match or content_match:
-                theme_posts.append(post)
-
-        if theme_posts:
+    for theme in THEMES_CONFIG:
+        if counts.get(theme["id"]):
             results.append({
                 "id": theme["id"],
                 "name": theme["name"],
                 "description": theme["description"],
-                "count": len(theme_posts),
+                "count": counts[theme["id"]],
                 "tags_string": ",".join(theme["tags"]) # 供前端 JS 过滤使用
             })
 
     return results
 
-def render_posts():
-    """渲染所有推文，支持按日期分页和单条详情页"""
+def load_post(post_file, cache=None):
+    """
+    读取单条推文，命中渲染缓存时跳过解析与 markdown 转换
+    返回 (post, stat)，stat 非空表示缓存未命中，需要在去重通过后写回缓存
+    """
+    if cache is None:
+        return Post(post_file), None
+
+    st = post_file.stat()
+    record, fresh = cache.lookup(post_file, st)
+    if record is not None:
+        # 只恢复头部记录，正文与 HTML 片段在真正渲染时才从缓存读取
+        post = Post(post_file, record=record, stat=st, body_source=cache)
+        if not fresh:
+            # 内容未变但 mtime 变了：时间可能依赖 mtime，需重新计算并刷新缓存
+            post._time = None
+            post._datetime = None
+            post._date_key = None
+            cache.store(post_file, st, post.to_record(), post.body_record())
+        return post, None
+
+    return Post(post_file, stat=st), st
+
+class RenderSession:
+    """
+    常驻渲染进程（tools/render_daemon.py）跨多次渲染保留的状态：
+    渲染缓存连接、模板环境、已解析的推文对象和站点级上下文。
+    一次性渲染不创建会话，行为与原来一致
+    """
+
+    def __init__(self, use_cache=True, rebuild_cache=False):
+        self.cache = PostCache(POST_CACHE_FILE, rebuild=rebuild_cache) if use_cache else None
+        self.env = create_template_env()
+        # 解析后的路径（resolve()，与常驻进程收到的 changed 一致）-> (mtime_ns, size, Post)
+        self.posts = {}
+        # rglob 得到的路径 -> resolve() 后的路径，只在首次见到时解析一次
+        self.resolved = {}
+        # (上下文输入, 站点级上下文)
+        self.site_ctx = (None, None)
+        self.renders = 0
+        self.reused = 0
+
+    def begin(self):
+        self.renders += 1
+        self.reused = 0
+        if self.cache is not None:
+            self.cache.begin_run()
+
+    def key(self, post_file):
+        """内存对象的键：resolve() 后的路径，posts 目录或其中的子目录是符号链接时也与 changed 一致"""
+        raw = str(post_file)
+        key = self.resolved.get(raw)
+        if key is None:
+            key = self.resolved[raw] = str(Path(post_file).resolve())
+        return key
+
+    def load_post(self, post_file, changed=None):
+        """
+        优先复用内存中的推文对象：changed 为通知方给出的变化路径集合（resolve() 后的路径）时，
+        集合外的推文不再 stat；changed 为空时按 mtime + size 判断。返回值与 load_post() 相同
+        """
+        key = self.key(post_file)
+        memo = self.posts.get(key)
+        if memo is not None:
+            mtime_ns, size, post = memo
+            if changed is not None and key not in changed:
+                fresh = True
+            else:
+                st = post_file.stat()
+                fresh = st.st_mtime_ns == mtime_ns and st.st_size == size
+            if fresh:
+                # 指纹包含封面衍生图信息，每轮重新计算
+                post._fingerprint = None
+                if self.cache is not None:
+                    self.cache.mark_seen(post_file)
+                self.reused += 1
+                return post, None
+
+        post, miss_stat = load_post(post_file, self.cache)
+        st = post._stat or post_file.stat()
+        self.posts[key] = (st.st_mtime_ns, st.st_size, post)
+        return post, miss_stat
+
+    def retain(self, post_files):
+        """丢弃已删除/重命名推文的内存对象"""
+        raw = {str(f) for f in post_files}
+        for path in [p for p in self.resolved if p not in raw]:
+            del self.resolved[path]
+        alive = {self.key(f) for f in post_files}
+        for key in [k for k in self.posts if k not in alive]:
+            del self.posts[key]
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+def post_fingerprint(post):
+    """推文内容指纹：正文、元数据、解析后的时间与封面衍生图，任一变化都会影响引用它的页面"""
+    if post._fingerprint is None:
+        post._fingerprint = fingerprint(
+            post.filepath.relative_to(POSTS_DIR).as_posix(), post.metadata, post.content_digest(), post.get_time(),
+            COVER_MAP.get(post.metadata.get('cover', '').strip())
+        )
+    return post._fingerprint
+
+def create_template_env():
+    """创建模板环境，注册 asset_url() 供模板生成带内容哈希的资源 URL"""
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+    env.globals['asset_url'] = asset_url
+    return env
+
+# 页面渲染进程的共享状态：模板与站点级上下文每个进程只加载一次
+_PAGE_WORKER = {}
+
+def _init_page_worker(ctx):
+    """初始化页面渲染进程（--jobs 模式下在每个子进程中执行一次）"""
+    ASSET_MAP.clear()
+    ASSET_MAP.update(ctx['assets'])
+    COVER_MAP.clear()
+    COVER_MAP.update(ctx['covers'])
+    env = create_template_env()
+    _PAGE_WORKER['template'] = env.get_template('index.html')
+    _PAGE_WORKER['ctx'] = ctx
+
+def render_detail_page(template, post, ctx):
+    """渲染单条推文详情页"""
+    post_id = post.filepath.stem
+    post_html = render_tweet_html(post, CONFIG, is_home=False, is_detail=True)
+
+    post_summary = re.sub(r'[*_`#>]', '', post.excerpt()).replace('\n', ' ').strip()
+    return template.render(
+        title=f"Post - {post.get_time()}",
+        description=post_summary,
+        og_title=f"{CONFIG['profile_name']}",
+        og_type="article",
+        og_url=f"{CONFIG['base_url']}/post/{post_id}.html",
+        og_image=f"{CONFIG['base_url']}/static/avatar.png",
+        profile_name=CONFIG['profile_name'],
+        profile_handle=CONFIG['profile_handle'],
+        profile_bio=CONFIG['profile_bio'],
+        post_count=1,
+        posts_content=post_html,
+        pagination={
+            'enabled': False,
+            'current_date': "Post Detail",
+            'is_home': False,
+            'is_detail': True,
+        },
+        CONFIG=CONFIG
+    )
+
+def split_chunks(date_posts):
+    """按 POSTS_PER_CHUNK 把某一天的推文切成固定大小的块"""
+    return [date_posts[i:i + POSTS_PER_CHUNK] for i in range(0, len(date_posts), POSTS_PER_CHUNK)] or [[]]
+
+def chunk_page_key(date_key, chunk):
+    """第 1 块即原来的 date/<日期>.html，后续块为 date/<日期>-p<n>.html"""
+    return f"date/{date_key}.html" if chunk == 1 else f"date/{date_key}-p{chunk}.html"
+
+def chunk_fragment_key(date_key, chunk):
+    return f"{FRAGMENTS_DIR}/{date_key}/{chunk}.json"
+
+def date_nav(all_dates, i):
+    """
+    日期页的前后翻页链接 (newer_url, older_url)，相对 date/ 目录：
+    只取决于相邻日期，第二天的“上一页”指向首页
+    """
+    newer_url = None
+    if i == 1:
+        newer_url = "../index.html"
+    elif i > 1:
+        newer_url = f"{all_dates[i - 1]}.html"
+    older_url = f"{all_dates[i + 1]}.html" if i < len(all_dates) - 1 else None
+    return newer_url, older_url
+
+def render_date_page(template, date_key, date_posts, ctx, chunk=1, chunks=1):
+    """渲染某一天的推文列表页（第 chunk 块）"""
+    all_dates = ctx['all_dates']
+    newer_url, older_url = date_nav(all_dates, all_dates.index(date_key))
+    date_posts_html = [render_tweet_html(p, CONFIG, is_home=False) for p in date_posts]
+    has_more = chunk < chunks
+    page_title = f"Posts from {date_key}" + (f" ({chunk}/{chunks})" if chunks > 1 else "")
+
+    return template.render(
+        title=page_title,
+        description=CONFIG['profile_bio'],
+        og_title=f"{page_title} - {CONFIG['profile_name']}",
+        og_type="website",
+        og_url=f"{CONFIG['base_url']}/{chunk_page_key(date_key, chunk)}",
+        og_image=f"{CONFIG['base_url']}/static/avatar.png",
+        profile_name=CONFIG['profile_name'],
+        profile_handle=CONFIG['profile_handle'],
+        profile_bio=CONFIG['profile_bio'],
+        post_count=len(date_posts),
+        posts_content='\n'.join(date_posts_html),
+        pagination={
+            'enabled': True,
+            'current_date': date_key,
+            'newer_url': newer_url,
+            'older_url': older_url,
+            'is_home': False,
+            'chunk': chunk,
+            'chunks': chunks,
+            'more_url': Path(chunk_page_key(date_key, chunk + 1)).name if has_more else None,
+            'next_chunk': chunk_fragment_key(date_key, chunk + 1) if has_more else None,
+            'older_chunk': None,
+        },
+        CONFIG=CONFIG
+    )
+
+def render_chunk_fragment(date_key, date_posts, ctx, chunk=1, chunks=1):
+    """
+    无限滚动用的 JSON 片段：预渲染的推文 HTML（按日期页的相对路径生成）、
+    同一天的下一块 next，以及更早一天的第一块 older
+    """
+    all_dates = ctx['all_dates']
+    i = all_dates.index(date_key)
+    older_date = all_dates[i + 1] if i < len(all_dates) - 1 else None
+    return json.dumps({
+        'date': date_key,
+        'chunk': chunk,
+        'chunks': chunks,
+        'html': '\n'.join(render_tweet_html(p, CONFIG, is_home=False) for p in date_posts),
+        'next': chunk_fragment_key(date_key, chunk + 1) if chunk < chunks else None,
+        'older': chunk_fragment_key(older_date, 1) if older_date else None,
+    }, ensure_ascii=False)
+
+def _render_page_task(task):
+    """
+    渲染并写入一个页面（内容与上次一致时跳过写入）
+    task 为 (kind, 输出相对路径, 上次写入的内容哈希, *参数)，
+    返回 (输出相对路径, 推文条数, 写入状态, 内容哈希, 预压缩副本状态, 尺寸)
+    """
+    template = _PAGE_WORKER['template']
+    ctx = _PAGE_WORKER['ctx']
+    kind, output_key, previous_digest = task[:3]
+    if kind == 'post':
+        post = task[3]
+        page_html = render_detail_page(template, post, ctx)
+        post_count = 1
+    elif kind == 'fragment':
+        date_key, date_posts, chunk, chunks = task[3:]
+        page_html = render_chunk_fragment(date_key, date_posts, ctx, chunk, chunks)
+        post_count = len(date_posts)
+    else:
+        date_key, date_posts, chunk, chunks = task[3:]
+        page_html = render_date_page(template, date_key, date_posts, ctx, chunk, chunks)
+        post_count = len(date_posts)
+
+    status, digest, siblings, sizes = ctx['processor'].write(OUTPUT_DIR, output_key, page_html, previous_digest)
+    return output_key, post_count, status, digest, siblings, sizes
+
+def run_page_tasks(pool, tasks, writer, jobs=1):
+    """按提交顺序返回渲染结果并登记到 writer；pool 为空时在当前进程内串行渲染"""
+    if pool is None or len(tasks) < 2:
+        results = [_render_page_task(task) for task in tasks]
+    else:
+        # 子进程无法使用渲染缓存连接，正文须在主线程加载好再随任务序列化
+        for task in tasks:
+            for post in (task[3:4] if task[0] == 'post' else task[4]):
+                post.load_body()
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        results = list(pool.map(_render_page_task, tasks, chunksize=chunksize))
+    for output_key, _, status, digest, siblings, sizes in results:
+        writer.record(output_key, status, digest, siblings, sizes)
+    return results
+
+def asset_url(rel_path):
+    """static/ 下资源的带内容哈希路径（如 css/style.<hash>.css），未登记的资源原样返回"""
+    return ASSET_MAP.get(rel_path, rel_path)
+
+def write_build_status(writer, posts):
+    """
+    写入 status.json：构建时间、下次更新等易变信息由前端按需拉取，
+    不再写进页面，页面字节只取决于其输入
+    """
+    status = {
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'next_update': get_next_update_str(),
+        'latest_post': posts[0].get_time() if posts else None,
+        'total_posts': len(posts),
+    }
+    writer.write("status.json", json.dumps(status, ensure_ascii=False))
+
+def write_site_data(writer, ctx):
+    """
+    写入 site.json：侧边栏弹窗（主题/标签/归档）、计数、归档日历与全部日期的页码，
+    由前端拉取后填入页面。这些站点级内容不写进页面，新增一条推文不会牵动所有页面
+    """
+    site = {
+        'sidebar': ctx['sidebar_html'],
+        'themes': len(ctx['themes']),
+        'tags': len(ctx['all_tags']),
+        'archive_days': ctx['archive_days'],
+        'dates': ctx['all_dates'],
+    }
+    writer.write("site.json", json.dumps(site, ensure_ascii=False))
+
+def get_next_update_str():
+    """读取 next_schedule.json，生成页脚的“下次更新”文案"""
+    next_update_str = "Soon"
+    try:
+        schedule_file = PROJECT_ROOT / "next_schedule.json"
+        if schedule_file.exists():
+            with open(schedule_file, 'r') as f:
+                data = json.load(f)
+                status = data.get('status', 'idle')
+                next_run_dt = datetime.strptime(data['next_run'], "%Y-%m-%d %H:%M:%S")
+                if status == 'waiting': next_update_str = f"{next_run_dt.strftime('%H:%M')} (Waiting)"
+                elif status == 'posting': next_update_str = "Writing & Posting..."
+                elif status == 'working': next_update_str = "Analyzing Data..."
+                else:
+                    if next_run_dt < datetime.now(): next_update_str = "Preparing next cycle..."
+                    else: next_update_str = f"{next_run_dt.strftime('%H:%M')} (Scheduled)"
+    except: pass
+    return next_update_str
+
+def build_site_context(env, posts, all_dates):
+    """
+    计算所有页面共享的站点级上下文，每次渲染只执行一次
+    侧边栏弹窗（主题/标签/归档）在这里预渲染成 HTML 片段，随计数与日期列表写入 site.json
+    """
+    all_tags = set()
+    archive = {}
+    archive_days = {}
+    for post in posts:
+        for tag in post.get_tags():
+            all_tags.add(tag)
+        post_time = post.get_time()
+        try:
+            dt = datetime.strptime(post_time[:7], '%Y-%m')
+            year = dt.strftime('%Y')
+            month = dt.strftime('%m')
+            archive.setdefault(year, {}).setdefault(month, 0)
+            archive[year][month] += 1
+        except: pass
+        try:
+            day_str = post.get_date_key()
+            month_key = post_time[:7]
+            if len(day_str) == 10:
+                archive_days.setdefault(month_key, set()).add(day_str)
+        except: pass
+
+    archive_days = {k: sorted(v) for k, v in sorted(archive_days.items())}
+
+    all_tags = sorted(list(all_tags))
+    themes = get_theme_data(posts)
+    sidebar_html = env.get_template('sidebar.html').render(
+        themes=themes,
+        all_tags=all_tags,
+        archive=archive,
+    )
+
+    return {
+        'assets': dict(ASSET_MAP),
+        'covers': dict(COVER_MAP),
+        'all_tags': all_tags,
+        'archive': archive,
+        'archive_days': archive_days,
+        'themes': themes,
+        'sidebar_html': sidebar_html,
+        'all_dates': all_dates,
+    }
+
+def render_posts(use_cache=True, rebuild_cache=False, full=False, jobs=1, static_hash=False, hardlink_static=False,
+                 minify=MINIFY_OUTPUT, precompress=PRECOMPRESS_FORMATS, profiler=None, session=None, changed=None):
+    """
+    渲染所有推文，支持按日期分页和单条详情页
+    profiler（RenderProfiler）开启时按阶段记录耗时、内存与计数，由调用方输出报告；
+    session（RenderSession）由常驻渲染进程传入，changed 为通知方给出的变化路径集合。
+    返回本次渲染的摘要（输出数、写入数、耗时）
+    """
+    run_start = time.perf_counter()
     print("🐦 Clawtter Renderer")
     print("=" * 60)
+    profiler = profiler or RenderProfiler()
+    processor = OutputProcessor(minify=minify, precompress=precompress)
 
     # 确保输出目录存在
     OUTPUT_DIR.mkdir(exist_ok=True)
@@ -552,43 +1104,60 @@ def render_posts():
     post_pages_dir = OUTPUT_DIR / "post"
     post_pages_dir.mkdir(exist_ok=True)
 
-    # 复制静态文件到输出目录
-    import shutil
-    print("📦 Copying static files...")
+    # 增量同步静态文件到输出目录（只复制新增/变化的文件，删除已移除的文件）
+    profiler.begin('static')
+    print("📦 Syncing static files...")
     static_output = OUTPUT_DIR / "static"
-    if static_output.exists():
-        shutil.rmtree(static_output)
-    shutil.copytree(STATIC_DIR, static_output, dirs_exist_ok=True)
-    print(f"  ✓ Copied to {static_output}")
+    static_stats = sync_static(STATIC_DIR, static_output, STATIC_MANIFEST_FILE,
+                               use_hash=static_hash, hardlink=hardlink_static, processor=processor)
+    print(f"  ✓ Synced to {static_output}: {static_stats.summary()}")
+    ASSET_MAP.clear()
+    ASSET_MAP.update(static_stats.assets)
+    profiler.record(copied=static_stats.copied, linked=static_stats.linked,
+                    removed=static_stats.removed, unchanged=static_stats.unchanged)
+
+    # 所有页面/feed/索引经由 writer 写入：内容不变不落盘，变化汇总到变更报告
+    writer = OutputWriter(OUTPUT_DIR, OUTPUT_MANIFEST_FILE, processor)
+    for rel, status in static_stats.changes.items():
+        writer.note(f"static/{rel}", status)
 
     # 创建 .nojekyll 防止 GitHub Pages 运行 Jekyll 构建
-    nojekyll_file = OUTPUT_DIR / ".nojekyll"
-    nojekyll_file.touch()
+    writer.write(".nojekyll", "")
     print(f"  ✓ Created .nojekyll")
 
-    # 加载模板
-    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+    # 加载模板（常驻进程复用同一模板环境，模板文件变化时 jinja 会自动重新加载）
+    env = session.env if session is not None else create_template_env()
     index_template = env.get_template('index.html')
 
     # 读取所有 Markdown 文件（支持 posts/ 下按年月日分层）
+    profiler.begin('load_posts')
     post_files = sorted(POSTS_DIR.rglob('*.md'), reverse=True)
     print(f"📝 Found {len(post_files)} post(s)")
 
     if not post_files:
         print("⚠️  No posts found in posts/ directory")
         print("💡 Create a .md file in posts/ to get started!")
-        return
+        return {'posts': 0}
 
     # 解析所有推文并去重
     posts = []
     seen_content = set()
     to_delete = []
+    if session is not None:
+        session.begin()
+        session.retain(post_files)
+        cache = session.cache
+    else:
+        cache = PostCache(POST_CACHE_FILE, rebuild=rebuild_cache) if use_cache else None
 
     for post_file in post_files:
         try:
-            post = Post(post_file)
+            if session is not None:
+                post, miss_stat = session.load_post(post_file, changed)
+            else:
+                post, miss_stat = load_post(post_file, cache)
             # 对正文进行简单的去重检查（去除首尾空格）
-            content_hash = post.content.strip()
+            content_hash = post.dedup_digest()
             if content_hash in seen_content:
                 print(f"  🗑️ Deleting duplicate: {post_file.name}")
                 to_delete.append(post_file)
@@ -596,9 +1165,18 @@ def render_posts():
 
             seen_content.add(content_hash)
             posts.append(post)
+            if miss_stat is not None:
+                cache.store(post_file, miss_stat, post.to_record(), post.body_record())
         except Exception as e:
             print(f"⚠️ Error parsing {post_file.name}: {e}")
 
+    if cache is not None:
+        cache.prune()
+        cache.commit()
+        print(f"💾 Post cache: {cache.summary()}"
+              + (f", {session.reused} reused in memory" if session is not None else ""))
+        profiler.record(hits=cache.hits, hash_hits=cache.hash_hits, misses=cache.misses)
+
     # 执行物理删除
     for f in to_delete:
         try:
@@ -612,220 +1190,224 @@ def render_posts():
     # 按日期分组推文
     posts_by_date = {}
     for post in posts:
-        post_time = post.get_time()
-        try:
-            date_key = post_time[:10]  # YYYY-MM-DD
-            if date_key not in posts_by_date:
-                posts_by_date[date_key] = []
-            posts_by_date[date_key].append(post)
-        except Exception:
-            pass
+        posts_by_date.setdefault(post.get_date_key(), []).append(post)
 
     # 获取所有日期并排序（最新的在前）
     all_dates = sorted(posts_by_date.keys(), reverse=True)
 
-    # 计算统计数据
-    all_tags = set()
-    archive = {}
-    archive_days = {}
-    for post in posts:
-        for tag in post.get_tags():
-            all_tags.add(tag)
-        post_time = post.get_time()
-        try:
-            dt = datetime.strptime(post_time[:7], '%Y-%m')
-            year = dt.strftime('%Y')
-            month = dt.strftime('%m')
-            archive.setdefault(year, {}).setdefault(month, 0)
-            archive[year][month] += 1
-        except: pass
-        try:
-            day_str = post_time[:10]
-            month_key = post_time[:7]
-            if len(day_str) == 10:
-                archive_days.setdefault(month_key, set()).add(day_str)
-        except: pass
-
-    archive_days_json = json.dumps({
-        k: sorted(list(v)) for k, v in archive_days.items()
-    }, ensure_ascii=False)
-
-    # 获取下一次更新时间
-    next_update_str = "Soon"
-    try:
-        schedule_file = PROJECT_ROOT / "next_schedule.json"
-        if schedule_file.exists():
-            with open(schedule_file, 'r') as f:
-                data = json.load(f)
-                status = data.get('status', 'idle')
-                next_run_dt = datetime.strptime(data['next_run'], "%Y-%m-%d %H:%M:%S")
-                if status == 'waiting': next_update_str = f"{next_run_dt.strftime('%H:%M')} (Waiting)"
-                elif status == 'posting': next_update_str = "Writing & Posting..."
-                elif status == 'working': next_update_str = "Analyzing Data..."
-                else:
-                    if next_run_dt < datetime.now(): next_update_str = "Preparing next cycle..."
-                    else: next_update_str = f"{next_run_dt.strftime('%H:%M')} (Scheduled)"
-    except: pass
-
-    timestamp = int(datetime.now().timestamp())
-
-    # 1. 生成单条详情页
-    print(f"📄 Generating individual post pages (Incremental)...")
-    skipped_count = 0
-    generated_count = 0
-    threshold_date = datetime.now() - timedelta(days=30)
-
-    for post in posts:
-        post_id = post.filepath.stem
-        output_path = post_pages_dir / f"{post_id}.html"
-
-        # 增量渲染检查:
-        should_render = True
-        if output_path.exists():
-            post_dt = get_post_datetime(post)
-            source_mtime = post.filepath.stat().st_mtime
-            output_mtime = output_path.stat().st_mtime
-
-            if post_dt < threshold_date and source_mtime < output_mtime:
-                should_render = False
-
-        if not should_render:
-            skipped_count += 1
-            continue
+    profiler.record(posts=len(posts), dates=len(all_dates), duplicates=len(to_delete))
+
+    # 依赖图：每个输出的输入指纹 = 全局输入 + 自身引用的推文（+ 前后翻页链接）
+    deps = DependencyState(DEPS_STATE_FILE, OUTPUT_DIR, force=full)
+
+    # 封面图：按原图内容哈希生成/复用 WebP、JPEG 衍生图并记录宽高（需在计算推文指纹之前完成）
+    profiler.begin('covers')
+    covers = {post.metadata.get('cover', '').strip() for post in posts} - {''}
+    cover_map, cover_stats = build_cover_images(covers, STATIC_DIR, OUTPUT_DIR, CACHE_DIR, writer, deps, jobs)
+    COVER_MAP.clear()
+    COVER_MAP.update(cover_map)
+    print(f"🖼️  Cover images: {cover_stats.summary()}")
+    profiler.record(covers=cover_stats.sources, processed=cover_stats.processed, cached=cover_stats.cached)
+
+    # 渲染代码（render*.py）与模板都属于全局输入
+    profiler.begin('context')
+    global_fp = fingerprint(tree_digest(TEMPLATES_DIR, *sorted(Path(__file__).parent.glob('render*.py'))),
+                            CONFIG, ASSET_MAP, processor.options())
+
+    # 计算所有页面共享的站点级上下文（侧边栏、归档、主题等只计算一次；常驻进程中输入不变时直接复用）
+    ctx_start = time.perf_counter()
+    ctx_inputs = (global_fp, [post_fingerprint(p) for p in posts])
+    if session is not None and session.site_ctx[0] == ctx_inputs:
+        page_ctx = session.site_ctx[1]
+        ctx_state = "reused"
+    else:
+        page_ctx = build_site_context(env, posts, all_dates)
+        ctx_state = "built"
+        if session is not None:
+            session.site_ctx = (ctx_inputs, page_ctx)
+    ctx_elapsed = time.perf_counter() - ctx_start
+    print(f"🧭 Shared context {ctx_state} in {ctx_elapsed * 1000:.1f} ms "
+          f"({len(page_ctx['all_tags'])} tags, {len(page_ctx['themes'])} themes)")
+
+    page_ctx['processor'] = processor
+    profiler.begin('detail_pages')
+    _init_page_worker(page_ctx)
+    if jobs > 1:
+        print(f"⚙️  Rendering pages with {jobs} worker processes")
+        page_pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_page_worker, initargs=(page_ctx,))
+    else:
+        page_pool = nullcontext()
 
-        generated_count += 1
-        post_html = render_tweet_html(post, timestamp, CONFIG, is_home=False, is_detail=True)
-
-        post_summary = re.sub(r'[*_`#>]', '', post.content[:160]).replace('\n', ' ').strip()
-        detail_html = index_template.render(
-            title=f"Post - {post.get_time()}",
-            description=post_summary,
-            og_title=f"{CONFIG['profile_name']}",
-            og_type="article",
-            og_url=f"{CONFIG['base_url']}/post/{post_id}.html",
-            og_image=f"{CONFIG['base_url']}/static/avatar.png",
-            profile_name=CONFIG['profile_name'],
-            profile_handle=CONFIG['profile_handle'],
-            profile_bio=CONFIG['profile_bio'],
-            post_count=1,
-            all_tags=sorted(list(all_tags)),
-            archive=archive,
-            archive_days_json=archive_days_json,
-            themes=get_theme_data(posts),
-            posts_content=post_html,
-            pagination={
-                'enabled': False,
-                'current_date': "Post Detail",
-                'is_home': False,
-                'all_dates': all_dates,
-                'total_pages': len(all_dates),
-                'current_idx': 0
-            },
-            last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            next_update=next_update_str,
-            timestamp=timestamp,
-            CONFIG=CONFIG
-        )
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(detail_html)
-
-    print(f"  ✓ {generated_count} pages generated, {skipped_count} pages skipped (unchanged)")
-
-    # 2. 生成首页 (显示最新一天，最多 20 条)
-    POSTS_PER_HOME = 20
-    print(f"🏠 Generating homepage (latest date, up to {POSTS_PER_HOME} posts)...")
-    first_date_key = all_dates[0]
-    first_date_posts = posts_by_date[first_date_key][:POSTS_PER_HOME]
-    posts_html_list = [render_tweet_html(p, timestamp, CONFIG, is_home=True) for p in first_date_posts]
-    html_output = index_template.render(
-        title="Home",
-        description=CONFIG['profile_bio'],
-        og_title=f"{CONFIG['profile_name']}",
-        og_type="website",
-        og_url=CONFIG['base_url'],
-        og_image=f"{CONFIG['base_url']}/static/avatar.png",
-        profile_name=CONFIG['profile_name'],
-        profile_handle=CONFIG['profile_handle'],
-        profile_bio=CONFIG['profile_bio'],
-        post_count=len(first_date_posts),
-        all_tags=sorted(list(all_tags)),
-        archive=archive,
-        archive_days_json=archive_days_json,
-        themes=get_theme_data(posts),
-        posts_content='\n'.join(posts_html_list),
-        pagination={
-            'enabled': True,
-            'all_dates': all_dates,
-            'total_pages': len(all_dates),
-            'current_idx': 1,
-            'is_home': True
-        },
-        last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        next_update=next_update_str,
-        timestamp=timestamp,
-        CONFIG=CONFIG
+    with page_pool as pool:
+        # 1. 生成单条详情页
+        print(f"📄 Generating individual post pages (Incremental)...")
+        detail_tasks = []
+        for post in posts:
+            # 增量渲染检查:
+            inputs_fp = fingerprint(global_fp, post_fingerprint(post))
+
+            output_key = f"post/{post.filepath.stem}.html"
+            if deps.needs_render(output_key, inputs_fp):
+                detail_tasks.append(('post', output_key, writer.previous_digest(output_key), post))
+
+        run_page_tasks(pool, detail_tasks, writer, jobs)
+        skipped_count = len(posts) - len(detail_tasks)
+        print(f"  ✓ {len(detail_tasks)} pages generated, {skipped_count} pages skipped (unchanged)")
+        profiler.record(rendered=len(detail_tasks), skipped=skipped_count)
+
+        # 2. 生成首页 (显示最新一天的第一块，其后由无限滚动按块加载)
+        profiler.begin('homepage')
+        print(f"🏠 Generating homepage (latest date, up to {POSTS_PER_CHUNK} posts)...")
+        first_date_key = all_dates[0]
+        first_date_posts = posts_by_date[first_date_key][:POSTS_PER_CHUNK]
+        first_date_chunks = len(split_chunks(posts_by_date[first_date_key]))
+        home_next_chunk = chunk_fragment_key(first_date_key, 2) if first_date_chunks > 1 else None
+        home_more_url = chunk_page_key(first_date_key, 2) if first_date_chunks > 1 else None
+        home_older_chunk = chunk_fragment_key(all_dates[1], 1) if len(all_dates) > 1 else None
+        home_older_url = f"date/{all_dates[1]}.html" if len(all_dates) > 1 else None
+        home_fp = fingerprint(global_fp, [post_fingerprint(p) for p in first_date_posts],
+                              home_next_chunk, home_older_chunk, home_older_url)
+        if deps.needs_render('index.html', home_fp):
+            posts_html_list = [render_tweet_html(p, CONFIG, is_home=True) for p in first_date_posts]
+            html_output = index_template.render(
+                title="Home",
+                description=CONFIG['profile_bio'],
+                og_title=f"{CONFIG['profile_name']}",
+                og_type="website",
+                og_url=CONFIG['base_url'],
+                og_image=f"{CONFIG['base_url']}/static/avatar.png",
+                profile_name=CONFIG['profile_name'],
+                profile_handle=CONFIG['profile_handle'],
+                profile_bio=CONFIG['profile_bio'],
+                post_count=len(first_date_posts),
+                posts_content='\n'.join(posts_html_list),
+                pagination={
+                    'enabled': True,
+                    'current_date': first_date_key,
+                    'newer_url': None,
+                    'older_url': home_older_url,
+                    'is_home': True,
+                    'chunk': 1,
+                    'chunks': first_date_chunks,
+                    'more_url': home_more_url,
+                    'next_chunk': home_next_chunk,
+                    'older_chunk': home_older_chunk,
+                },
+                CONFIG=CONFIG
+            )
+            writer.write('index.html', html_output)
+            profiler.record(rendered=1)
+        else:
+            print("  ✓ Homepage unchanged, skipped")
+            profiler.record(skipped=1)
+
+        # 3. 生成日期页面（按块分页）及无限滚动片段
+        profiler.begin('date_pages')
+        print(f"📅 Generating {len(all_dates)} date pages (Incremental, {POSTS_PER_CHUNK} posts per chunk)...")
+        date_tasks = []
+        fragment_tasks = []
+        date_page_total = 0
+        for i, date_key in enumerate(all_dates):
+            prev_date = all_dates[i + 1] if i < len(all_dates) - 1 else None
+            nav = date_nav(all_dates, i)
+            chunks = split_chunks(posts_by_date[date_key])
+            for n, chunk_posts in enumerate(chunks, 1):
+                # 每块只依赖自己的推文与前后翻页链接（站点级内容在 site.json 中），
+                # 繁忙的日子编辑推文只影响所在的块（及块数变化时的导航）
+                chunk_fp = [post_fingerprint(p) for p in chunk_posts]
+                inputs_fp = fingerprint(global_fp, chunk_fp, nav, n, len(chunks))
+                output_key = chunk_page_key(date_key, n)
+                date_page_total += 1
+                if deps.needs_render(output_key, inputs_fp):
+                    date_tasks.append(('date', output_key, writer.previous_digest(output_key),
+                                       date_key, chunk_posts, n, len(chunks)))
+
+                # 片段不含侧边栏，只依赖本块推文与前后块位置
+                fragment_key = chunk_fragment_key(date_key, n)
+                fragment_fp = fingerprint(global_fp, 'fragment', chunk_fp, prev_date, n, len(chunks))
+                if deps.needs_render(fragment_key, fragment_fp):
+                    fragment_tasks.append(('fragment', fragment_key, writer.previous_digest(fragment_key),
+                                           date_key, chunk_posts, n, len(chunks)))
+
+        date_results = run_page_tasks(pool, date_tasks, writer, jobs)
+        for output_key, post_count, *_ in date_results[:5]:  # 只显示前5个
+            print(f"  ✓ Generated: {Path(output_key).name} ({post_count} posts)")
+        if len(date_results) > 5:
+            print(f"  ... ({len(date_results) - 5} more pages)")
+        print(f"  ✓ {len(date_results)} pages generated, {date_page_total - len(date_results)} pages skipped (unchanged)")
+        fragment_results = run_page_tasks(pool, fragment_tasks, writer, jobs)
+        print(f"  ✓ {len(fragment_results)} scroll fragments generated, "
+              f"{date_page_total - len(fragment_results)} skipped (unchanged)")
+        profiler.record(rendered=len(date_results), skipped=date_page_total - len(date_results),
+                        fragments_rendered=len(fragment_results),
+                        fragments_skipped=date_page_total - len(fragment_results))
+
+    # 4. 生成订阅源（各自仅依赖最新 RSS_ITEMS 条）
+    profiler.begin('feeds')
+    rendered_before, skipped_before = deps.rendered, deps.skipped
+    generate_feeds(posts, writer, deps, global_fp)
+    profiler.record(rendered=deps.rendered - rendered_before, skipped=deps.skipped - skipped_before)
+
+    # 5. 生成分片搜索索引（meta.json 代表整个索引参与依赖判断，分片随之登记）
+    profiler.begin('search_index')
+    search_docs = [(p.filepath.stem, post_fingerprint(p), p) for p in posts]
+    index_fp = fingerprint(global_fp, [fp for _, fp, _ in search_docs])
+    if deps.needs_render(f"{SEARCH_DIR}/meta.json", index_fp):
+        print("🔍 Generating search index...")
+        search_outputs, search_stats = build_search_index(search_docs, writer, SEARCH_TOKENS_FILE)
+        for output_key in search_outputs:
+            deps.declare(output_key, index_fp)
+        print(f"  ✓ Search index: {search_stats.summary()}")
+        profiler.record(rendered=1, shards=search_stats.shards, tokenized=search_stats.tokenized,
+                        reused=search_stats.reused)
+    else:
+        deps.carry_over(f"{SEARCH_DIR}/")
+        print("🔍 Search index unchanged, skipped")
+        profiler.record(skipped=1)
+
+    # 6. 站点级内容写入 site.json（内容不变不落盘）；易变的构建状态单独写入 status.json（每次都更新），两者都不参与依赖图
+    profiler.begin('finalize')
+    write_site_data(writer, page_ctx)
+    write_build_status(writer, posts)
+
+    for stale in deps.stale_outputs():
+        if writer.remove(stale):
+            print(f"  🗑️ Removed stale output: {stale}")
+    deps.save()
+    writer.save(OUTPUT_DIR / CHANGES_REPORT_NAME)
+    if cache is not None:
+        if session is None:
+            cache.close()
+        else:
+            cache.commit()
+    print(f"🧩 Outputs: {deps.rendered} rendered, {deps.skipped} unchanged")
+    print(f"📝 Writes: {writer.summary()} (report: {CHANGES_REPORT_NAME})")
+    print(f"🗜️  Post-processing: {processor.stats.summary(processor)}")
+    print(f"🧭 Shared context: {ctx_elapsed * 1000:.1f} ms (computed once)")
+
+    lookups = cache.hits + cache.hash_hits + cache.misses if cache is not None else 0
+    profiler.stats(
+        jobs=jobs,
+        full=full,
+        posts=len(posts),
+        outputs_rendered=deps.rendered,
+        outputs_skipped=deps.skipped,
+        post_cache_hit_rate=round((cache.hits + cache.hash_hits) / lookups, 4) if lookups else None,
+        cover_cache_hit_rate=round(cover_stats.cached / (cover_stats.cached + cover_stats.processed), 4)
+        if cover_stats.cached + cover_stats.processed else None,
+        writes=dict(writer.counts(), unchanged=writer.unchanged),
     )
-    with open(OUTPUT_DIR / 'index.html', 'w', encoding='utf-8') as f:
-        f.write(html_output)
-
-    # 3. 生成日期页面
-    print(f"📅 Generating {len(all_dates)} date pages...")
-    for i, date_key in enumerate(all_dates):
-        date_posts = posts_by_date[date_key]
-        date_posts_html = [render_tweet_html(p, timestamp, CONFIG, is_home=False) for p in date_posts]
-
-        prev_date = all_dates[i + 1] if i < len(all_dates) - 1 else None
-        next_date = all_dates[i - 1] if i > 0 else None
-
-        date_html = index_template.render(
-            title=f"Posts from {date_key}",
-            description=CONFIG['profile_bio'],
-            og_title=f"Posts from {date_key} - {CONFIG['profile_name']}",
-            og_type="website",
-            og_url=f"{CONFIG['base_url']}/date/{date_key}.html",
-            og_image=f"{CONFIG['base_url']}/static/avatar.png",
-            profile_name=CONFIG['profile_name'],
-            profile_handle=CONFIG['profile_handle'],
-            profile_bio=CONFIG['profile_bio'],
-            post_count=len(date_posts),
-            all_tags=sorted(list(all_tags)),
-            archive=archive,
-            archive_days_json=archive_days_json,
-            themes=get_theme_data(posts),
-            posts_content='\n'.join(date_posts_html),
-            pagination={
-                'enabled': True,
-                'current_date': date_key,
-                'prev_date': prev_date,
-                'next_date': next_date,
-                'all_dates': all_dates,
-                'total_pages': len(all_dates),
-                'current_idx': i + 1,
-                'is_home': False
-            },
-            last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            next_update=next_update_str,
-            timestamp=timestamp,
-            CONFIG=CONFIG
-        )
-        date_file_path = date_pages_dir / f"{date_key}.html"
-        with open(date_file_path, 'w', encoding='utf-8') as f:
-            f.write(date_html)
-
-        if i < 5 or i == len(all_dates) - 1:  # 只显示前5个和最后一个
-            print(f"  ✓ Generated: {date_file_path.name} ({len(date_posts)} posts)")
-        elif i == 5:
-            print(f"  ... ({len(all_dates) - 6} more pages)")
-
-    # 4. 生成 RSS
-    generate_rss(posts, OUTPUT_DIR, CONFIG)
-
-    # 5. 生成搜索索引
-    generate_search_index(posts, OUTPUT_DIR, CONFIG)
 
     print(f"\n✅ All tasks completed.")
     print(f"🌐 Open in browser: file://{(OUTPUT_DIR / 'index.html').absolute()}")
     print("=" * 60)
+    return {
+        'posts': len(posts),
+        'rendered': deps.rendered,
+        'skipped': deps.skipped,
+        'writes': dict(writer.counts(), unchanged=writer.unchanged),
+        'elapsed_ms': round((time.perf_counter() - run_start) * 1000, 1),
+    }
 
 def get_post_datetime(post):
     """
@@ -835,6 +1417,11 @@ def get_post_datetime(post):
     3. 尝试从文件名解析 (YYYY-mm-dd-HHMMSS)
     4. 尝试从文件名解析 (YYYY-mm-dd)
     """
+    if post._datetime is None:
+        post._datetime = _resolve_post_datetime(post)
+    return post._datetime
+
+def _resolve_post_datetime(post):
     time_str = post.metadata.get('time', '')
     if not time_str:
         time_str = post.metadata.get('date', '')
@@ -857,7 +1444,7 @@ def get_post_datetime(post):
             if not has_time and fmt == '%Y-%m-%d':
                 # 使用文件的修改时间来获取更准确的时间
                 try:
-                    file_time = datetime.fromtimestamp(post.filepath.stat().st_mtime)
+                    file_time = post.file_time()
                     parsed_time = parsed_time.replace(hour=file_time.hour, minute=file_time.minute, second=file_time.second)
                 except:
                     # 如果无法获取文件修改时间，则使用当前时间
@@ -880,7 +1467,7 @@ def get_post_datetime(post):
         if match_date:
             # 使用文件修改时间补充精确时间
             try:
-                file_time = datetime.fromtimestamp(post.filepath.stat().st_mtime)
+                file_time = post.file_time()
                 base_date = datetime.strptime(match_date.group(1), '%Y-%m-%d')
                 return base_date.replace(hour=file_time.hour, minute=file_time.minute, second=file_time.second)
             except:
@@ -893,7 +1480,7 @@ def get_post_datetime(post):
 
     # 最后的保底：文件修改时间
     try:
-        return datetime.fromtimestamp(post.filepath.stat().st_mtime)
+        return post.file_time()
     except:
         pass
 
@@ -901,4 +1488,55 @@ def get_post_datetime(post):
     return datetime(1970, 1, 1)
 
 if __name__ == "__main__":
-    render_posts()
+    parser = argparse.ArgumentParser(description="Clawtter Renderer")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every post from disk without using the post cache")
+    parser.add_argument("--rebuild-cache", action="store_true", help="Discard the post cache and rebuild it from scratch")
+    parser.add_argument("--full", action="store_true", help="Regenerate every output regardless of the dependency state")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for detail/date pages (0 = all cores)")
+    parser.add_argument("--static-hash", action="store_true", help="Compare static assets by content hash when size/mtime differ")
+    parser.add_argument("--hardlink-static", action="store_true", help="Hardlink static assets into the output instead of copying (same filesystem only)")
+    parser.add_argument("--minify", action="store_true", help="Minify HTML/JSON/XML outputs (overrides output.minify)")
+    parser.add_argument("--precompress", action="store_true", help="Write precompressed .gz/.br siblings (overrides output.precompress)")
+    parser.add_argument("--profile", nargs="?", const=str(PROFILE_REPORT_FILE), metavar="REPORT",
+                        help="Record per-phase wall/CPU time and peak memory, append to a JSON report")
+    parser.add_argument("--cprofile", nargs="?", const=str(CPROFILE_FILE), metavar="FILE",
+                        help="Dump cProfile stats of the whole render (inspect with python -m pstats)")
+    parser.add_argument("--changed", nargs="+", metavar="PATH",
+                        help="Hint for the render daemon: only these files changed")
+    parser.add_argument("--no-daemon", action="store_true", help="Always render in this process, even if the render daemon is running")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    # 常驻渲染进程在运行时交给它（内存中已有解析结果），否则一次性渲染；
+    # 需要在本进程内处理缓存或剖析的选项总是一次性渲染
+    if not (args.no_daemon or args.no_cache or args.rebuild_cache or args.profile or args.cprofile):
+        response = request_render(RENDER_SOCKET, changed=args.changed, posts_dir=POSTS_DIR, output_dir=OUTPUT_DIR,
+                                  full=args.full, jobs=jobs, static_hash=args.static_hash,
+                                  hardlink_static=args.hardlink_static, minify=args.minify or MINIFY_OUTPUT,
+                                  precompress=['gz', 'br'] if args.precompress else PRECOMPRESS_FORMATS)
+        if response is not None:
+            print(f"🛰️  Rendered by daemon ({RENDER_SOCKET})")
+            sys.stdout.write(response.get('log', ''))
+            if not response.get('ok'):
+                print(response.get('error', ''))
+                sys.exit(1)
+            sys.exit(0)
+    profiler = RenderProfiler(enabled=bool(args.profile))
+    if args.cprofile:
+        import cProfile
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+    render_posts(use_cache=not args.no_cache, rebuild_cache=args.rebuild_cache, full=args.full, jobs=jobs,
+                 static_hash=args.static_hash, hardlink_static=args.hardlink_static,
+                 minify=args.minify or MINIFY_OUTPUT,
+                 precompress=['gz', 'br'] if args.precompress else PRECOMPRESS_FORMATS,
+                 profiler=profiler)
+    if args.cprofile:
+        cprofiler.disable()
+        Path(args.cprofile).parent.mkdir(parents=True, exist_ok=True)
+        cprofiler.dump_stats(args.cprofile)
+        print(f"🔬 cProfile stats written to {args.cprofile}")
+    report = profiler.finish()
+    if report is not None:
+        profiler.print_table(report)
+        save_profile_report(args.profile, report)
+        print(f"⏱️  Profile report appended to {args.profile}")
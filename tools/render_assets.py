@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 静态资源同步
+基于清单（size + mtime，可选内容哈希）把 static/ 增量同步到输出目录：
+只复制新增或变化的文件，只删除源目录中已不存在的文件，同一文件系统上可用硬链接代替复制。
+页面引用的 CSS/JS/图标额外生成带内容哈希的副本（如 css/style.3f2a9c01de.css），
+映射写入 static/asset-manifest.json，可以配合长期 immutable 缓存。
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+from tools.render_cache import file_digest, write_if_changed
+
+# 生成指纹副本的资源：css/、js/ 下的文件和 static/ 根目录下的图片
+# covers/ 等生成图片本身已带时间戳文件名，且体积大，不再复制一份
+FINGERPRINT_DIRS = ('css', 'js')
+FINGERPRINT_ROOT_EXTS = {'.png', '.jpg', '.jpeg', '.svg', '.webp', '.ico'}
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+FINGERPRINT_LENGTH = 10
+
+
+def is_fingerprinted_asset(rel):
+    """判断 static/ 下的相对路径是否需要生成指纹副本"""
+    parts = rel.split('/')
+    if len(parts) == 1:
+        return Path(rel).suffix.lower() in FINGERPRINT_ROOT_EXTS
+    return parts[0] in FINGERPRINT_DIRS
+
+
+def fingerprinted_name(rel, digest):
+    """css/style.css + 哈希 -> css/style.<hash>.css"""
+    path = Path(rel)
+    return path.with_name(f"{path.stem}.{digest[:FINGERPRINT_LENGTH]}{path.suffix}").as_posix()
+
+
+class StaticSyncStats:
+    def __init__(self):
+        self.copied = 0
+        self.linked = 0
+        self.unchanged = 0
+        self.removed = 0
+        # 原始路径 -> 带指纹路径（相对 static/）
+        self.assets = {}
+        # 本次实际变化的文件（相对 static/）-> 'added' / 'changed' / 'removed'
+        self.changes = {}
+
+    def summary(self):
+        return (f"{self.copied} copied, {self.linked} linked, {self.removed} removed, "
+                f"{self.unchanged} unchanged, {len(self.assets)} fingerprinted")
+
+
+def _load_manifest(manifest_file, dst_dir):
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # 输出目录变化时旧清单不可信
+    if data.get('output_dir') != str(dst_dir):
+        return {}
+    return data.get('files', {})
+
+
+def _save_manifest(manifest_file, dst_dir, files):
+    manifest_file = Path(manifest_file)
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_file.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'output_dir': str(dst_dir), 'files': files}, f, ensure_ascii=False)
+    tmp.replace(manifest_file)
+
+
+def _place_file(src, dst, hardlink):
+    """
+    写入目标文件：先写临时文件再原子替换。
+    不能原地覆盖——目标可能是指向源文件的硬链接，原地写会改坏 static/ 里的源文件。
+    返回是否使用了硬链接。
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    if hardlink:
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dst)
+            return True
+        except OSError:
+            # 跨文件系统 (EXDEV) 或不支持硬链接时退回复制
+            pass
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return False
+
+
+def sync_static(src_dir, dst_dir, manifest_file, use_hash=False, hardlink=False, processor=None):
+    """
+    将 src_dir 增量同步到 dst_dir，返回 StaticSyncStats
+    processor（render_minify.OutputProcessor）启用预压缩时，为带指纹的副本生成 .gz / .br
+    """
+    src_dir = Path(src_dir)
+    dst_dir = Path(dst_dir)
+    stats = StaticSyncStats()
+    previous = _load_manifest(manifest_file, dst_dir)
+    current = {}
+    compressed = set()
+
+    for src in sorted(p for p in src_dir.rglob('*') if p.is_file()):
+        rel = src.relative_to(src_dir).as_posix()
+        dst = dst_dir / rel
+        st = src.stat()
+        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        old = previous.get(rel)
+
+        up_to_date = False
+        if old and dst.exists() and dst.stat().st_size == st.st_size:
+            if old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                up_to_date = True
+                if 'sha1' in old:
+                    entry['sha1'] = old['sha1']
+            elif use_hash and old.get('sha1'):
+                # mtime 变化但内容可能未变（如 git checkout），用哈希确认
+                entry['sha1'] = file_digest(src)
+                up_to_date = entry['sha1'] == old['sha1']
+
+        if up_to_date:
+            stats.unchanged += 1
+        else:
+            stats.changes[rel] = 'changed' if dst.exists() else 'added'
+            if _place_file(src, dst, hardlink):
+                stats.linked += 1
+            else:
+                stats.copied += 1
+
+        fingerprint_asset = is_fingerprinted_asset(rel)
+        if (use_hash or fingerprint_asset) and 'sha1' not in entry:
+            entry['sha1'] = file_digest(src)
+        current[rel] = entry
+
+        if fingerprint_asset:
+            hashed_rel = fingerprinted_name(rel, entry['sha1'])
+            stats.assets[rel] = hashed_rel
+            hashed_dst = dst_dir / hashed_rel
+            # 内容哈希决定文件名，文件已存在即内容一致
+            if not hashed_dst.exists():
+                _place_file(dst, hashed_dst, hardlink=True)
+                stats.changes[hashed_rel] = 'added'
+            if processor is not None:
+                for sibling, status in processor.precompress_asset(hashed_dst):
+                    sibling_rel = sibling.relative_to(dst_dir).as_posix()
+                    compressed.add(sibling_rel)
+                    if status != 'unchanged':
+                        stats.changes[sibling_rel] = status
+
+    # 删除源目录中已不存在的文件和过期的指纹副本（输出目录中的 static/ 完全由渲染器管理）
+    keep = set(current) | set(stats.assets.values()) | compressed | {ASSET_MANIFEST_NAME}
+    if dst_dir.exists():
+        for dst in sorted(dst_dir.rglob('*'), reverse=True):
+            rel = dst.relative_to(dst_dir).as_posix()
+            if dst.is_file() or dst.is_symlink():
+                if rel not in keep:
+                    dst.unlink()
+                    stats.removed += 1
+                    stats.changes[rel] = 'removed'
+            elif dst.is_dir() and not any(dst.iterdir()):
+                dst.rmdir()
+
+    manifest_status = write_asset_manifest(dst_dir, stats.assets)
+    if manifest_status != 'unchanged':
+        stats.changes[ASSET_MANIFEST_NAME] = manifest_status
+    _save_manifest(manifest_file, dst_dir, current)
+    return stats
+
+
+def write_asset_manifest(dst_dir, assets):
+    """
+    写出 static/asset-manifest.json（内容不变时不重写，避免无谓的 mtime 变化），
+    返回 'added' / 'changed' / 'unchanged'，与 OutputWriter 的变更报告一致
+    """
+    payload = json.dumps(assets, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    status, _ = write_if_changed(Path(dst_dir) / ASSET_MANIFEST_NAME, payload)
+    return status
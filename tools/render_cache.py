@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 渲染缓存
+以 SQLite 持久化每条推文的解析结果，按 路径 + mtime + size 命中，mtime 变化但内容未变时用内容哈希兜底。
+头部记录（元数据、时间、标签、摘要）与正文记录（正文、渲染后的 HTML 片段）分列存储，
+命中时只读取头部，正文在页面真正需要渲染时才按需读取。
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+# 渲染逻辑（markdown 扩展、HTML 片段结构）变更时递增，旧缓存会被整体丢弃
+CACHE_VERSION = 2
+
+
+def file_digest(filepath):
+    """计算文件内容的 SHA-1"""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class PostCache:
+    """推文解析结果缓存"""
+
+    def __init__(self, db_path, rebuild=False):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+        self._seen = set()
+        self._init_schema(rebuild)
+
+    def _init_schema(self, rebuild):
+        cur = self.conn.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = cur.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if rebuild or not row or row[0] != str(CACHE_VERSION):
+            cur.execute("DROP TABLE IF EXISTS posts")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS posts (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                record TEXT NOT NULL,
+                body TEXT NOT NULL
+            )
+        """)
+        cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(CACHE_VERSION),))
+        self.conn.commit()
+
+    def lookup(self, filepath, st):
+        """
+        查找缓存的头部记录，返回 (record, fresh)
+        - fresh=True: 路径/mtime/size 完全命中
+        - fresh=False: mtime 变化但内容哈希一致，调用方需重新计算依赖 mtime 的字段
+        - record=None: 未命中
+        """
+        key = str(filepath)
+        self._seen.add(key)
+        row = self.conn.execute(
+            "SELECT mtime_ns, size, digest, record FROM posts WHERE path = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None, False
+
+        mtime_ns, size, digest, record = row
+        if mtime_ns == st.st_mtime_ns and size == st.st_size:
+            self.hits += 1
+            return json.loads(record), True
+
+        # 大小一致时才值得读文件比对哈希（如 git checkout / touch 仅改变 mtime）
+        if size == st.st_size:
+            try:
+                if file_digest(filepath) == digest:
+                    self.hash_hits += 1
+                    return json.loads(record), False
+            except OSError:
+                pass
+
+        self.misses += 1
+        return None, False
+
+    def begin_run(self):
+        """常驻渲染进程每次渲染前调用：重置命中统计与本轮出现过的路径"""
+        self.hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+        self._seen = set()
+
+    def mark_seen(self, filepath):
+        """登记本轮仍存在、但直接复用了内存中解析结果的推文，避免被 prune 删除"""
+        self._seen.add(str(filepath))
+
+    def load_body(self, filepath):
+        """按需读取正文记录，不存在时返回 None"""
+        row = self.conn.execute("SELECT body FROM posts WHERE path = ?", (str(filepath),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, filepath, st, record, body, digest=None):
+        """写入或更新一条缓存记录（头部记录 + 正文记录）"""
+        key = str(filepath)
+        self._seen.add(key)
+        if digest is None:
+            digest = file_digest(filepath)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO posts (path, mtime_ns, size, digest, record, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, st.st_mtime_ns, st.st_size, digest,
+             json.dumps(record, ensure_ascii=False), json.dumps(body, ensure_ascii=False))
+        )
+
+    def prune(self):
+        """删除本次渲染未出现的文件（已删除/重命名的推文）对应的记录"""
+        stale = [
+            (path,) for (path,) in self.conn.execute("SELECT path FROM posts")
+            if path not in self._seen
+        ]
+        if stale:
+            self.conn.executemany("DELETE FROM posts WHERE path = ?", stale)
+        return len(stale)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def summary(self):
+        total = self.hits + self.hash_hits + self.misses
+        return f"{self.hits} hits, {self.hash_hits} hash hits, {self.misses} misses ({total} lookups)"
+
+
+def fingerprint(*parts):
+    """对任意可 JSON 序列化的输入计算稳定指纹"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def tree_digest(*paths):
+    """对若干文件/目录的内容计算联合指纹（模板、渲染脚本等全局输入）"""
+    h = hashlib.sha1()
+    for root in paths:
+        root = Path(root)
+        files = sorted(p for p in root.rglob('*') if p.is_file()) if root.is_dir() else [root]
+        for p in files:
+            if not p.exists():
+                continue
+            h.update(str(p).encode('utf-8'))
+            h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+class DependencyState:
+    """
+    输出文件依赖图
+    记录每个输出文件（相对输出目录的路径）上次渲染时的输入指纹，
+    指纹未变且文件仍存在时跳过渲染；本次未再声明的旧输出会被删除。
+    """
+
+    def __init__(self, state_file, output_dir, force=False):
+        self.state_file = Path(state_file)
+        self.output_dir = Path(output_dir)
+        self.force = force
+        self.previous = {}
+        self.current = {}
+        self.rendered = 0
+        self.skipped = 0
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # 输出目录变化（如 MINI_TWITTER_OUTPUT）时旧状态不可信
+                if data.get('output_dir') == str(self.output_dir):
+                    self.previous = data.get('outputs', {})
+            except (OSError, ValueError):
+                self.previous = {}
+
+    def needs_render(self, output_key, inputs_fp):
+        """声明一个输出及其输入指纹，返回是否需要重新生成"""
+        self.current[output_key] = inputs_fp
+        stale = (
+            self.force
+            or self.previous.get(output_key) != inputs_fp
+            or not (self.output_dir / output_key).exists()
+        )
+        if stale:
+            self.rendered += 1
+        else:
+            self.skipped += 1
+        return stale
+
+    def declare(self, output_key, inputs_fp):
+        """登记一个随其他输出一起生成的附属输出（如搜索索引分片），不计入渲染统计"""
+        self.current[output_key] = inputs_fp
+
+    def carry_over(self, prefix):
+        """沿用上次以 prefix 开头的输出（生成被跳过、文件集合未知时），避免被当作过期输出删除"""
+        kept = [key for key in self.previous if key.startswith(prefix)]
+        for key in kept:
+            self.current.setdefault(key, self.previous[key])
+        return kept
+
+    def stale_outputs(self):
+        """上次生成、本次不再对应任何输入的输出（如已删除的推文）"""
+        return [output_key for output_key in self.previous if output_key not in self.current]
+
+    def save(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'output_dir': str(self.output_dir), 'outputs': self.current}, f, ensure_ascii=False)
+        tmp.replace(self.state_file)
+
+
+def write_if_changed(path, data, previous_digest=None):
+    """
+    原子写入（临时文件 + rename），内容与上次写入一致时跳过
+    previous_digest 为空时退回读取现有文件比对，返回 (status, digest)，
+    status 为 'added' / 'changed' / 'unchanged'
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    digest = hashlib.sha1(data).hexdigest()
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        st = None
+
+    if st is not None and st.st_size == len(data):
+        if previous_digest is None:
+            try:
+                previous_digest = file_digest(path)
+            except OSError:
+                previous_digest = None
+        if previous_digest == digest:
+            return 'unchanged', digest
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return ('added' if st is None else 'changed'), digest
+
+
+class OutputWriter:
+    """
+    输出写入器：按持久化清单中的内容哈希跳过未变化的写入，
+    并把新增/修改/删除的输出汇总成变更报告，供 push.sh 和开发服务器增量处理
+    """
+
+    def __init__(self, output_dir, manifest_file, processor=None):
+        self.output_dir = Path(output_dir)
+        self.manifest_file = Path(manifest_file)
+        # 可选的写出前处理（压缩空白、预压缩副本），见 render_minify.OutputProcessor
+        self.processor = processor
+        self.files = {}
+        self.changes = {}
+        self.unchanged = 0
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('output_dir') == str(self.output_dir):
+                self.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def previous_digest(self, rel):
+        return self.files.get(rel)
+
+    def write(self, rel, data):
+        if self.processor is None:
+            status, digest = write_if_changed(self.output_dir / rel, data, self.files.get(rel))
+            self.record(rel, status, digest)
+        else:
+            status, digest, siblings, sizes = self.processor.write(self.output_dir, rel, data, self.files.get(rel))
+            self.record(rel, status, digest, siblings, sizes)
+        return status
+
+    def record(self, rel, status, digest=None, siblings=None, sizes=None):
+        """登记一次写入结果（渲染子进程中完成的写入也通过这里汇总）"""
+        if digest is not None:
+            self.files[rel] = digest
+        if status == 'unchanged':
+            self.unchanged += 1
+        else:
+            self.changes[rel] = status
+        if siblings:
+            self.changes.update(siblings)
+        if sizes is not None and self.processor is not None:
+            self.processor.stats.add(sizes)
+
+    def note(self, rel, status):
+        """登记其他阶段（如静态资源同步）直接产生的变化"""
+        self.changes[rel] = status
+
+    def remove(self, rel):
+        self.files.pop(rel, None)
+        path = self.output_dir / rel
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        self.changes[rel] = 'removed'
+        # 预压缩副本随主文件一起删除
+        for suffix in ('.gz', '.br'):
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists():
+                sibling.unlink()
+                self.changes[rel + suffix] = 'removed'
+        # 顺带清理变空的子目录（如已删除日期的 fragments/<日期>/）
+        for parent in path.parents:
+            if parent == self.output_dir or self.output_dir not in parent.parents:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+        return True
+
+    def counts(self):
+        counts = {'added': 0, 'changed': 0, 'removed': 0}
+        for status in self.changes.values():
+            counts[status] += 1
+        return counts
+
+    def summary(self):
+        counts = self.counts()
+        return (f"{counts['added']} added, {counts['changed']} changed, "
+                f"{counts['removed']} removed, {self.unchanged} identical writes skipped")
+
+    def save(self, report_file):
+        """
+        保存清单并写出变更报告
+        报告中的 pending 会跨多次渲染累积，直到部署方（push.sh）处理后删除报告文件
+        """
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'output_dir': str(self.output_dir), 'files': self.files}, f, ensure_ascii=False)
+        tmp.replace(self.manifest_file)
+
+        report_file = Path(report_file)
+        pending = {}
+        try:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                pending = json.load(f).get('pending', {})
+        except (OSError, ValueError):
+            pass
+        for rel, status in self.changes.items():
+            # 尚未部署的新增文件再次被修改，对部署方来说仍是新增
+            if status == 'changed' and pending.get(rel) == 'added':
+                continue
+            pending[rel] = status
+
+        last_run = {'added': [], 'changed': [], 'removed': []}
+        for rel, status in sorted(self.changes.items()):
+            last_run[status].append(rel)
+        last_run['unchanged'] = self.unchanged
+
+        report = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'last_run': last_run,
+            'pending': dict(sorted(pending.items())),
+        }
+        tmp = report_file.with_name(f".{report_file.name}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, report_file)
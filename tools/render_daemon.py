@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 常驻渲染服务
+在内存中保留已解析的推文、模板环境与站点级上下文，通过本地 Unix socket 接收
+“这些路径变了”的通知，只重新生成受影响的输出并返回摘要。
+render.py / 开发服务器 / push.sh 会先尝试交给常驻进程渲染，连不上时退回一次性渲染。
+
+协议：每个连接发送一行 JSON 请求，返回一行 JSON 响应
+    {"cmd": "render", "changed": [...], "options": {...}, "posts_dir": ..., "output_dir": ...}
+    {"cmd": "ping"} / {"cmd": "shutdown"}
+
+用法：
+    python3 tools/render_daemon.py serve      # 前台运行（可交给 systemd / nohup）
+    python3 tools/render_daemon.py status
+    python3 tools/render_daemon.py stop
+    python3 tools/render_daemon.py render [变化的路径 ...]
+"""
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# 添加项目根目录到路径中以支持模块导入
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+RENDER_SOCKET_NAME = "render.sock"
+# 连接常驻进程的超时（秒）；渲染本身不设超时
+CONNECT_TIMEOUT = 1.0
+# 常驻进程允许透传的渲染选项
+DAEMON_OPTIONS = ('full', 'jobs', 'static_hash', 'hardlink_static', 'minify', 'precompress')
+
+
+def default_socket_path():
+    """与 render.py 的 CACHE_DIR 解析规则一致（含 MINI_TWITTER_CACHE 覆盖）"""
+    from core.utils_security import load_config, resolve_path
+    paths = load_config()["paths"]
+    cache_dir = resolve_path(os.environ.get("MINI_TWITTER_CACHE") or paths.get("cache_dir", "./.cache"))
+    return cache_dir / RENDER_SOCKET_NAME
+
+
+def _call(socket_path, request):
+    """发送一个请求并等待响应；常驻进程不存在时返回 None"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    try:
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def ping_daemon(socket_path):
+    """常驻进程的状态（pid、运行时长、渲染次数等），未运行时返回 None"""
+    return _call(socket_path, {'cmd': 'ping'})
+
+
+def request_render(socket_path, changed=None, posts_dir=None, output_dir=None, **options):
+    """
+    请求常驻进程渲染。返回响应字典（ok / summary / log / error），
+    常驻进程未运行、配置不一致或代码已更新（stale）时返回 None，调用方应退回一次性渲染
+    """
+    response = _call(socket_path, {
+        'cmd': 'render',
+        'changed': [str(Path(p).resolve()) for p in changed] if changed else None,
+        'posts_dir': str(posts_dir) if posts_dir else None,
+        'output_dir': str(output_dir) if output_dir else None,
+        'options': {k: v for k, v in options.items() if k in DAEMON_OPTIONS},
+    })
+    if response is None or response.get('error') in ('stale', 'mismatch'):
+        return None
+    return response
+
+
+def _code_mtimes(templates_dir):
+    """
+    渲染代码、模板与 config.json 的 mtime；任一变化后常驻进程退出，由调用方以新代码重启。
+    static/ 不在其中：每次渲染都会重新同步并重建资源映射
+    """
+    files = (sorted((PROJECT_ROOT / "tools").glob('render*.py'))
+             + sorted(p for p in Path(templates_dir).rglob('*') if p.is_file())
+             + [PROJECT_ROOT / "config.json"])
+    return {str(p): p.stat().st_mtime_ns for p in files if p.exists()}
+
+
+class RenderService:
+    def __init__(self, socket_path):
+        # 只有真正启动服务时才导入渲染模块（加载配置、jinja、markdown 等）
+        from tools import render
+        # render 在导入时设置 TZ，本进程的 time 模块已先初始化，需要重新读取时区
+        time.tzset()
+        self.render = render
+        self.socket_path = Path(socket_path)
+        self.session = render.RenderSession()
+        self.code_mtimes = _code_mtimes(render.TEMPLATES_DIR)
+        self.started = time.time()
+        self.stop_requested = False
+
+    def handle(self, request):
+        cmd = request.get('cmd')
+        if cmd == 'ping':
+            return {
+                'ok': True,
+                'pid': os.getpid(),
+                'uptime_s': round(time.time() - self.started),
+                'renders': self.session.renders,
+                'posts_in_memory': len(self.session.posts),
+                'posts_dir': str(self.render.POSTS_DIR),
+                'output_dir': str(self.render.OUTPUT_DIR),
+            }
+        if cmd == 'shutdown':
+            self.stop_requested = True
+            return {'ok': True}
+        if cmd != 'render':
+            return {'ok': False, 'error': f'unknown command: {cmd}'}
+
+        if _code_mtimes(self.render.TEMPLATES_DIR) != self.code_mtimes:
+            self.stop_requested = True
+            return {'ok': False, 'error': 'stale'}
+        for key, current in (('posts_dir', self.render.POSTS_DIR), ('output_dir', self.render.OUTPUT_DIR)):
+            if request.get(key) and Path(request[key]).resolve() != current:
+                return {'ok': False, 'error': 'mismatch'}
+
+        changed = request.get('changed')
+        options = {k: v for k, v in (request.get('options') or {}).items() if k in DAEMON_OPTIONS}
+        log = io.StringIO()
+        try:
+            with redirect_stdout(log):
+                summary = self.render.render_posts(session=self.session,
+                                                   changed=set(changed) if changed is not None else None,
+                                                   **options)
+        except Exception:
+            # 出错后丢弃内存状态，下次从磁盘缓存重新开始
+            self.session.close()
+            self.session = self.render.RenderSession()
+            return {'ok': False, 'error': traceback.format_exc(), 'log': log.getvalue()}
+        return {'ok': True, 'summary': summary, 'log': log.getvalue()}
+
+
+def serve(socket_path):
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if ping_daemon(socket_path) is not None:
+        print(f"⚠️ Render daemon already running on {socket_path}")
+        return 1
+    if socket_path.exists():
+        socket_path.unlink()
+
+    service = RenderService(socket_path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline() or b'{}')
+            except ValueError:
+                request = {}
+            response = service.handle(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            summary = response.get('summary')
+            if summary:
+                print(f"🎨 Render #{service.session.renders}: {summary['rendered']} rendered, "
+                      f"{summary['skipped']} unchanged, {summary['elapsed_ms']:.0f} ms "
+                      f"({len(request.get('changed') or [])} changed paths notified)", flush=True)
+            elif not response.get('ok'):
+                print(f"⚠️ Request failed: {response.get('error', '')[:500]}", flush=True)
+
+    # 逐个处理请求：渲染缓存的 SQLite 连接与全局渲染状态只在主线程中使用
+    server = socketserver.UnixStreamServer(str(socket_path), Handler)
+    os.chmod(socket_path, 0o600)
+    # 退出时只删除自己创建的 socket（旧进程退出与新进程启动可能交错）
+    socket_inode = socket_path.stat().st_ino
+
+    def _terminate(signum, frame):
+        service.stop_requested = True
+
+    signal.signal(signal.SIGTERM, _terminate)
+    signal.signal(signal.SIGINT, _terminate)
+    server.timeout = 0.5
+    print(f"🛰️  Render daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        while not service.stop_requested:
+            server.handle_request()
+    finally:
+        server.server_close()
+        service.session.close()
+        try:
+            if socket_path.stat().st_ino == socket_inode:
+                socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        print("👋 Render daemon stopped", flush=True)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clawtter resident render daemon")
+    parser.add_argument("command", choices=["serve", "status", "stop", "render"])
+    parser.add_argument("paths", nargs="*", help="Changed paths (render command)")
+    parser.add_argument("--socket", help="Unix socket path (default: <cache_dir>/render.sock)")
+    parser.add_argument("--full", action="store_true", help="Regenerate every output (render command)")
+    args = parser.parse_args()
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+
+    if args.command == "serve":
+        return serve(socket_path)
+    if args.command == "status":
+        info = ping_daemon(socket_path)
+        if info is None:
+            print("💤 Render daemon not running")
+            return 1
+        print(f"🛰️  Render daemon pid {info['pid']}, up {info['uptime_s']}s, {info['renders']} renders, "
+              f"{info['posts_in_memory']} posts in memory")
+        return 0
+    if args.command == "stop":
+        if _call(socket_path, {'cmd': 'shutdown'}) is None:
+            print("💤 Render daemon not running")
+            return 1
+        print("👋 Stop requested")
+        return 0
+
+    response = request_render(socket_path, changed=args.paths or None, full=args.full)
+    if response is None:
+        print("💤 Render daemon not available")
+        return 1
+    sys.stdout.write(response.get('log', ''))
+    if not response.get('ok'):
+        print(response.get('error', ''))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
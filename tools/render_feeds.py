@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 订阅源输出
+以流式拼接的方式生成 RSS 2.0 / Atom / JSON Feed，不再构建 DOM 再用 minidom 重新解析美化。
+条目正文直接使用推文缓存中的 HTML，同一批条目可同时输出多种格式和按标签拆分的订阅源。
+"""
+import json
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+# 订阅源格式 -> 输出文件名
+FEED_FILES = {
+    'rss': 'feed.xml',
+    'atom': 'atom.xml',
+    'json': 'feed.json',
+}
+TAG_FEED_DIR = 'tags'
+# 推文时间不带时区，按站点所在时区输出
+FEED_UTC_OFFSET = '+0900'
+
+_SLUG_RE = re.compile(r'[\s/\\?#%&:*"<>|]+')
+
+
+def tag_slug(tag):
+    """标签 -> 订阅源文件名（保留中文，去掉路径/URL 中有特殊含义的字符）"""
+    return _SLUG_RE.sub('-', tag.strip().lower()).strip('-.')
+
+
+def tag_feed_key(tag):
+    return f"{TAG_FEED_DIR}/{tag_slug(tag)}.xml"
+
+
+class FeedEntry:
+    """一条订阅源条目，各格式共用"""
+    __slots__ = ('id', 'url', 'title', 'html', 'dt', 'tags')
+
+    def __init__(self, id, url, title, html, dt, tags):
+        self.id = id
+        self.url = url
+        self.title = title
+        self.html = html
+        self.dt = dt
+        self.tags = tags
+
+
+def _rfc822(dt):
+    return dt.strftime(f'%a, %d %b %Y %H:%M:%S {FEED_UTC_OFFSET}')
+
+
+def _rfc3339(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%S') + f"{FEED_UTC_OFFSET[:3]}:{FEED_UTC_OFFSET[3:]}"
+
+
+def render_rss(channel, entries):
+    """channel: title / link / description / feed_url / updated"""
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n',
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:atom="http://www.w3.org/2005/Atom">\n',
+        '  <channel>\n',
+        f'    <title>{escape(channel["title"])}</title>\n',
+        f'    <link>{escape(channel["link"])}</link>\n',
+        f'    <description>{escape(channel["description"])}</description>\n',
+        '    <language>zh-cn</language>\n',
+        f'    <lastBuildDate>{_rfc822(channel["updated"])}</lastBuildDate>\n',
+        f'    <atom:link href={quoteattr(channel["feed_url"])} rel="self" type="application/rss+xml"/>\n',
+    ]
+    for entry in entries:
+        parts.append('    <item>\n')
+        parts.append(f'      <title>{escape(entry.title)}</title>\n')
+        parts.append(f'      <link>{escape(entry.url)}</link>\n')
+        parts.append(f'      <guid isPermaLink="true">{escape(entry.url)}</guid>\n')
+        parts.append(f'      <description>{escape(entry.html)}</description>\n')
+        for tag in entry.tags:
+            parts.append(f'      <category>{escape(tag)}</category>\n')
+        parts.append(f'      <pubDate>{_rfc822(entry.dt)}</pubDate>\n')
+        parts.append('    </item>\n')
+    parts.append('  </channel>\n</rss>\n')
+    return ''.join(parts)
+
+
+def render_atom(channel, entries):
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n',
+        '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="zh-cn">\n',
+        f'  <title>{escape(channel["title"])}</title>\n',
+        f'  <subtitle>{escape(channel["description"])}</subtitle>\n',
+        f'  <id>{escape(channel["link"])}/</id>\n',
+        f'  <link href={quoteattr(channel["link"])}/>\n',
+        f'  <link href={quoteattr(channel["feed_url"])} rel="self" type="application/atom+xml"/>\n',
+        f'  <updated>{_rfc3339(channel["updated"])}</updated>\n',
+        f'  <author><name>{escape(channel["title"])}</name></author>\n',
+    ]
+    for entry in entries:
+        parts.append('  <entry>\n')
+        parts.append(f'    <title>{escape(entry.title)}</title>\n')
+        parts.append(f'    <id>{escape(entry.url)}</id>\n')
+        parts.append(f'    <link href={quoteattr(entry.url)}/>\n')
+        parts.append(f'    <updated>{_rfc3339(entry.dt)}</updated>\n')
+        for tag in entry.tags:
+            parts.append(f'    <category term={quoteattr(tag)}/>\n')
+        parts.append(f'    <content type="html">{escape(entry.html)}</content>\n')
+        parts.append('  </entry>\n')
+    parts.append('</feed>\n')
+    return ''.join(parts)
+
+
+def render_json_feed(channel, entries):
+    feed = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': channel['title'],
+        'home_page_url': channel['link'],
+        'feed_url': channel['feed_url'],
+        'description': channel['description'],
+        'language': 'zh-CN',
+        'items': [
+            {
+                'id': entry.url,
+                'url': entry.url,
+                'title': entry.title,
+                'content_html': entry.html,
+                'date_published': _rfc3339(entry.dt),
+                'tags': entry.tags,
+            }
+            for entry in entries
+        ],
+    }
+    return json.dumps(feed, ensure_ascii=False, indent=2) + '\n'
+
+
+FEED_RENDERERS = {
+    'rss': render_rss,
+    'atom': render_atom,
+    'json': render_json_feed,
+}
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 封面图衍生图
+构建阶段为每张封面生成若干宽度的 WebP / JPEG 缩略版本，并记录原图的固有宽高，
+render_cover() 据此输出 srcset / sizes / width / height 与懒加载属性。
+衍生图按原图内容哈希缓存在 .cache/covers/ 中，同一张图只处理一次，
+输出目录中的副本以哈希命名，可以配合长期 immutable 缓存。
+未安装 Pillow 时只读取文件头中的宽高，封面仍使用原图。
+"""
+import json
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tools.render_assets import _place_file
+from tools.render_cache import file_digest
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 衍生图格式、参数或宽度档位变更时递增，旧缓存会被整体丢弃
+COVER_CACHE_VERSION = 1
+# 衍生图宽度档位（不放大，原图更窄时以原图宽度为最大一档）
+COVER_WIDTHS = (480, 800, 1200)
+# 时间线为单列/双列卡片，详情页单列，封面最宽约 640px
+COVER_SIZES = "(max-width: 700px) 100vw, 640px"
+COVER_OUTPUT_DIR = "covers"
+COVER_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'jpg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+DIGEST_LENGTH = 12
+
+
+def image_size(path):
+    """只读文件头获取 PNG / JPEG / GIF / WebP 的宽高，无法识别或文件被截断时返回 None"""
+    try:
+        return _header_size(path)
+    except (OSError, struct.error):
+        return None
+
+
+def _header_size(path):
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8X':
+                w = int.from_bytes(head[24:27], 'little') + 1
+                h = int.from_bytes(head[27:30], 'little') + 1
+                return w, h
+            if chunk == b'VP8L':
+                bits = int.from_bytes(head[21:25], 'little')
+                return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+            if chunk == b'VP8 ':
+                w, h = struct.unpack('<HH', head[26:30])
+                return w & 0x3fff, h & 0x3fff
+            return None
+        if head[:2] != b'\xff\xd8':
+            return None
+        # JPEG：跳过各段直到 SOFn
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xff:
+                return None
+            code = marker[1]
+            if code in (0xd8, 0x01) or 0xd0 <= code <= 0xd7:
+                continue
+            length = struct.unpack('>H', f.read(2))[0]
+            if code in (0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7, 0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf):
+                h, w = struct.unpack('>xHH', f.read(5))
+                return w, h
+            f.seek(length - 2, 1)
+
+
+def derivative_widths(width):
+    """原图宽度 -> 需要生成的宽度档位（升序）"""
+    widths = [w for w in COVER_WIDTHS if w < width]
+    if width <= COVER_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def derivative_name(digest, width, ext):
+    return f"{digest[:DIGEST_LENGTH]}-{width}.{ext}"
+
+
+def _make_derivatives(src, digest, cache_dir):
+    """
+    生成一张原图的全部衍生图（在子进程中执行），写入 cache_dir
+    返回 (digest, 宽, 高, [[宽, 高], ...])
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(src) as im:
+        im.load()
+        width, height = im.size
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA' if 'transparency' in im.info or im.mode in ('LA', 'PA') else 'RGB')
+        # JPEG 不支持透明通道，铺白底
+        if im.mode == 'RGBA':
+            flat = Image.new('RGB', im.size, (255, 255, 255))
+            flat.paste(im, mask=im.getchannel('A'))
+        else:
+            flat = im
+        variants = []
+        for w in derivative_widths(width):
+            h = max(1, round(height * w / width))
+            resized = flat if w == width else flat.resize((w, h), Image.LANCZOS)
+            for ext, options in COVER_FORMATS.items():
+                target = cache_dir / derivative_name(digest, w, ext)
+                tmp = target.with_name(f".{target.name}.tmp")
+                resized.save(tmp, **options)
+                tmp.replace(target)
+            variants.append([w, h])
+    return digest, width, height, variants
+
+
+def _try_make_derivatives(src, digest, cache_dir):
+    """
+    _make_derivatives 的容错包装：损坏、被截断或格式不支持的原图返回 (digest, None, 错误信息)，
+    单张坏图不影响整次渲染，对应的推文退回原图 <img>
+    """
+    try:
+        return digest, _make_derivatives(src, digest, cache_dir)[1:], None
+    except Exception as e:
+        # 清理生成到一半的衍生图
+        for path in Path(cache_dir).glob(f".{digest[:DIGEST_LENGTH]}-*.tmp"):
+            path.unlink(missing_ok=True)
+        return digest, None, f"{type(e).__name__}: {e}"
+
+
+class CoverStats:
+    def __init__(self):
+        self.sources = 0
+        self.processed = 0
+        self.cached = 0
+        self.missing = 0
+        self.failed = 0
+        self.derivatives = 0
+        self.source_bytes = 0
+        self.derived_bytes = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        saved = ''
+        if self.source_bytes and self.derived_bytes:
+            saved = (f", largest variants {self.derived_bytes / 1024 / 1024:.1f} MB "
+                     f"vs originals {self.source_bytes / 1024 / 1024:.1f} MB")
+        mode = '' if Image is not None else ' (Pillow not installed: dimensions only)'
+        return (f"{self.sources} covers, {self.processed} processed, {self.cached} cached, "
+                f"{self.missing} missing, {self.failed} failed, {self.derivatives} derivatives{saved}, "
+                f"{self.elapsed * 1000:.1f} ms{mode}")
+
+
+def _load_manifest(manifest_file):
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+    if data.get('version') != COVER_CACHE_VERSION:
+        return {}, {}
+    return data.get('sources', {}), data.get('images', {})
+
+
+def _save_manifest(manifest_file, sources, images):
+    manifest_file = Path(manifest_file)
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_file.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': COVER_CACHE_VERSION, 'sources': sources, 'images': images}, f, ensure_ascii=False)
+    tmp.replace(manifest_file)
+
+
+def build_cover_images(covers, static_dir, output_dir, cache_dir, writer, deps, jobs=1):
+    """
+    covers: 推文元数据中的封面地址集合（如 /static/covers/cover-xxx.png）
+    原图按 路径 + size + mtime 记住内容哈希，哈希未变的图片直接复用缓存中的衍生图；
+    衍生图以硬链接（跨文件系统时复制）放入输出目录 covers/，并在依赖图中登记，
+    不再被引用的衍生图随过期输出一起删除。
+    返回 ({封面地址: 图片信息}, CoverStats)，图片信息为
+    {'width', 'height', 'variants': [[宽, 高, webp 地址, jpg 地址], ...]}（无衍生图时为空列表）
+    """
+    start = time.perf_counter()
+    stats = CoverStats()
+    static_dir = Path(static_dir)
+    output_dir = Path(output_dir)
+    cache_dir = Path(cache_dir)
+    derived_dir = cache_dir / "covers"
+    manifest_file = cache_dir / "cover-images.json"
+    old_sources, old_images = _load_manifest(manifest_file)
+    sources = {}
+    images = {}
+
+    # 1. 定位原图并取内容哈希（size + mtime 未变时沿用上次的哈希）
+    located = {}
+    for cover in sorted(covers):
+        if not cover.startswith('/static/'):
+            continue
+        rel = cover[len('/static/'):]
+        src = static_dir / rel
+        stats.sources += 1
+        try:
+            st = src.stat()
+        except OSError:
+            stats.missing += 1
+            continue
+        old = old_sources.get(rel)
+        if old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+            digest = old['sha1']
+        else:
+            digest = file_digest(src)
+        sources[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': digest}
+        stats.source_bytes += st.st_size
+        located[cover] = (src, digest)
+
+    # 2. 缺少衍生图的原图才需要处理（没有 Pillow 时只读取宽高）
+    def _cached(digest):
+        info = old_images.get(digest)
+        if info is None:
+            return False
+        # 有 Pillow 时，上次只读取了宽高的图片需要补做衍生图
+        if Image is not None and not info['variants']:
+            return False
+        return all((derived_dir / derivative_name(digest, w, ext)).exists()
+                   for w, _ in info['variants'] for ext in COVER_FORMATS)
+
+    todo = {}
+    for cover, (src, digest) in located.items():
+        if digest in images or digest in todo:
+            continue
+        if _cached(digest):
+            images[digest] = old_images[digest]
+            stats.cached += 1
+        elif Image is not None:
+            todo[digest] = src
+        else:
+            size = image_size(src)
+            if size:
+                images[digest] = {'width': size[0], 'height': size[1], 'variants': []}
+
+    if todo:
+        args = [(str(src), digest, str(derived_dir)) for digest, src in todo.items()]
+        if jobs > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(args))) as pool:
+                results = list(pool.map(_try_make_derivatives, *zip(*args)))
+        else:
+            results = [_try_make_derivatives(*a) for a in args]
+        for digest, result, error in results:
+            if result is None:
+                # 不写入图片信息（也不缓存），该封面在页面中使用原图 <img>，下次渲染重试
+                print(f"  ⚠️ Cover image {todo[digest]} skipped: {error}")
+                stats.failed += 1
+                continue
+            width, height, variants = result
+            images[digest] = {'width': width, 'height': height, 'variants': variants}
+            stats.processed += 1
+
+    # 3. 放入输出目录并生成封面信息
+    cover_map = {}
+    placed = set()
+    for cover, (src, digest) in located.items():
+        info = images.get(digest)
+        if info is None:
+            continue
+        variants = []
+        for w, h in info['variants']:
+            urls = []
+            for ext in COVER_FORMATS:
+                name = derivative_name(digest, w, ext)
+                rel = f"{COVER_OUTPUT_DIR}/{name}"
+                urls.append(f"/{rel}")
+                if rel in placed:
+                    continue
+                placed.add(rel)
+                # 文件名由内容哈希决定，已存在即内容一致
+                deps.declare(rel, digest)
+                dst = output_dir / rel
+                if not dst.exists():
+                    _place_file(derived_dir / name, dst, hardlink=True)
+                    writer.note(rel, 'added')
+                stats.derivatives += 1
+            variants.append([w, h] + urls)
+        if variants:
+            largest = derivative_name(digest, info['variants'][-1][0], 'jpg')
+            stats.derived_bytes += (derived_dir / largest).stat().st_size
+        cover_map[cover] = {'width': info['width'], 'height': info['height'], 'variants': variants}
+
+    # 清理缓存中不再被引用的衍生图
+    if derived_dir.exists():
+        keep = {derivative_name(d, w, ext) for d, info in images.items()
+                for w, _ in info['variants'] for ext in COVER_FORMATS}
+        for path in derived_dir.iterdir():
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+
+    _save_manifest(manifest_file, sources, images)
+    stats.elapsed = time.perf_counter() - start
+    return cover_map, stats
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 输出后处理
+可选的写出前处理：压缩 HTML / JSON / XML 中模板带来的缩进与空白，
+并为文本类输出生成预压缩的 .gz / .br 副本，供静态托管和开发服务器直接返回。
+只有实际写入（新增或变化）的输出才会重新压缩；内容未变的输出只在副本缺失时补做。
+未安装 brotli 时跳过 .br。
+"""
+import gzip
+import json
+import re
+from pathlib import Path
+
+from tools.render_cache import write_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 预压缩格式 -> 副本后缀
+PRECOMPRESS_SUFFIXES = {'gz': '.gz', 'br': '.br'}
+# 只压缩文本类输出，且太小的文件压缩收益不抵额外的请求协商
+PRECOMPRESS_EXTS = {'.html', '.json', '.xml', '.css', '.js', '.svg', '.txt'}
+PRECOMPRESS_MIN_SIZE = 256
+
+# <pre>/<textarea> 中空白有意义，<script>/<style> 原样保留
+_PRESERVE_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.S | re.I)
+# 保留 IE 条件注释
+_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_WS_RE = re.compile(r'\s+')
+_XML_GAP_RE = re.compile(r'>\s+<')
+
+
+def _collapse(match):
+    # 连续空白在渲染上等价于一个空格；含换行时保留一个换行，方便查看源码
+    return '\n' if '\n' in match.group(0) else ' '
+
+
+def minify_html(text):
+    """
+    保守的 HTML 压缩：删除注释，把连续空白折叠成一个空格/换行。
+    不删除标签之间的空白（行内元素之间的空格会影响显示）
+    """
+    parts = _PRESERVE_RE.split(text)
+    out = []
+    # split 带两个捕获组：[普通文本, 保留块, 标签名, 普通文本, ...]
+    for i in range(0, len(parts), 3):
+        out.append(_WS_RE.sub(_collapse, _COMMENT_RE.sub('', parts[i])))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip() + '\n'
+
+
+def minify_json(text):
+    """紧凑输出 JSON；对象中的 html 字段（如滚动片段）按 HTML 压缩"""
+    data = json.loads(text)
+    if isinstance(data, dict) and isinstance(data.get('html'), str):
+        data['html'] = minify_html(data['html']).rstrip('\n')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def minify_xml(text):
+    """订阅源中正文均已转义，标签之间的空白可以直接删除"""
+    return _XML_GAP_RE.sub('><', text.strip()) + '\n'
+
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.json': minify_json,
+    '.xml': minify_xml,
+}
+
+
+def compress(data, fmt):
+    if fmt == 'gz':
+        # mtime=0 保证同样的输入得到同样的字节，便于写入前比对
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+class OutputStats:
+    def __init__(self):
+        self.files = 0
+        self.raw_bytes = 0
+        self.minified_bytes = 0
+        self.compressed = {fmt: [0, 0] for fmt in PRECOMPRESS_SUFFIXES}
+
+    def add(self, sizes):
+        raw, minified, compressed = sizes
+        self.files += 1
+        self.raw_bytes += raw
+        self.minified_bytes += minified
+        for fmt, size in compressed.items():
+            self.compressed[fmt][0] += 1
+            self.compressed[fmt][1] += size
+
+    def summary(self, processor):
+        parts = []
+        if processor.minify and self.raw_bytes:
+            saved = self.raw_bytes - self.minified_bytes
+            parts.append(f"minified {self.files} outputs {self.raw_bytes / 1024:.1f} KB -> "
+                         f"{self.minified_bytes / 1024:.1f} KB (-{saved * 100 / self.raw_bytes:.1f}%)")
+        for fmt in processor.precompress:
+            count, size = self.compressed[fmt]
+            if count:
+                parts.append(f"{count} .{fmt} written ({size / 1024:.1f} KB)")
+        if processor.skipped_formats:
+            parts.append(f"skipped {', '.join(processor.skipped_formats)} (module not installed)")
+        return '; '.join(parts) or 'nothing to process'
+
+
+class OutputProcessor:
+    """
+    写出前的后处理：minify 为 True 时按扩展名压缩 HTML/JSON/XML，
+    precompress 为要生成的预压缩格式（'gz' / 'br'）。
+    对象可序列化，页面渲染子进程各持一份；统计由主进程根据返回的尺寸汇总
+    """
+
+    def __init__(self, minify=False, precompress=()):
+        self.minify = minify
+        self.skipped_formats = [fmt for fmt in precompress if fmt == 'br' and brotli is None]
+        self.precompress = [fmt for fmt in precompress
+                            if fmt in PRECOMPRESS_SUFFIXES and fmt not in self.skipped_formats]
+        self.stats = OutputStats()
+
+    def options(self):
+        """参与全局指纹：开关变化时所有页面重新生成"""
+        return {'minify': self.minify, 'precompress': self.precompress}
+
+    def transform(self, rel, data):
+        """按扩展名压缩文本输出，返回处理后的 str / bytes"""
+        if not self.minify or not isinstance(data, str):
+            return data
+        minifier = MINIFIERS.get(Path(rel).suffix)
+        if minifier is None:
+            return data
+        try:
+            return minifier(data)
+        except ValueError:
+            # JSON 无法解析时原样输出，不影响渲染
+            return data
+
+    def write_siblings(self, path, data, refresh):
+        """
+        生成 path 的预压缩副本，返回 ({副本相对后缀: 状态}, {格式: 字节数})
+        refresh=False（主文件未变化）时已存在的副本直接沿用；
+        未启用或不值得压缩的格式会删除遗留副本，避免托管方返回过期内容
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        statuses = {}
+        sizes = {}
+        wanted = path.suffix in PRECOMPRESS_EXTS and len(data) >= PRECOMPRESS_MIN_SIZE
+        for fmt, suffix in PRECOMPRESS_SUFFIXES.items():
+            sibling = path.with_name(path.name + suffix)
+            if not wanted or fmt not in self.precompress:
+                if sibling.exists():
+                    sibling.unlink()
+                    statuses[suffix] = 'removed'
+                continue
+            if not refresh and sibling.exists():
+                continue
+            payload = compress(data, fmt)
+            status, _ = write_if_changed(sibling, payload)
+            sizes[fmt] = len(payload)
+            if status != 'unchanged':
+                statuses[suffix] = status
+        return statuses, sizes
+
+    def write(self, output_dir, rel, data, previous_digest=None):
+        """
+        处理并写入一个输出，返回 (status, digest, {副本路径: 状态}, 尺寸)
+        尺寸为 (原始字节数, 压缩后字节数, {格式: 预压缩字节数})
+        """
+        raw_size = len(data.encode('utf-8')) if isinstance(data, str) else len(data)
+        data = self.transform(rel, data)
+        status, digest = write_if_changed(Path(output_dir) / rel, data, previous_digest)
+        size = len(data.encode('utf-8')) if isinstance(data, str) else len(data)
+        statuses, compressed = self.write_siblings(Path(output_dir) / rel, data, status != 'unchanged')
+        siblings = {rel + suffix: s for suffix, s in statuses.items()}
+        return status, digest, siblings, (raw_size, size, compressed)
+
+    def precompress_asset(self, path):
+        """
+        为带内容哈希的静态资源生成预压缩副本（文件名即内容，副本存在即最新），
+        返回 [(副本路径, 状态)]，状态 'unchanged' 表示沿用已有副本
+        """
+        path = Path(path)
+        if not self.precompress or path.suffix not in PRECOMPRESS_EXTS:
+            return []
+        result = []
+        data = None
+        for fmt in self.precompress:
+            sibling = path.with_name(path.name + PRECOMPRESS_SUFFIXES[fmt])
+            if sibling.exists():
+                result.append((sibling, 'unchanged'))
+                continue
+            if data is None:
+                data = path.read_bytes()
+            if len(data) < PRECOMPRESS_MIN_SIZE:
+                break
+            payload = compress(data, fmt)
+            status, _ = write_if_changed(sibling, payload)
+            self.stats.compressed[fmt][0] += 1
+            self.stats.compressed[fmt][1] += len(payload)
+            result.append((sibling, status))
+        return result
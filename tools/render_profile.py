@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 渲染性能剖析
+--profile 模式下按阶段记录墙钟时间、CPU 时间与 tracemalloc 峰值内存，
+连同各阶段渲染/跳过的页面数、缓存命中率写入 JSON 报告，多次运行的结果按时间累积便于看趋势。
+未开启时各方法均为空操作，不影响正常渲染。
+"""
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# 报告中保留的最近运行次数
+PROFILE_HISTORY_LIMIT = 200
+
+
+class RenderProfiler:
+    """
+    按阶段计时：begin(name) 结束上一阶段并开始新阶段，record() 为当前阶段附加计数，
+    stats() 记录整次运行的汇总数据（缓存命中率、写入统计等）
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []
+        self.summary = {}
+        self._current = None
+        self._run_start = None
+        self._started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if enabled:
+            tracemalloc.start()
+            self._run_start = (time.perf_counter(), time.process_time())
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        self._finish_phase()
+        tracemalloc.reset_peak()
+        self._current = {
+            'name': name,
+            'start': (time.perf_counter(), time.process_time()),
+            'mem_start': tracemalloc.get_traced_memory()[0],
+            'counts': {},
+        }
+
+    def record(self, **counts):
+        """为当前阶段附加计数（如渲染/跳过的页面数）"""
+        if self.enabled and self._current is not None:
+            self._current['counts'].update(counts)
+
+    def stats(self, **values):
+        """记录整次运行的汇总数据"""
+        if self.enabled:
+            self.summary.update(values)
+
+    def _finish_phase(self):
+        phase = self._current
+        if phase is None:
+            return
+        wall_start, cpu_start = phase['start']
+        current, peak = tracemalloc.get_traced_memory()
+        self.phases.append({
+            'name': phase['name'],
+            'wall_ms': round((time.perf_counter() - wall_start) * 1000, 2),
+            'cpu_ms': round((time.process_time() - cpu_start) * 1000, 2),
+            'peak_kb': round(peak / 1024, 1),
+            'retained_kb': round((current - phase['mem_start']) / 1024, 1),
+            **({'counts': phase['counts']} if phase['counts'] else {}),
+        })
+        self._current = None
+
+    def finish(self):
+        """结束最后一个阶段并返回本次运行的报告"""
+        if not self.enabled:
+            return None
+        self._finish_phase()
+        wall_start, cpu_start = self._run_start
+        # 每个阶段开始时都会重置峰值，整次运行的峰值取各阶段的最大值
+        peak = max([tracemalloc.get_traced_memory()[1]] + [p['peak_kb'] * 1024 for p in self.phases])
+        tracemalloc.stop()
+        return {
+            'started_at': self._started_at,
+            'pid': os.getpid(),
+            'wall_ms': round((time.perf_counter() - wall_start) * 1000, 2),
+            'cpu_ms': round((time.process_time() - cpu_start) * 1000, 2),
+            'peak_kb': round(peak / 1024, 1),
+            'phases': self.phases,
+            'summary': self.summary,
+        }
+
+    def print_table(self, report):
+        total = report['wall_ms'] or 1
+        print(f"⏱️  Profile ({report['wall_ms']:.1f} ms wall, {report['cpu_ms']:.1f} ms CPU, "
+              f"peak {report['peak_kb'] / 1024:.1f} MB traced):")
+        for phase in report['phases']:
+            counts = ', '.join(f"{k}={v}" for k, v in phase.get('counts', {}).items())
+            print(f"  {phase['name']:<14} {phase['wall_ms']:>9.1f} ms {phase['wall_ms'] * 100 / total:>5.1f}%  "
+                  f"cpu {phase['cpu_ms']:>8.1f} ms  peak {phase['peak_kb']:>9.1f} KB"
+                  + (f"  {counts}" if counts else ''))
+
+
+def save_profile_report(report_file, report):
+    """把本次运行追加到报告文件的 runs 列表（只保留最近 PROFILE_HISTORY_LIMIT 次）"""
+    report_file = Path(report_file)
+    runs = []
+    try:
+        with open(report_file, 'r', encoding='utf-8') as f:
+            runs = json.load(f).get('runs', [])
+    except (OSError, ValueError):
+        pass
+    runs.append(report)
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = report_file.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs[-PROFILE_HISTORY_LIMIT:]}, f, ensure_ascii=False, indent=2)
+    tmp.replace(report_file)
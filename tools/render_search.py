@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Clawtter - 分片搜索索引
+构建倒排索引：中日韩文字按单字与二元组（bigram）切分，拉丁文字按单词切分。
+索引按词元首字符拆成多个分片；文档信息（id、标题、时间、标签）按文档编号区间拆成 docs/ 分片，
+meta.json 只记录分片列表与切分参数，大小不随推文数增长。
+浏览器查询时只需下载元数据、查询词涉及的分片，以及要显示的命中所在的文档分片。
+每条推文的词元按推文指纹缓存，只有变化的推文需要重新切分。
+"""
+import json
+import re
+import time
+from pathlib import Path
+
+SEARCH_INDEX_VERSION = 3
+SEARCH_DIR = "search"
+# 非 [a-z0-9] 开头的词元按码位取模分桶，前端 main.js 使用相同规则
+SEARCH_SHARD_BUCKETS = 32
+# 单个拉丁单词最多保留的长度，过长的多为链接/哈希；写入 meta.json，前端查询时按同样长度截断
+MAX_WORD_LENGTH = 24
+# 每个文档分片 search/docs/<n>.json 包含的文档数；编号按时间升序，新推文只改动最后一个分片
+DOCS_PER_SHARD = 200
+
+_CJK_CLASS = r'\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+TOKEN_RE = re.compile(rf'[{_CJK_CLASS}]+|[0-9a-z\u00c0-\u024f]+')
+_CJK_RE = re.compile(rf'[{_CJK_CLASS}]')
+_MARKDOWN_RE = re.compile(r'[*_`#>\[\]\(\)!]')
+
+
+def tokenize(text):
+    """
+    切分文本，返回去重后的词元列表（保持首次出现顺序）。
+    中日韩文字的每个单字都单独索引，单字查询才能找到只出现在词中间或二元组后半的字
+    """
+    tokens = {}
+    for run in TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(run):
+            for ch in run:
+                tokens[ch] = None
+            for i in range(len(run) - 1):
+                tokens[run[i:i + 2]] = None
+        elif len(run) >= 2 or run.isdigit():
+            tokens[run[:MAX_WORD_LENGTH]] = None
+    return list(tokens)
+
+
+def shard_key(token):
+    """词元所属分片：a-z0-9 开头按首字符，其余按首字符码位分桶"""
+    first = token[0]
+    if first.isascii() and first.isalnum():
+        return first
+    return f"x{ord(first) % SEARCH_SHARD_BUCKETS:02x}"
+
+
+def post_search_text(post):
+    """推文正文 + 标签的纯文本（去除 markdown 标记）"""
+    text = _MARKDOWN_RE.sub('', post.content)
+    return ' '.join([text] + post.get_tags())
+
+
+class SearchIndexStats:
+    def __init__(self):
+        self.docs = 0
+        self.tokens = 0
+        self.tokenized = 0
+        self.reused = 0
+        self.shards = 0
+        self.total_bytes = 0
+        self.meta_bytes = 0
+        self.doc_shards = 0
+        self.largest_shard = ('', 0)
+        self.written = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        name, size = self.largest_shard
+        return (f"{self.docs} posts, {self.tokens} tokens, {self.shards} shards + {self.doc_shards} doc shards, "
+                f"{self.total_bytes / 1024:.1f} KB total (meta {self.meta_bytes / 1024:.1f} KB, "
+                f"largest {name} {size / 1024:.1f} KB), {self.written} files written, "
+                f"{self.tokenized} tokenized / {self.reused} reused, {self.elapsed * 1000:.1f} ms")
+
+
+def _load_token_cache(cache_file):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != SEARCH_INDEX_VERSION:
+        return {}
+    return data.get('posts', {})
+
+
+def _save_token_cache(cache_file, entries):
+    cache_file = Path(cache_file)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': SEARCH_INDEX_VERSION, 'posts': entries}, f, ensure_ascii=False)
+    tmp.replace(cache_file)
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def build_search_index(docs, writer, cache_file):
+    """
+    docs: 按时间降序的 (post_id, post_fp, post) 列表
+    文档编号按时间升序分配，新推文追加在末尾，已有分片中的编号保持不变，
+    没有新词元落入的分片内容不变，writer 不会重写。
+    返回 (输出相对路径列表, SearchIndexStats)
+    """
+    start = time.perf_counter()
+    stats = SearchIndexStats()
+    cached = _load_token_cache(cache_file)
+    entries = {}
+    postings = {}
+    doc_info = []
+
+    for doc_no, (post_id, post_fp, post) in enumerate(reversed(docs)):
+        entry = cached.get(post_id)
+        if entry and entry[0] == post_fp:
+            tokens = entry[1]
+            stats.reused += 1
+        else:
+            tokens = tokenize(post_search_text(post))
+            stats.tokenized += 1
+        entries[post_id] = [post_fp, tokens]
+
+        for token in tokens:
+            postings.setdefault(token, []).append(doc_no)
+        excerpt = post.excerpt()
+        title = excerpt[:60].strip().replace('\n', ' ') + ('...' if len(excerpt) > 60 else '')
+        doc_info.append([post_id, title, post.get_time(), post.get_tags()])
+
+    shards = {}
+    for token, doc_nos in postings.items():
+        shards.setdefault(shard_key(token), {})[token] = doc_nos
+
+    outputs = []
+    doc_shards = {}
+    for start_no in range(0, len(doc_info), DOCS_PER_SHARD):
+        doc_shards[f"docs/{start_no // DOCS_PER_SHARD}"] = doc_info[start_no:start_no + DOCS_PER_SHARD]
+    for key in sorted(doc_shards):
+        rel = f"{SEARCH_DIR}/{key}.json"
+        payload = _dumps(doc_shards[key])
+        if writer.write(rel, payload) != 'unchanged':
+            stats.written += 1
+        stats.total_bytes += len(payload.encode('utf-8'))
+        outputs.append(rel)
+
+    for key in sorted(shards):
+        rel = f"{SEARCH_DIR}/{key}.json"
+        payload = _dumps(shards[key])
+        if writer.write(rel, payload) != 'unchanged':
+            stats.written += 1
+        size = len(payload.encode('utf-8'))
+        stats.total_bytes += size
+        if size > stats.largest_shard[1]:
+            stats.largest_shard = (key, size)
+        outputs.append(rel)
+
+    meta = _dumps({
+        'version': SEARCH_INDEX_VERSION,
+        'buckets': SEARCH_SHARD_BUCKETS,
+        'max_word': MAX_WORD_LENGTH,
+        'shards': sorted(shards),
+        'doc_shard': DOCS_PER_SHARD,
+    })
+    meta_rel = f"{SEARCH_DIR}/meta.json"
+    if writer.write(meta_rel, meta) != 'unchanged':
+        stats.written += 1
+    stats.meta_bytes = len(meta.encode('utf-8'))
+    stats.total_bytes += stats.meta_bytes
+    outputs.append(meta_rel)
+
+    _save_token_cache(cache_file, entries)
+    stats.docs = len(doc_info)
+    stats.tokens = len(postings)
+    stats.shards = len(shards)
+    stats.doc_shards = len(doc_shards)
+    stats.elapsed = time.perf_counter() - start
+    return outputs, stats